@@ -0,0 +1,57 @@
+"""Benchmark betikleri için ortak Django kurulumu.
+
+Betikler `backend/` dizininden `python benchmarks/<betik>.py` şeklinde çalıştırılır.
+Ölçümler yapılandırılmış veritabanının test kopyası üzerinde yapılır (SQLite'ta geçici
+dosya, PostgreSQL'de `test_<ad>` veritabanı); gerçek veriye dokunulmaz.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup():
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cozum_var_backend.settings")
+
+    import django
+    from django.conf import settings
+
+    database = settings.DATABASES["default"]
+    if database["ENGINE"].endswith("sqlite3"):
+        # Bellek içi test veritabanı yerine dosya: büyük veri setlerinde sayfa önbelleği gerçekçi olsun
+        database.setdefault("TEST", {})["NAME"] = os.path.join(
+            tempfile.gettempdir(), "cozum_var_benchmark.sqlite3"
+        )
+    django.setup()
+
+
+@contextmanager
+def benchmark_database(keepdb=False):
+    """Test veritabanını oluşturup migrate eder, çıkışta siler (keepdb ile korunur)."""
+    from django.db import connection
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+
+
+def timed(func, repeat=5):
+    """Fonksiyonu `repeat` kez çalıştırıp medyan süreyi milisaniye olarak döndürür."""
+    durations = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        durations.append((time.perf_counter() - start) * 1000)
+    durations.sort()
+    return durations[len(durations) // 2], result
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""
+Paylaşılan önbellek benchmark'ı
+
+--workers kadar süreç (gunicorn işçilerini taklit eder) aynı anda bir hız sınırı sayacı
+desenini çalıştırır: her istek için `add(anahtar, 0)` + `incr(anahtar)` ve ardından bir
+`get`. Arka uç başına toplam işlem/sn ve bir işçinin gördüğü en yüksek sayaç raporlanır:
+
+- locmem: her süreç kendi belleğini sayar; sayaç işçi sayısı kat eksik görünür
+  (ratelimit sınırlarının işçi sayısıyla çarpılmasının nedeni)
+- sqlite: cozum_var_backend.sqlite_cache.SQLiteCache (WAL, atomik incr)
+- redis:  Django RedisCache; REDIS_URL erişilebilir ve `redis` paketi kuruluysa
+
+sqlite'ta sayaç beklenen toplamla eşleşmezse çıkış kodu 1 olur.
+
+Kullanım:
+    python benchmarks/bench_cache.py
+    python benchmarks/bench_cache.py --workers 8 --ops 5000
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import _django
+
+_django.setup()
+
+from django.core.cache.backends.locmem import LocMemCache  # noqa: E402
+
+from cozum_var_backend.sqlite_cache import SQLiteCache  # noqa: E402
+
+COUNTER = "rl:bench:counter"
+
+
+def make_locmem():
+    return LocMemCache("bench", {"OPTIONS": {"MAX_ENTRIES": 1000}})
+
+
+def make_sqlite(path):
+    return SQLiteCache(path, {"OPTIONS": {"MAX_ENTRIES": 100_000}})
+
+
+def make_redis():
+    from django.core.cache.backends.redis import RedisCache
+
+    return RedisCache(os.environ.get("REDIS_URL", "redis://localhost:6379/1"), {})
+
+
+def redis_available():
+    try:
+        cache = make_redis()
+        cache.set("bench:ping", 1, timeout=5)
+        return cache.get("bench:ping") == 1
+    except Exception:
+        return False
+
+
+def run_worker(make_cache, ops, start, results):
+    cache = make_cache()
+    start.wait()
+    began = time.perf_counter()
+    for index in range(ops):
+        cache.add(COUNTER, 0, timeout=300)
+        cache.incr(COUNTER)
+        cache.get(f"rl:bench:{index % 100}")
+    elapsed = time.perf_counter() - began
+    results.put((ops * 3, elapsed, cache.get(COUNTER)))
+
+
+def measure(make_cache, workers, ops):
+    context = multiprocessing.get_context("fork")
+    start = context.Event()
+    results = context.Queue()
+    processes = [context.Process(target=run_worker, args=(make_cache, ops, start, results)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    start.set()
+    finished = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    total_ops = sum(count for count, _, _ in finished)
+    elapsed = max(seconds for _, seconds, _ in finished)
+    # Bir işçinin (ratelimit kontrolünde) gördüğü en yüksek sayaç
+    return total_ops / elapsed, max(seen or 0 for _, _, seen in finished)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=2000, help="işçi başına istek (add + incr + get)")
+    args = parser.parse_args()
+
+    expected = args.workers * args.ops
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cache.sqlite3")
+        backends = {"locmem": make_locmem, "sqlite": lambda: make_sqlite(path)}
+        if redis_available():
+            backends["redis"] = make_redis
+        print(f"🗄️  {args.workers} süreç × {args.ops} istek (add + incr + get), beklenen sayaç {expected}")
+        print("=" * 72)
+        counters = {}
+        for name, make_cache in backends.items():
+            make_cache().delete(COUNTER)
+            ops_per_sec, counters[name] = measure(make_cache, args.workers, args.ops)
+            print(f"   {name:<8} {ops_per_sec:12,.0f} işlem/sn   işçinin gördüğü sayaç: {counters[name]}")
+        if "redis" not in backends:
+            print("   redis    atlandı (REDIS_URL erişilemiyor veya `redis` paketi kurulu değil)")
+    print("=" * 72)
+
+    if counters["sqlite"] != expected:
+        print(f"❌ sqlite sayacı {counters['sqlite']} (beklenen {expected})")
+        sys.exit(1)
+    print(f"✅ sqlite sayacı işçiler arasında paylaşıldı ({expected})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""
+Mükerrer görüntü arama benchmark'ı
+
+Test veritabanına (varsayılan 1.000.000) rastgele dHash'li medya ekler, bunların bir
+kısmının 0..REPORT_DUPLICATE_MAX_DISTANCE bit bozulmuş kopyalarıyla
+reports.duplicates.find_similar çağırır ve raporlar:
+
+- medyan/en kötü arama süresi (çoklu indeks parçaları üzerinden)
+- bozulmuş kopyaların asıl bildirimi bulma oranı (beklenen: %100)
+
+Arama medyanı --max-ms'i aşarsa veya bir kopya bulunamazsa çıkış kodu 1 olur.
+
+Kullanım:
+    python benchmarks/bench_duplicate_lookup.py --rows 1000000
+    USE_POSTGRES=true python benchmarks/bench_duplicate_lookup.py --keepdb
+"""
+
+import argparse
+import random
+import sys
+import time
+
+import _django
+
+_django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from reports.duplicates import CHUNK_FIELDS, chunks, find_similar, max_distance  # noqa: E402
+from reports.models import Category, Media, Report  # noqa: E402
+
+User = get_user_model()
+REPORTS_PER_MEDIA = 3
+
+
+def seed(rows, batch_size=20000):
+    rng = random.Random(7)
+    user = User.objects.create_user(email="bench@example.com", password="bench", username="bench")
+    category = Category.objects.create(name="Benchmark")
+    report_count = max(1, rows // REPORTS_PER_MEDIA)
+    created = 0
+    while created < report_count:
+        size = min(batch_size, report_count - created)
+        Report.objects.bulk_create(
+            Report(title=f"Bildirim {created + i}", description="Benchmark", reporter=user, category=category)
+            for i in range(size)
+        )
+        created += size
+    report_ids = list(Report.objects.values_list("id", flat=True))
+
+    created = 0
+    while created < rows:
+        size = min(batch_size, rows - created)
+        Media.objects.bulk_create(
+            Media(
+                report_id=report_ids[(created + i) % len(report_ids)],
+                file=f"reports/bench/{created + i}.jpg",
+                file_path=f"reports/bench/{created + i}.jpg",
+                **dict(zip(CHUNK_FIELDS, chunks(rng.getrandbits(64)))),
+            )
+            for i in range(size)
+        )
+        created += size
+        print(f"  {created}/{rows} medya eklendi", end="\r", flush=True)
+    print()
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def corrupt(value, bits, rng):
+    for bit in rng.sample(range(64), bits):
+        value ^= 1 << bit
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--max-ms", type=float, default=50.0)
+    parser.add_argument("--keepdb", action="store_true", help="Test veritabanını silme/yeniden kullan")
+    args = parser.parse_args()
+
+    print(f"🗄️  Veritabanı: {connection.vendor}, medya sayısı: {args.rows}")
+    with _django.benchmark_database(keepdb=args.keepdb):
+        if not (args.keepdb and Media.objects.exists()):
+            seed(args.rows)
+
+        rng = random.Random(11)
+        distance = max_distance()
+        samples = list(Media.objects.order_by("?").values("report_id", *CHUNK_FIELDS)[: args.queries])
+        durations = []
+        misses = 0
+        for sample in samples:
+            value = 0
+            for field in CHUNK_FIELDS:
+                value = (value << 16) | sample[field]
+            query = corrupt(value, rng.randint(0, distance), rng)
+            start = time.perf_counter()
+            results = find_similar([query], limit=20)
+            durations.append((time.perf_counter() - start) * 1000)
+            misses += sample["report_id"] not in {result["id"] for result in results}
+
+        durations.sort()
+        median = durations[len(durations) // 2]
+        print("=" * 72)
+        print(f"   mesafe ≤ {distance} bit, {len(samples)} sorgu")
+        print(f"   medyan {median:8.2f} ms   p95 {durations[int(len(durations) * 0.95)]:8.2f} ms   en kötü {durations[-1]:8.2f} ms")
+        print(f"   bulunan kopya: {len(samples) - misses}/{len(samples)}")
+        print("=" * 72)
+
+    if misses or median > args.max_ms:
+        print(f"❌ {misses} kopya bulunamadı veya medyan süre {args.max_ms} ms'yi aştı")
+        sys.exit(1)
+    print("✅ Tüm kopyalar bulundu")
+
+
+if __name__ == "__main__":
+    main()
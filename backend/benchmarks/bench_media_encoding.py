@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+"""
+Görüntü kodlama politikası benchmark'ı
+
+Sabit bir örnek derlem (tohumlu rastgele üretilir; her çalıştırmada aynı baytlar) veya
+--corpus ile verilen bir dizindeki görüntüler üzerinde her MEDIA_ENCODING_POLICY için
+reports.media_processing.render_variants çalıştırılır ve raporlanır:
+
+- full/card/thumb boyutlarının toplam baytı ve 'original' politikasına göre kazanç
+- JPEG yedeğinin baytı (yalnızca webp/avif)
+- görüntü başına medyan kodlama süresi
+
+Pillow AVIF yazamıyorsa (pillow-avif-plugin kurulu değilse) avif politikası atlanır.
+
+Kullanım:
+    python benchmarks/bench_media_encoding.py
+    python benchmarks/bench_media_encoding.py --corpus ~/ornek-fotograflar --repeat 1
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from io import BytesIO
+
+import _django
+
+POLICIES = ("original", "webp", "avif")
+
+
+def photo(seed, size):
+    """Bulanıklaştırılmış gürültü + gradyan: fotoğrafa yakın sıkıştırma davranışı."""
+    from PIL import Image, ImageFilter
+
+    rng = random.Random(seed)
+    width, height = size
+    noise = Image.frombytes("L", size, rng.randbytes(width * height)).filter(ImageFilter.GaussianBlur(1.2))
+    gradient = Image.linear_gradient("L").resize(size)
+    radial = Image.radial_gradient("L").resize(size)
+    return Image.merge("RGB", (Image.blend(noise, gradient, 0.6), Image.blend(noise, radial, 0.5), gradient))
+
+
+def screenshot(seed, size):
+    """Düz renkli paneller ve metin satırları: PNG ekran görüntüsü."""
+    from PIL import Image, ImageDraw
+
+    rng = random.Random(seed)
+    img = Image.new("RGB", size, (245, 246, 248))
+    draw = ImageDraw.Draw(img)
+    draw.rectangle((0, 0, size[0], 64), fill=(33, 99, 235))
+    for row in range(80, size[1] - 40, 28):
+        x = 40
+        while x < size[0] - 120:
+            word = rng.randint(20, 90)
+            draw.rectangle((x, row, x + word, row + 12), fill=(60, 60, 70))
+            x += word + rng.randint(8, 14)
+    return img
+
+
+def logo(seed, size):
+    """Saydam arka planlı basit grafik: RGBA PNG."""
+    from PIL import Image, ImageDraw
+
+    rng = random.Random(seed)
+    img = Image.new("RGBA", size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    for _ in range(12):
+        x, y = rng.randint(0, size[0]), rng.randint(0, size[1])
+        radius = rng.randint(40, 160)
+        draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=(rng.randint(0, 255), 120, 40, 220))
+    return img
+
+
+def builtin_corpus():
+    """[(ad, bayt), ...] sabit derlem."""
+    items = [
+        ("photo_landscape.jpg", photo(1, (4000, 3000)), "JPEG", {"quality": 92}),
+        ("photo_portrait.jpg", photo(2, (1536, 2048)), "JPEG", {"quality": 90}),
+        ("screenshot.png", screenshot(3, (1920, 1080)), "PNG", {}),
+        ("logo.png", logo(4, (900, 900)), "PNG", {}),
+    ]
+    corpus = []
+    for name, img, image_format, options in items:
+        buffer = BytesIO()
+        img.save(buffer, format=image_format, **options)
+        corpus.append((name, buffer.getvalue()))
+    return corpus
+
+
+def directory_corpus(path):
+    corpus = []
+    for name in sorted(os.listdir(path)):
+        full_path = os.path.join(path, name)
+        if os.path.isfile(full_path):
+            with open(full_path, "rb") as fh:
+                corpus.append((name, fh.read()))
+    return corpus
+
+
+def encode_corpus(corpus, encoding, repeat):
+    from reports.media_processing import FALLBACK_VARIANT, render_variants
+
+    totals = {"sizes": 0, "fallback": 0, "ms": []}
+    for name, data in corpus:
+        durations = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            outputs = render_variants(BytesIO(data), name, encoding=encoding)
+            durations.append((time.perf_counter() - start) * 1000)
+        durations.sort()
+        totals["ms"].append(durations[len(durations) // 2])
+        for label, (content, _, _, _) in outputs.items():
+            totals["fallback" if label == FALLBACK_VARIANT else "sizes"] += len(content)
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Görüntü dizini (varsayılan: sabit üretilmiş derlem)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    _django.setup()
+    from django.conf import settings
+    from reports.media_processing import avif_supported, encoding_policy
+
+    corpus = directory_corpus(args.corpus) if args.corpus else builtin_corpus()
+    if not corpus:
+        print("❌ Derlem boş")
+        sys.exit(1)
+    input_bytes = sum(len(data) for _, data in corpus)
+    print(f"🖼️  Derlem: {len(corpus)} görüntü, {input_bytes / 1e6:.2f} MB girdi")
+    print("=" * 78)
+    print(f"   {'politika':<10} {'boyutlar':>12} {'kazanç':>8} {'JPEG yedeği':>13} {'ms/görüntü':>12}")
+
+    baseline = None
+    for policy in POLICIES:
+        if policy == "avif" and not avif_supported():
+            print(f"   {policy:<10} atlandı (Pillow AVIF yazamıyor; pillow-avif-plugin kurun)")
+            continue
+        settings.MEDIA_ENCODING_POLICY = policy
+        totals = encode_corpus(corpus, encoding_policy(), max(1, args.repeat))
+        baseline = baseline or totals["sizes"]
+        saving = 1 - totals["sizes"] / baseline
+        fallback = f"{totals['fallback'] / 1e3:10.1f} KB" if totals["fallback"] else f"{'-':>13}"
+        mean_ms = sum(totals["ms"]) / len(totals["ms"])
+        print(
+            f"   {policy:<10} {totals['sizes'] / 1e3:9.1f} KB {saving:7.1%} {fallback} {mean_ms:12.1f}"
+        )
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
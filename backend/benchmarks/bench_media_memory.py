@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+"""
+Görüntü optimizasyonu bellek benchmark'ı
+
+Sentetik büyük bir JPEG (varsayılan 8000x6000, 48 MP) üretir ve her yöntemi ayrı bir alt
+süreçte çalıştırarak tepe RSS artışını (ru_maxrss) ve süreyi raporlar:
+
+- full:      tam çözünürlükte çöz (img.load) ve LANCZOS ile küçült
+- thumbnail: önceki Media.save yolu (Image.thumbnail, varsayılan reducing_gap)
+- optimize:  reports.media_processing.optimize_image (draft + piksel bütçesi)
+
+optimize yönteminin tepe bellek artışı full yöntemine göre en az --min-ratio kat düşük
+değilse çıkış kodu 1 olur.
+
+Kullanım:
+    python benchmarks/bench_media_memory.py
+    python benchmarks/bench_media_memory.py --width 6000 --height 4000 --min-ratio 5
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+METHODS = ("full", "thumbnail", "optimize")
+
+
+def make_jpeg(path, width, height):
+    from PIL import Image
+
+    # Gürültü + gradyan: gerçek fotoğrafa yakın sıkıştırma oranı
+    noise = Image.effect_noise((width, height), 48)
+    gradient = Image.linear_gradient("L").resize((width, height))
+    Image.merge("RGB", (noise, gradient, noise)).save(path, format="JPEG", quality=90)
+
+
+def run_child(method, path):
+    """Alt süreçte tek yöntemi çalıştırır; ölçümleri JSON olarak yazar."""
+    if method == "optimize":
+        import _django
+
+        _django.setup()
+        from reports.media_processing import optimize_image
+    from PIL import Image
+
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    with open(path, "rb") as fh:
+        if method == "full":
+            with Image.open(fh) as img:
+                img.load()
+                img = img.resize((1024, 768), Image.Resampling.LANCZOS)
+                buffer = BytesIO()
+                img.save(buffer, format="JPEG", quality=85, optimize=True)
+                size = img.size
+        elif method == "thumbnail":
+            with Image.open(fh) as img:
+                img.thumbnail((1024, 1024), Image.Resampling.LANCZOS)
+                buffer = BytesIO()
+                img.save(buffer, format="JPEG", quality=85, optimize=True)
+                size = img.size
+        else:
+            content, _, _ = optimize_image(fh, os.path.basename(path))
+            with Image.open(BytesIO(content)) as img:
+                size = img.size
+    elapsed = (time.perf_counter() - start) * 1000
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux'ta ru_maxrss KB cinsindendir
+    print(json.dumps({"peak_kb": after - before, "ms": elapsed, "size": size}))
+
+
+def run_script(*args):
+    # Linux'ta ru_maxrss fork/exec sonrası ebeveynin tepe değerini devralır; bu yüzden
+    # girdi de ayrı bir alt süreçte üretilir ve ana süreç küçük kalır
+    return subprocess.run(
+        [sys.executable, os.path.abspath(__file__), *args],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    ).stdout
+
+
+def measure(method, path):
+    output = run_script("--child", method, path)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--width", type=int, default=8000)
+    parser.add_argument("--height", type=int, default=6000)
+    parser.add_argument("--min-ratio", type=float, default=8.0)
+    parser.add_argument("--child", nargs=2, metavar=("METHOD", "PATH"), help=argparse.SUPPRESS)
+    parser.add_argument("--make", metavar="PATH", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return
+    if args.make:
+        make_jpeg(args.make, args.width, args.height)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "large.jpg")
+        run_script("--make", path, "--width", str(args.width), "--height", str(args.height))
+        megapixels = args.width * args.height / 1_000_000
+        print(f"🖼️  Girdi: {args.width}x{args.height} ({megapixels:.0f} MP), {os.path.getsize(path) / 1e6:.1f} MB JPEG")
+        print("=" * 72)
+        results = {}
+        for method in METHODS:
+            results[method] = measure(method, path)
+            result = results[method]
+            print(
+                f"   {method:<10} tepe RSS +{result['peak_kb'] / 1024:8.1f} MB"
+                f"  {result['ms']:8.1f} ms  çıktı {result['size'][0]}x{result['size'][1]}"
+            )
+        print("=" * 72)
+
+    ratio = results["full"]["peak_kb"] / max(1, results["optimize"]["peak_kb"])
+    if ratio < args.min_ratio:
+        print(f"❌ optimize tepe belleği full yönteminden yalnızca {ratio:.1f} kat düşük (beklenen ≥ {args.min_ratio})")
+        sys.exit(1)
+    print(f"✅ optimize tepe belleği full yönteminden {ratio:.1f} kat düşük")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+"""
+Medya URL serileştirme benchmark'ı
+
+Bellekte (veritabanı olmadan) --rows kadar Media nesnesi (dosya + 3 boyut varyantı) üretir
+ve MediaSerializer(many=True) ile serileştirir. Her depo yapılandırması için iki yöntem
+karşılaştırılır:
+
+- legacy:   satır başına FieldFile.url / storage.url + ayarlardan R2 alan adı türetme
+            (önceki MediaSerializer davranışı)
+- resolver: reports.media_urls.MediaURLResolver; taban bir kez hesaplanır, URL'ler
+            Media.file_path'ten dize birleştirmeyle üretilir
+
+Depolar: local (FileSystemStorage) ve r2 (S3Storage, özel alan adı, querystring_auth=False;
+üretim ayarları). resolver r2'de legacy'den en az --min-speedup kat hızlı değilse çıkış
+kodu 1 olur.
+
+Kullanım:
+    python benchmarks/bench_media_urls.py
+    python benchmarks/bench_media_urls.py --rows 10000 --repeat 5
+"""
+
+import argparse
+import sys
+
+import _django
+
+_django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.files.storage import FileSystemStorage  # noqa: E402
+from django.test import override_settings  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+from storages.backends.s3 import S3Storage  # noqa: E402
+
+from reports.media_urls import get_resolver  # noqa: E402
+from reports.models import Media  # noqa: E402
+from reports.serializers import (  # noqa: E402
+    FALLBACK_VARIANT,
+    PRIMARY_VARIANT,
+    VARIANT_LABELS,
+    MediaSerializer,
+)
+
+
+def legacy_absolute_url(url, request=None):
+    if getattr(settings, "USE_R2", False):
+        if not url.startswith("https://"):
+            if url.startswith("//"):
+                url = "https:" + url
+            elif url.startswith("/"):
+                domain = getattr(settings, "R2_CUSTOM_DOMAIN", "")
+                if domain and domain.strip():
+                    url = f"https://{domain}{url}"
+                else:
+                    account_id = getattr(settings, "R2_ACCOUNT_ID", "")
+                    bucket_name = getattr(settings, "R2_BUCKET_NAME", "")
+                    url = f"https://{bucket_name}.{account_id}.r2.cloudflarestorage.com{url}"
+            elif not url.startswith("http"):
+                url = f"https://{url}"
+        return url
+    if request is not None:
+        return request.build_absolute_uri(url)
+    return url
+
+
+class LegacyMediaSerializer(MediaSerializer):
+    def get_file(self, obj):
+        try:
+            return legacy_absolute_url(obj.file.url, self.context.get("request"))
+        except Exception:
+            return None
+
+    def get_variants(self, obj):
+        request = self.context.get("request")
+        url = legacy_absolute_url(obj.file.url, request)
+        variants = obj.variants or {}
+        urls = {}
+        for label in VARIANT_LABELS + (FALLBACK_VARIANT,):
+            if label == FALLBACK_VARIANT:
+                url = urls[PRIMARY_VARIANT]
+            name = (variants.get(label) or {}).get("name")
+            if name:
+                url = legacy_absolute_url(obj.file.storage.url(name), request)
+            urls[label] = url
+        return urls
+
+
+def build_rows(count):
+    rows = []
+    for index in range(count):
+        sha = f"{index:064x}"
+        name = f"reports/blobs/{sha[:2]}/{sha[2:4]}/{sha}.jpg"
+        rows.append(
+            Media(
+                id=index + 1,
+                file=name,
+                file_path=name,
+                file_size=120_000,
+                media_type="IMAGE",
+                processing_state=Media.PROCESSING_DONE,
+                variants={
+                    label: {"name": name.replace(".jpg", f"_{label}.jpg"), "width": 480, "height": 360}
+                    for label in ("card", "thumb")
+                },
+            )
+        )
+    return rows
+
+
+def s3_storage():
+    return S3Storage(
+        bucket_name="cozum-media",
+        endpoint_url="https://account.r2.cloudflarestorage.com",
+        access_key="benchmark",
+        secret_key="benchmark",
+        region_name="auto",
+        custom_domain="media.example.com",
+        querystring_auth=False,
+        signature_version="s3v4",
+    )
+
+
+CONFIGS = {
+    "local": (lambda: FileSystemStorage(), {"USE_R2": False, "MEDIA_URL": "/media/"}),
+    "r2": (s3_storage, {"USE_R2": True, "R2_CUSTOM_DOMAIN": "media.example.com"}),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-speedup", type=float, default=2.5)
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows)
+    request = APIRequestFactory().get("/api/reports/", HTTP_HOST="localhost")
+    field = Media._meta.get_field("file")
+    original_storage = field.storage
+    print(f"🔗 {args.rows} medya satırı (dosya + 2 varyant + yedek), medyan / {args.repeat} tekrar")
+    print("=" * 72)
+    speedups = {}
+    try:
+        for config, (make_storage, overrides) in CONFIGS.items():
+            field.storage = make_storage()
+            with override_settings(**overrides):
+                get_resolver()
+                timings = {}
+                for method, serializer_class in (("legacy", LegacyMediaSerializer), ("resolver", MediaSerializer)):
+                    timings[method], data = _django.timed(
+                        lambda: serializer_class(rows, many=True, context={"request": request}).data,
+                        repeat=args.repeat,
+                    )
+                speedups[config] = timings["legacy"] / timings["resolver"]
+                print(
+                    f"   {config:<10} legacy {timings['legacy']:9.1f} ms   resolver {timings['resolver']:9.1f} ms"
+                    f"   {speedups[config]:5.1f}x   örnek: {data[0]['file']}"
+                )
+    finally:
+        field.storage = original_storage
+    print("=" * 72)
+
+    if speedups["r2"] < args.min_speedup:
+        print(f"❌ r2'de resolver yalnızca {speedups['r2']:.1f} kat hızlı (beklenen ≥ {args.min_speedup})")
+        sys.exit(1)
+    print(f"✅ r2'de resolver {speedups['r2']:.1f} kat hızlı")
+
+
+if __name__ == "__main__":
+    main()
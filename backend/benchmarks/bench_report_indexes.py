@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+"""
+Bildirim listesi indeks benchmark'ı
+
+Test veritabanına (varsayılan 1.000.000) bildirim ekler, liste uç noktasının rol bazlı
+erişim yolları için sorgu planlarını (EXPLAIN) ve süreleri raporlar. Beklenen indeks
+planda görünmezse çıkış kodu 1 olur.
+
+Kullanım:
+    python benchmarks/bench_report_indexes.py --rows 1000000
+    USE_POSTGRES=true python benchmarks/bench_report_indexes.py --keepdb
+"""
+
+import argparse
+import random
+import sys
+from datetime import timedelta
+
+import _django
+
+_django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from reports.models import Category, Comment, Media, Report  # noqa: E402
+from users.models import Team  # noqa: E402
+
+User = get_user_model()
+
+STATUSES = [choice[0] for choice in Report.STATUS_CHOICES]
+PRIORITIES = [choice[0] for choice in Report.PRIORITY_CHOICES]
+
+
+def seed(rows, batch_size=10000):
+    rng = random.Random(42)
+    admin = User.objects.create_superuser(email="bench@example.com", password="bench", username="bench")
+    users = User.objects.bulk_create(
+        User(email=f"citizen{i}@example.com", username=f"citizen{i}", password="!")
+        for i in range(2000)
+    )
+    teams = [Team.objects.create(name=f"Ekip {i}", created_by=admin) for i in range(20)]
+    categories = [Category.objects.create(name=f"Kategori {i}") for i in range(12)]
+
+    now = timezone.now()
+    created = 0
+    while created < rows:
+        size = min(batch_size, rows - created)
+        Report.objects.bulk_create(
+            Report(
+                title=f"Bildirim {created + i}",
+                description="Benchmark",
+                reporter=rng.choice(users),
+                category=rng.choice(categories),
+                assigned_team=rng.choice(teams) if rng.random() < 0.6 else None,
+                status=rng.choice(STATUSES),
+                priority=rng.choice(PRIORITIES),
+            )
+            for i in range(size)
+        )
+        created += size
+        print(f"  {created}/{rows} bildirim eklendi", end="\r", flush=True)
+    print()
+
+    # auto_now_add alanlarını iki yıla yay
+    with connection.cursor() as cursor:
+        table = Report._meta.db_table
+        cursor.execute(f"SELECT MIN(id), MAX(id) FROM {table}")
+        min_id, max_id = cursor.fetchone()
+    span = max(1, max_id - min_id)
+    for start in range(min_id, max_id + 1, batch_size):
+        offset = (start - min_id) / span
+        Report.objects.filter(id__gte=start, id__lt=start + batch_size).update(
+            created_at=now - timedelta(days=730 * (1 - offset)),
+            updated_at=now - timedelta(days=730 * (1 - offset)),
+        )
+
+    sample = list(Report.objects.order_by("?").values_list("id", flat=True)[:200])
+    Comment.objects.bulk_create(
+        Comment(report_id=rid, user=admin, content="Yorum") for rid in sample for _ in range(5)
+    )
+    Media.objects.bulk_create(
+        Media(report_id=rid, file=f"reports/bench/{rid}.jpg", file_path=f"reports/bench/{rid}.jpg")
+        for rid in sample for _ in range(3)
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return users[0], teams[0], sample[0]
+
+
+def cases(citizen, team, report_id):
+    ordering = ("-created_at", "-id")
+    return [
+        ("Operatör: tüm liste", Report.objects.order_by(*ordering)[:20], "report_created_id_idx"),
+        (
+            "Vatandaş: kendi bildirimleri",
+            Report.objects.filter(reporter=citizen).order_by(*ordering)[:20],
+            "report_reporter_created_idx",
+        ),
+        (
+            "Ekip: takım + durum",
+            Report.objects.filter(assigned_team=team, status="BEKLEMEDE").order_by(*ordering)[:20],
+            "report_team_status_created_idx",
+        ),
+        (
+            "Operatör: durum filtresi",
+            Report.objects.filter(status="INCELENIYOR").order_by(*ordering)[:20],
+            "report_status_created_idx",
+        ),
+        (
+            "Operatör: öncelik filtresi",
+            Report.objects.filter(priority="ACIL").order_by(*ordering)[:20],
+            "report_priority_created_idx",
+        ),
+        (
+            "Yorumlar: bildirim bazlı",
+            Comment.objects.filter(report_id=report_id).order_by("-created_at"),
+            "comment_report_created_idx",
+        ),
+        (
+            "Medyalar: bildirim bazlı",
+            Media.objects.filter(report_id=report_id).order_by("uploaded_at"),
+            "media_report_uploaded_idx",
+        ),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--keepdb", action="store_true", help="Test veritabanını silme/yeniden kullan")
+    args = parser.parse_args()
+
+    print(f"🗄️  Veritabanı: {connection.vendor}, satır sayısı: {args.rows}")
+    with _django.benchmark_database(keepdb=args.keepdb):
+        if args.keepdb and Report.objects.exists():
+            citizen = User.objects.filter(email__startswith="citizen").first()
+            team = Team.objects.first()
+            report_id = Comment.objects.values_list("report_id", flat=True).first()
+        else:
+            citizen, team, report_id = seed(args.rows)
+
+        failures = 0
+        print("=" * 72)
+        for label, queryset, index_name in cases(citizen, team, report_id):
+            plan = queryset.explain()
+            duration, _ = _django.timed(lambda: list(queryset.all()))
+            uses_index = index_name in plan
+            failures += not uses_index
+            mark = "✅" if uses_index else "❌"
+            print(f"{mark} {label:<32} {duration:8.2f} ms  ({index_name})")
+            if not uses_index:
+                print("   Plan:", plan.replace("\n", "\n         "))
+        print("=" * 72)
+
+    if failures:
+        print(f"❌ {failures} sorgu beklenen indeksi kullanmıyor")
+        sys.exit(1)
+    print("✅ Tüm sorgular beklenen indeksleri kullanıyor")
+
+
+if __name__ == "__main__":
+    main()
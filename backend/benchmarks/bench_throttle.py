@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Hız sınırlayıcı benchmark'ı
+
+Aynı kullanıcı için art arda --requests kadar isteği iki throttle ile değerlendirir ve istek
+başına süreyi (mikrosaniye) ile anahtar başına önbellekte tutulan baytı karşılaştırır:
+
+- drf:     rest_framework.throttling.UserRateThrottle; anahtar başına zaman damgası listesi,
+           her istekte okunur, kırpılır ve yeniden yazılır (O(n))
+- sliding: cozum_var_backend.throttling.UserSlidingWindowThrottle; iki pencere sayacı,
+           istek başına bir atomik incr + bir get (O(1))
+
+Oran --rate (varsayılan 1000/hour, `user` kapsamı) olup tüm istekler sınırın altında kalır.
+Önbellek: locmem ve sqlite (cozum_var_backend.sqlite_cache). sliding herhangi bir önbellekte
+drf'ten yavaşsa çıkış kodu 1 olur.
+
+Kullanım:
+    python benchmarks/bench_throttle.py
+    python benchmarks/bench_throttle.py --requests 5000 --rate 10000/hour
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+import _django
+
+_django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.cache.backends.locmem import LocMemCache  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+from rest_framework.throttling import UserRateThrottle  # noqa: E402
+
+from cozum_var_backend.sqlite_cache import SQLiteCache  # noqa: E402
+from cozum_var_backend.throttling import UserSlidingWindowThrottle  # noqa: E402
+
+
+class View:
+    pass
+
+
+def stored_bytes(cache, prefix):
+    """Anahtar öneki eşleşen önbellek değerlerinin pickle boyutu."""
+    if isinstance(cache, LocMemCache):
+        return sum(len(value) for key, value in cache._cache.items() if prefix in key)
+    with cache._cursor() as connection:
+        rows = connection.execute("SELECT value FROM cache WHERE key LIKE ?", (f"%{prefix}%",)).fetchall()
+    return sum(len(value) if isinstance(value, bytes) else len(pickle.dumps(value)) for (value,) in rows)
+
+
+def run(throttle_class, cache, rate, requests):
+    request = APIRequestFactory().get("/api/reports/", HTTP_HOST="localhost")
+    request.user = get_user_model()(pk=1)
+    cache.clear()
+    throttle_class.cache = cache
+    throttle_class.THROTTLE_RATES = {"user": rate}
+    view = View()
+    began = time.perf_counter()
+    for _ in range(requests):
+        throttle = throttle_class()
+        if not throttle.allow_request(request, view):
+            raise SystemExit(f"{throttle_class.__name__} isteği reddetti; --rate sınırını yükseltin")
+    elapsed = time.perf_counter() - began
+    return elapsed / requests * 1_000_000, stored_bytes(cache, "user")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--rate", default="1000/hour")
+    args = parser.parse_args()
+
+    original = {cls: (cls.cache, cls.THROTTLE_RATES) for cls in (UserRateThrottle, UserSlidingWindowThrottle)}
+    print(f"🚦 tek kullanıcı, {args.requests} istek, oran {args.rate}")
+    print("=" * 72)
+    slower = []
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            caches = {
+                "locmem": LocMemCache("bench", {"OPTIONS": {"MAX_ENTRIES": 10_000}}),
+                "sqlite": SQLiteCache(os.path.join(directory, "cache.sqlite3"), {}),
+            }
+            for cache_name, cache in caches.items():
+                results = {}
+                for name, throttle_class in (("drf", UserRateThrottle), ("sliding", UserSlidingWindowThrottle)):
+                    results[name] = run(throttle_class, cache, args.rate, args.requests)
+                    per_request, size = results[name]
+                    print(f"   {cache_name:<7} {name:<8} {per_request:9.1f} µs/istek   anahtar başına {size:7,} bayt")
+                if results["sliding"][0] > results["drf"][0]:
+                    slower.append(cache_name)
+    finally:
+        for cls, (cache, rates) in original.items():
+            cls.cache, cls.THROTTLE_RATES = cache, rates
+    print("=" * 72)
+
+    if slower:
+        print(f"❌ sliding şu önbelleklerde drf'ten yavaş: {', '.join(slower)}")
+        sys.exit(1)
+    print("✅ sliding tüm önbelleklerde drf'ten hızlı ve sabit bellekli")
+
+
+if __name__ == "__main__":
+    main()
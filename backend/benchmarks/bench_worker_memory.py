@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+"""
+Medya çalışanı bellek benchmark'ı
+
+Sentetik büyük JPEG'ler (varsayılan 4000x3000, ~12 MP) üretir ve her --counts değeri için
+ayrı bir alt süreçte o kadar PENDING medyayı tek bir reports.media_processing.process_batch
+çağrısıyla işler; tepe RSS artışını (ru_maxrss) ve süreyi raporlar.
+
+Orijinaller geçici dosyalara indirilip çıktılar doğrudan geçici dosyalara kodlandığı için
+tepe bellek görüntü sayısıyla değil MEDIA_UPLOAD_THREADS ile sınırlıdır. En büyük grubun
+tepe belleği en küçük grubunkinin --max-ratio katını aşarsa çıkış kodu 1 olur.
+
+Kullanım:
+    python benchmarks/bench_worker_memory.py
+    python benchmarks/bench_worker_memory.py --counts 4,32 --width 6000 --height 4000
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def make_jpegs(directory, count, width, height):
+    from PIL import Image
+
+    for index in range(count):
+        noise = Image.effect_noise((width, height), 40 + index)
+        gradient = Image.linear_gradient("L").resize((width, height))
+        Image.merge("RGB", (noise, gradient, noise)).save(
+            os.path.join(directory, f"photo{index}.jpg"), format="JPEG", quality=90
+        )
+
+
+def run_child(count, directory):
+    """Alt süreçte `count` medyayı işler; ölçümleri JSON olarak yazar."""
+    import _django
+
+    _django.setup()
+    from django.conf import settings
+
+    settings.MEDIA_ROOT = os.path.join(directory, "media")
+    settings.FILE_UPLOAD_TEMP_DIR = os.path.join(directory, "tmp")
+    os.makedirs(settings.FILE_UPLOAD_TEMP_DIR, exist_ok=True)
+
+    from django.contrib.auth import get_user_model
+    from django.core.files import File
+
+    from reports.media_processing import process_batch
+    from reports.models import Category, Media, Report
+
+    photos = sorted(name for name in os.listdir(directory) if name.endswith(".jpg"))
+    with _django.benchmark_database():
+        user = get_user_model().objects.create_user(email="bench@example.com", password="bench", username="bench")
+        report = Report.objects.create(
+            title="Bellek", description="Benchmark", reporter=user, category=Category.objects.create(name="Bench")
+        )
+        storage = Media._meta.get_field("file").storage
+        medias = []
+        for index in range(count):
+            photo = photos[index % len(photos)]
+            with open(os.path.join(directory, photo), "rb") as fh:
+                name = storage.save(f"reports/bench/{index}_{photo}", File(fh, name=photo))
+            medias.append(
+                Media(
+                    report=report,
+                    file=name,
+                    file_path=name,
+                    file_size=storage.size(name),
+                    processing_state=Media.PROCESSING_PENDING,
+                )
+            )
+        ids = [media.pk for media in Media.objects.bulk_create(medias)]
+        input_bytes = sum(media.file_size for media in medias)
+
+        before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start = time.perf_counter()
+        processed = process_batch(ids)
+        elapsed = (time.perf_counter() - start) * 1000
+        after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        done = Media.objects.filter(pk__in=ids, processing_state=Media.PROCESSING_DONE).count()
+    # Linux'ta ru_maxrss KB cinsindendir
+    print(json.dumps({"peak_kb": after - before, "ms": elapsed, "done": done, "processed": processed,
+                      "input_bytes": input_bytes}))
+
+
+def run_script(*args):
+    # Girdiler ve her ölçüm ayrı süreçte: ru_maxrss ebeveynin tepe değerini devralmasın
+    return subprocess.run(
+        [sys.executable, os.path.abspath(__file__), *args],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    ).stdout
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", default="4,16", help="Virgülle ayrılmış grup boyutları (varsayılan: 4,16)")
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    parser.add_argument("--photos", type=int, default=16, help="Üretilecek farklı fotoğraf sayısı")
+    parser.add_argument("--max-ratio", type=float, default=1.5)
+    parser.add_argument("--child", nargs=2, metavar=("COUNT", "DIR"), help=argparse.SUPPRESS)
+    parser.add_argument("--make", metavar="DIR", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(int(args.child[0]), args.child[1])
+        return
+    if args.make:
+        make_jpegs(args.make, args.photos, args.width, args.height)
+        return
+
+    counts = sorted(int(value) for value in args.counts.split(","))
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        run_script("--make", tmp, "--photos", str(args.photos), "--width", str(args.width),
+                   "--height", str(args.height))
+        print(f"🖼️  Girdi: {args.photos} farklı {args.width}x{args.height} JPEG")
+        print("=" * 78)
+        for count in counts:
+            output = run_script("--child", str(count), tmp)
+            results[count] = result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"   {count:>4} medya ({result['input_bytes'] / 1e6:7.1f} MB orijinal)"
+                f"  tepe RSS +{result['peak_kb'] / 1024:7.1f} MB  {result['ms']:9.1f} ms"
+                f"  tamamlanan {result['done']}/{count}"
+            )
+        print("=" * 78)
+
+    failed = [count for count, result in results.items() if result["done"] != count]
+    ratio = results[counts[-1]]["peak_kb"] / max(1, results[counts[0]]["peak_kb"])
+    if failed or ratio > args.max_ratio:
+        print(f"❌ tepe bellek {counts[0]}→{counts[-1]} medyada {ratio:.2f} kat arttı veya işleme başarısız: {failed}")
+        sys.exit(1)
+    print(f"✅ tepe bellek {counts[0]}→{counts[-1]} medyada {ratio:.2f} kat (sınır {args.max_ratio})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Hız sınırı sayaçları testler arasında taşınmasın (login 5/dk gibi kapsamlar)
+    cache.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    # Yüklenen/işlenen dosyalar depodaki media/ klasörüne değil teste özel dizine yazılsın
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    settings.MEDIA_RESUMABLE_UPLOAD_DIR = str(tmp_path / "resumable")
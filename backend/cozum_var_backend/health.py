@@ -1,65 +1,187 @@
+"""Sağlık kontrolleri.
+
+- ``/api/health/live/``: süreç ayakta mı; hiçbir G/Ç yapmaz (Docker HEALTHCHECK).
+- ``/api/health/ready/``: veritabanı ve önbellek erişilebilir mi; her biri için gecikme.
+- ``/api/health/``: yukarıdakilere ek olarak depo (R2/yerel) yazma/silme yoklaması.
+
+Depo yoklaması istek sırasında yapılmaz: son sonuç önbellekte `HEALTH_STORAGE_PROBE_TTL`
+saniye taze sayılır, eskidiğinde arka plan iş parçacığında yenilenir. Önbellekteki kilit
+anahtarı sayesinde aynı anda yalnızca bir yoklama çalışır.
+"""
+
+import logging
+import threading
+import time
+import uuid
+
+from django.conf import settings  # pyright: ignore[reportMissingImports]
+from django.core.cache import cache  # pyright: ignore[reportMissingImports]
+from django.core.files.base import ContentFile  # pyright: ignore[reportMissingImports]
+from django.core.files.storage import default_storage  # pyright: ignore[reportMissingImports]
+from django.db import connection  # pyright: ignore[reportMissingImports]
 from django.http import JsonResponse  # pyright: ignore[reportMissingImports]
-from django.views.decorators.http import require_http_methods  # pyright: ignore[reportMissingImports]
 from django.views.decorators.csrf import csrf_exempt  # pyright: ignore[reportMissingImports]
-from django.conf import settings  # pyright: ignore[reportMissingImports]
+from django.views.decorators.http import require_http_methods  # pyright: ignore[reportMissingImports]
+
+logger = logging.getLogger(__name__)
+
+SERVICE = "cozum-var-backend"
+VERSION = "1.0.0"
+PROBE_CACHE_KEY = "health:storage-probe"
+PROBE_LOCK_KEY = "health:storage-probe:lock"
+PROBE_PREFIX = "health_test"
+
+
+def probe_ttl():
+    return getattr(settings, "HEALTH_STORAGE_PROBE_TTL", 300)
+
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def _timed(name, check):
+    """`check`'i çalıştırır; durum ve milisaniye cinsinden gecikme döndürür."""
+    started = time.perf_counter()
+    try:
+        check()
+    except Exception as exc:
+        logger.warning("Health check %s failed", name, exc_info=True)
+        return {"status": "error", "latency_ms": _elapsed_ms(started), "error": str(exc)}
+    return {"status": "ok", "latency_ms": _elapsed_ms(started)}
+
+
+def check_database():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+
+
+def check_cache():
+    key = f"health:ping:{uuid.uuid4().hex}"
+    cache.set(key, 1, timeout=10)
+    if cache.get(key) != 1:
+        raise RuntimeError("Önbelleğe yazılan değer okunamadı.")
+    cache.delete(key)
+
+
+def probe_storage():
+    """Depoya küçük bir nesne yazıp siler; adım gecikmeleriyle birlikte sonucu döndürür."""
+    result = {"status": "ok", "checked_at": time.time(), "latency_ms": {}}
+    step = "write"
+    try:
+        started = time.perf_counter()
+        name = default_storage.save(f"{PROBE_PREFIX}/{uuid.uuid4().hex}.txt", ContentFile(b"ok"))
+        result["latency_ms"]["write"] = _elapsed_ms(started)
+        step = "delete"
+        started = time.perf_counter()
+        default_storage.delete(name)
+        result["latency_ms"]["delete"] = _elapsed_ms(started)
+    except Exception as exc:
+        logger.warning("Storage probe failed at %s", step, exc_info=True)
+        result.update(status="error", failed_step=step, error=_describe_storage_error(exc))
+    return result
+
+
+def _describe_storage_error(exc):
+    # botocore ClientError hata kodunu `response` içinde taşır
+    response = getattr(exc, "response", None) or {}
+    code = response.get("Error", {}).get("Code")
+    return f"{type(exc).__name__} ({code}): {exc}" if code else f"{type(exc).__name__}: {exc}"
+
+
+def refresh_storage_probe():
+    """Yoklamayı hemen çalıştırır ve sonucu önbelleğe yazar."""
+    result = probe_storage()
+    # Taze olmasa da son sonuç gösterilebilsin diye TTL'den uzun tutulur
+    cache.set(PROBE_CACHE_KEY, result, timeout=probe_ttl() * 10)
+    return result
+
+
+def _refresh_and_unlock():
+    try:
+        refresh_storage_probe()
+    except Exception:
+        logger.exception("Storage probe refresh failed")
+    finally:
+        cache.delete(PROBE_LOCK_KEY)
+
+
+def refresh_storage_probe_async():
+    """Başka bir yoklama sürmüyorsa arka planda yenileme başlatır; iş parçacığını döndürür."""
+    # Kilit, takılan bir yoklama sonsuza dek engellemesin diye süreli tutulur
+    if not cache.add(PROBE_LOCK_KEY, 1, timeout=max(probe_ttl(), 60)):
+        return None
+    thread = threading.Thread(target=_refresh_and_unlock, name="health-storage-probe", daemon=True)
+    thread.start()
+    return thread
+
+
+def storage_probe_status():
+    """Önbellekteki son depo yoklaması; eskimişse yenileme beklenmeden arka planda başlatılır."""
+    try:
+        result = cache.get(PROBE_CACHE_KEY)
+    except Exception:
+        logger.warning("Could not read cached storage probe", exc_info=True)
+        return {"status": "unknown"}
+    if result is None:
+        refresh_storage_probe_async()
+        return {"status": "pending"}
+    age = time.time() - result["checked_at"]
+    if age > probe_ttl():
+        refresh_storage_probe_async()
+    return {**result, "age_s": round(age, 1), "stale": age > probe_ttl()}
+
+
+def storage_info():
+    use_r2 = bool(getattr(settings, "USE_R2", False))
+    info = {"type": "R2" if use_r2 else "local", "configured": use_r2}
+    if use_r2:
+        info["bucket"] = getattr(settings, "R2_BUCKET_NAME", "not-set")
+        info["domain"] = getattr(settings, "R2_CUSTOM_DOMAIN", "not-set")
+        info["media_url"] = getattr(settings, "MEDIA_URL", "not-set")
+    return info
+
+
+def _dependency_checks():
+    return {"database": _timed("database", check_database), "cache": _timed("cache", check_cache)}
+
+
+@csrf_exempt
+@require_http_methods(["GET", "HEAD"])
+def health_live(request):
+    """Liveness: süreç istek yanıtlayabiliyor; bağımlılıklara dokunmaz."""
+    return JsonResponse({"status": "alive", "service": SERVICE})
+
+
+@csrf_exempt
+@require_http_methods(["GET", "HEAD"])
+def health_ready(request):
+    """Readiness: veritabanı ve önbellek; biri erişilemezse 503."""
+    checks = _dependency_checks()
+    ready = all(check["status"] == "ok" for check in checks.values())
+    return JsonResponse(
+        {"status": "ready" if ready else "unavailable", "service": SERVICE, "checks": checks},
+        status=200 if ready else 503,
+    )
 
 
 @csrf_exempt
 @require_http_methods(["GET"])
 def health_check(request):
-    """Health check endpoint for Docker container monitoring."""
-    
+    """Ayrıntılı durum: bağımlılık kontrolleri ve önbellekteki son depo yoklaması.
+
+    Yoklama hatalıysa veya veritabanı/önbellek erişilemezse 503 döner; ilk yoklama
+    tamamlanana kadar depo durumu ``pending`` görünür.
+    """
+    checks = _dependency_checks()
+    checks["storage"] = storage_probe_status()
+    healthy = all(check["status"] != "error" for check in checks.values())
     health_info = {
-        "status": "healthy",
-        "service": "cozum-var-backend",
-        "version": "1.0.0",
-        "storage": {
-            "type": "R2" if getattr(settings, 'USE_R2', False) else "local",
-            "configured": bool(getattr(settings, 'USE_R2', False))
-        }
+        "status": "healthy" if healthy else "unhealthy",
+        "service": SERVICE,
+        "version": VERSION,
+        "storage": storage_info(),
+        "checks": checks,
     }
-    
-    # Add R2 configuration details if enabled
-    if getattr(settings, 'USE_R2', False):
-        health_info["storage"]["bucket"] = getattr(settings, 'R2_BUCKET_NAME', 'not-set')
-        health_info["storage"]["domain"] = getattr(settings, 'R2_CUSTOM_DOMAIN', 'not-set')
-        health_info["storage"]["media_url"] = getattr(settings, 'MEDIA_URL', 'not-set')
-        
-        # Test URL generation with dummy path
-        try:
-            from django.core.files.storage import default_storage
-            test_url = default_storage.url('test/dummy.jpg')
-            health_info["storage"]["test_url"] = test_url
-            
-            # Test R2 write permissions
-            try:
-                from django.core.files.base import ContentFile
-                from botocore.exceptions import ClientError, NoCredentialsError
-                
-                test_file = ContentFile(b"test content", name="health_check_test.txt")
-                test_path = default_storage.save('health_test/test.txt', test_file)
-                health_info["storage"]["write_test"] = "SUCCESS"
-                health_info["storage"]["test_file_path"] = test_path
-                
-                # Clean up test file
-                try:
-                    default_storage.delete(test_path)
-                    health_info["storage"]["cleanup"] = "SUCCESS"
-                except Exception:
-                    health_info["storage"]["cleanup"] = "FAILED"
-                    
-            except ClientError as client_error:
-                health_info["storage"]["write_test"] = "FAILED"
-                health_info["storage"]["write_error"] = f"ClientError: {str(client_error)}"
-                health_info["storage"]["error_code"] = getattr(client_error, 'response', {}).get('Error', {}).get('Code', 'Unknown')
-            except NoCredentialsError:
-                health_info["storage"]["write_test"] = "FAILED"
-                health_info["storage"]["write_error"] = "No credentials provided"
-            except Exception as write_error:
-                health_info["storage"]["write_test"] = "FAILED"
-                health_info["storage"]["write_error"] = str(write_error)
-                
-        except Exception as e:
-            health_info["storage"]["url_error"] = str(e)
-    
-    return JsonResponse(health_info)
\ No newline at end of file
+    return JsonResponse(health_info, status=200 if healthy else 503)
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
@@ -36,6 +37,8 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    # PostgreSQL trigram lookup'ları (bildirim önerileri) için
+    "django.contrib.postgres",
     "rest_framework",
     "corsheaders",
     "rest_framework_simplejwt",
@@ -143,6 +146,11 @@ X_FRAME_OPTIONS = 'DENY'
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Yüklemeler bu boyutun üzerinde bellekte değil FILE_UPLOAD_TEMP_DIR'de (boşsa sistem geçici
+# dizini) tutulur (Django varsayılanı 2.5 MB); medya çalışanı da geçici dosyalarını buraya yazar
+FILE_UPLOAD_MAX_MEMORY_SIZE = int(os.environ.get('FILE_UPLOAD_MAX_MEMORY_SIZE', str(256 * 1024)))
+FILE_UPLOAD_TEMP_DIR = os.environ.get('FILE_UPLOAD_TEMP_DIR') or None
+
 # R2 / S3 compatible storage (optional - enable via USE_R2)
 USE_R2 = os.environ.get('USE_R2', 'False').lower() == 'true'
 if USE_R2:
@@ -152,6 +160,13 @@ if USE_R2:
     R2_BUCKET_NAME = os.environ.get('R2_BUCKET_NAME')
     R2_CUSTOM_DOMAIN = os.environ.get('R2_CUSTOM_DOMAIN')  # e.g. media.example.com or pub-xxxx.r2.dev
 
+    from boto3.s3.transfer import TransferConfig
+
+    # Depoya yazma/okuma akışları: bu boyutun üzerindeki nesneler parça parça (multipart)
+    # ve sınırlı eşzamanlılıkla aktarılır; bellekte en fazla parça boyutu x eşzamanlılık tutulur
+    R2_MULTIPART_CHUNK_SIZE = int(os.environ.get('R2_MULTIPART_CHUNK_SIZE', str(8 * 1024 * 1024)))
+    R2_MAX_CONCURRENCY = int(os.environ.get('R2_MAX_CONCURRENCY', '4'))
+
     STORAGES = {
         "default": {
             "BACKEND": "storages.backends.s3.S3Storage",
@@ -171,6 +186,14 @@ if USE_R2:
                 "object_parameters": {
                     "CacheControl": "max-age=86400",  # 1 day cache
                 },
+                "transfer_config": TransferConfig(
+                    multipart_threshold=R2_MULTIPART_CHUNK_SIZE,
+                    multipart_chunksize=R2_MULTIPART_CHUNK_SIZE,
+                    max_concurrency=R2_MAX_CONCURRENCY,
+                ),
+                # storage.open() ile okunan nesneler bu boyutun üzerinde diske taşar
+                # (0 olursa SpooledTemporaryFile hiç taşmaz, nesnenin tamamı bellekte kalır)
+                "max_memory_size": FILE_UPLOAD_MAX_MEMORY_SIZE,
                 # Additional EU-specific settings
                 "use_ssl": True,
                 "verify": True,
@@ -204,9 +227,12 @@ REST_FRAMEWORK = {
     ],
     # OpenAPI şeması
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # Sabit bellekli kayan pencere sayaçları (cozum_var_backend.throttling); kapsamlı oranlar
+    # view'daki throttle_scope (ve varsa throttle_methods) ile seçilir
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "cozum_var_backend.throttling.AnonSlidingWindowThrottle",
+        "cozum_var_backend.throttling.UserSlidingWindowThrottle",
+        "cozum_var_backend.throttling.ScopedSlidingWindowThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "100/hour",
@@ -214,6 +240,10 @@ REST_FRAMEWORK = {
         "login": "5/min",
         "register": "3/hour",
         "password_change": "3/min",
+        "report_create": "10/hour",
+        "report_upload": "60/hour",
+        "resumable_create": "60/hour",
+        "comment_create": "5/min",
     },
 }
 
@@ -249,23 +279,103 @@ else:
         }
     }
 
+# PostgreSQL tam metin arama yapılandırması (reports.search)
+REPORT_SEARCH_CONFIG = os.environ.get('REPORT_SEARCH_CONFIG', 'turkish')
+
+# Başlık/konum önerileri (reports.suggest): asgari trigram benzerliği ve
+# PostgreSQL dışındaki veritabanlarında süreç içi indeksin yenilenme süresi (saniye)
+REPORT_SUGGEST_MIN_SIMILARITY = float(os.environ.get('REPORT_SUGGEST_MIN_SIMILARITY', '0.3'))
+REPORT_SUGGEST_INDEX_TTL = int(os.environ.get('REPORT_SUGGEST_INDEX_TTL', '300'))
+
+# Harita kümeleri karo önbelleği süresi (saniye); bildirim değişikliklerinde ayrıca geçersiz kılınır
+REPORT_CLUSTER_CACHE_TIMEOUT = int(os.environ.get('REPORT_CLUSTER_CACHE_TIMEOUT', '600'))
+# Isı haritası vektör karoları; anahtar karo sürümünü içerdiğinden uzun tutulabilir
+REPORT_TILE_CACHE_TIMEOUT = int(os.environ.get('REPORT_TILE_CACHE_TIMEOUT', '3600'))
+# Önbellek işçiler arasında paylaşılmıyorsa (CACHE_BACKEND=locmem) kümeler, karolar ve
+# sürümleri en fazla bu kadar tutulur; başka işçide kaydedilen bildirim en geç bu sürede görünür
+REPORT_MAP_LOCAL_CACHE_TIMEOUT = int(os.environ.get('REPORT_MAP_LOCAL_CACHE_TIMEOUT', '30'))
+
+# Görüntü optimizasyonu (reports.media_processing): 'sync' commit sonrası aynı süreçte,
+# 'queue' ise `python manage.py process_media` çalışanı tarafından yapılır
+MEDIA_PROCESSING_MODE = os.environ.get('MEDIA_PROCESSING_MODE', 'sync')
+# process_media çalışanının çözme/boyutlandırma süreç havuzu boyutu (1: aynı süreçte)
+MEDIA_PROCESSING_WORKERS = int(os.environ.get('MEDIA_PROCESSING_WORKERS', '1'))
+# Depo okuma/yazmaları için eşzamanlı iş parçacığı sayısı (yükleme ve optimizasyon)
+MEDIA_UPLOAD_THREADS = int(os.environ.get('MEDIA_UPLOAD_THREADS', '4'))
+# Yüklenen görüntüler için piksel bütçesi; aşanlar çözülmeden reddedilir (48 MP telefon fotoğrafları sığar)
+MEDIA_MAX_IMAGE_PIXELS = int(os.environ.get('MEDIA_MAX_IMAGE_PIXELS', '64000000'))
+# Olası mükerrer bildirimler: en fazla bu Hamming mesafesindeki (64 bit dHash) görüntüler,
+# her iki bildirimde koordinat varsa bu yarıçap (metre) içinde olmalı
+REPORT_DUPLICATE_MAX_DISTANCE = int(os.environ.get('REPORT_DUPLICATE_MAX_DISTANCE', '6'))
+REPORT_DUPLICATE_RADIUS_M = int(os.environ.get('REPORT_DUPLICATE_RADIUS_M', '200'))
+# Çıktı formatı: 'original' (giriş formatı korunur), 'webp' veya 'avif' (Pillow AVIF
+# yazamıyorsa webp); webp/avif seçildiğinde eski istemciler için JPEG yedeği de üretilir
+MEDIA_ENCODING_POLICY = os.environ.get('MEDIA_ENCODING_POLICY', 'original')
+# Biçim başına kodlayıcı ayarları (reports.media_processing.ENCODER_OPTIONS üzerine yazılır)
+MEDIA_ENCODING_OPTIONS = {
+    'WEBP': {
+        'quality': int(os.environ.get('MEDIA_WEBP_QUALITY', '80')),
+        'method': int(os.environ.get('MEDIA_WEBP_METHOD', '6')),
+    },
+    'AVIF': {
+        'quality': int(os.environ.get('MEDIA_AVIF_QUALITY', '60')),
+        'speed': int(os.environ.get('MEDIA_AVIF_SPEED', '6')),
+    },
+}
+# Doğrudan depoya yükleme (reports.direct_uploads): imzalı PUT adresinin ömrü (saniye),
+# dosya başına bayt sınırı ve tek istekte en fazla dosya sayısı
+MEDIA_DIRECT_UPLOAD_EXPIRES = int(os.environ.get('MEDIA_DIRECT_UPLOAD_EXPIRES', '600'))
+MEDIA_DIRECT_UPLOAD_MAX_BYTES = int(os.environ.get('MEDIA_DIRECT_UPLOAD_MAX_BYTES', str(20 * 1024 * 1024)))
+MEDIA_DIRECT_UPLOAD_MAX_FILES = int(os.environ.get('MEDIA_DIRECT_UPLOAD_MAX_FILES', '10'))
+# Parça parça yüklemeler (reports.resumable): yarım dosyaların geçici dizini (tüm web
+# süreçleri/kapsayıcılarınca paylaşılmalı; boşsa sistem geçici dizini) ve son parçadan
+# sonraki geçerlilik süresi (saniye). Süresi dolanları `cleanup_uploads` siler.
+MEDIA_RESUMABLE_UPLOAD_DIR = os.environ.get('MEDIA_RESUMABLE_UPLOAD_DIR', '')
+MEDIA_RESUMABLE_UPLOAD_EXPIRES = int(os.environ.get('MEDIA_RESUMABLE_UPLOAD_EXPIRES', str(24 * 60 * 60)))
+
+# Sağlık kontrolü (cozum_var_backend.health): /api/health/ depo yoklamasının taze sayıldığı
+# süre (saniye); eskiyen sonuç istek beklemeden arka planda yenilenir
+HEALTH_STORAGE_PROBE_TTL = int(os.environ.get('HEALTH_STORAGE_PROBE_TTL', '300'))
+
 
 # Cache Configuration
-# Rate limiting için cache kullanımı
-# Development için locmem cache kullanıyoruz
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
-        'TIMEOUT': 300,  # 5 dakika default timeout
-        'OPTIONS': {
-            'MAX_ENTRIES': 1000,
+# Rate limiting ve harita karo önbelleği için cache kullanımı. CACHE_BACKEND:
+# - 'locmem': süreç içi (geliştirme/test); her gunicorn işçisi kendi sayaçlarını tutar,
+#   harita önbelleği REPORT_MAP_LOCAL_CACHE_TIMEOUT ile kısa tutulur
+# - 'sqlite': aynı makinedeki tüm işçilerin paylaştığı WAL kipli dosya, harici servis
+#   gerektirmez (cozum_var_backend.sqlite_cache); CACHE_LOCATION yerel diskte olmalı
+# - 'redis': REDIS_URL; birden fazla kapsayıcı aynı sayaçları paylaşacaksa
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+if CACHE_BACKEND == 'sqlite':
+    CACHES = {
+        'default': {
+            'BACKEND': 'cozum_var_backend.sqlite_cache.SQLiteCache',
+            'LOCATION': os.environ.get('CACHE_LOCATION') or os.path.join(tempfile.gettempdir(), 'cozum-cache.sqlite3'),
+            'TIMEOUT': 300,
+            'OPTIONS': {
+                'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', '100000')),
+            }
+        }
+    }
+elif CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('REDIS_URL', 'redis://localhost:6379/1'),
+            'TIMEOUT': 300,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+            'TIMEOUT': 300,  # 5 dakika default timeout
+            'OPTIONS': {
+                'MAX_ENTRIES': 1000,
+            }
         }
     }
-}
-
-# Rate limiting ayarları
-RATELIMIT_USE_CACHE = os.environ.get('RATELIMIT_USE_CACHE', 'default')
 
 
 # Password validation
@@ -0,0 +1,236 @@
+"""Aynı makinedeki tüm süreçlerin paylaştığı SQLite (WAL) önbellek arka ucu.
+
+LocMemCache her gunicorn işçisinde ayrı tutulduğundan ratelimit sayaçları ve DRF throttle
+geçmişi işçi sayısı kadar çoğalır. Bu arka uç harici bir servis gerektirmeden tek bir
+dosyayı paylaşır:
+
+- WAL kipinde okuyucular yazıcıyı beklemez; her deyim kendi başına atomiktir.
+- Tamsayılar SQLite INTEGER olarak saklanır; `incr` tek bir ``UPDATE ... RETURNING``
+  ile yapılır, eşzamanlı işçiler sayaç kaybetmez. `add` süresi dolmuş kaydın üzerine
+  yazan tek bir upsert'tir (hız sınırı sayaçlarının add + incr deseni için).
+- Diğer değerler pickle ile saklanır.
+- Bağlantılar süreç başına küçük bir havuzda tutulur (gevent'te iş parçacığı yerelliği
+  greenlet başına bağlantı demek olurdu); fork sonrası havuz yeniden kurulur.
+
+Dosya yerel diskte olmalıdır (SQLite kilitleri ağ dosya sistemlerinde güvenilir değildir);
+birden fazla kapsayıcı aynı sayaçları paylaşacaksa Redis kullanılmalıdır.
+
+    CACHES = {"default": {
+        "BACKEND": "cozum_var_backend.sqlite_cache.SQLiteCache",
+        "LOCATION": "/tmp/cozum-cache.sqlite3",
+    }}
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+# SQLite INTEGER aralığı; dışındaki tamsayılar pickle ile saklanır
+INTEGER_RANGE = range(-(2**63), 2**63)
+# Sorgu başına bağlanan parametre sınırının (eski SQLite'larda 999) altında kalınır
+MAX_PARAMS = 900
+# Bağlantı başına bu kadar yazımda bir süresi dolanlar temizlenir ve MAX_ENTRIES uygulanır
+CULL_EVERY = 128
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires REAL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires);
+"""
+
+
+def _encode(value):
+    if type(value) is int and value in INTEGER_RANGE:
+        return value
+    return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+
+def _decode(value):
+    return value if isinstance(value, int) else pickle.loads(value)
+
+
+class SQLiteCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = location
+        options = params.get("OPTIONS", {})
+        self._busy_timeout = float(options.get("BUSY_TIMEOUT", 5))
+        self._lock = threading.Lock()
+        self._pool = []
+        self._pid = None
+        self._writes = 0
+
+    def _connect(self):
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(
+            self._path, timeout=self._busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        # WAL'da NORMAL yalnızca işletim sistemi çökmesinde son işlemleri kaybettirebilir
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(SCHEMA)
+        return connection
+
+    @contextmanager
+    def _cursor(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                # Fork'tan miras kalan bağlantılar paylaşılmamalı
+                self._pool = []
+                self._pid = os.getpid()
+            connection = self._pool.pop() if self._pool else None
+        if connection is None:
+            connection = self._connect()
+        try:
+            yield connection
+        except BaseException:
+            if connection.in_transaction:
+                connection.rollback()
+            raise
+        finally:
+            with self._lock:
+                if self._pid == os.getpid():
+                    self._pool.append(connection)
+
+    def _wrote(self, connection, count=1):
+        with self._lock:
+            self._writes += count
+            due = self._writes >= CULL_EVERY
+            if due:
+                self._writes = 0
+        if due:
+            self._cull(connection, time.time())
+
+    def _cull(self, connection, now):
+        connection.execute("DELETE FROM cache WHERE expires <= ?", (now,))
+        if self._max_entries:
+            (count,) = connection.execute("SELECT COUNT(*) FROM cache").fetchone()
+            if count > self._max_entries:
+                # Önce en yakında dolacaklar, süresiz kayıtlar en son silinir
+                connection.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache "
+                    "ORDER BY expires IS NULL, expires LIMIT ?)",
+                    (count // self._cull_frequency if self._cull_frequency else count,),
+                )
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._cursor() as connection:
+            row = connection.execute(
+                "SELECT value FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                (key, time.time()),
+            ).fetchone()
+        return default if row is None else _decode(row[0])
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._cursor() as connection:
+            connection.execute(
+                "INSERT INTO cache (key, value, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires",
+                (key, _encode(value), self.get_backend_timeout(timeout)),
+            )
+            self._wrote(connection)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._cursor() as connection:
+            added = connection.execute(
+                "INSERT INTO cache (key, value, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires "
+                "WHERE cache.expires <= ?",
+                (key, _encode(value), self.get_backend_timeout(timeout), time.time()),
+            ).rowcount
+            self._wrote(connection)
+        return added == 1
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._cursor() as connection:
+            touched = connection.execute(
+                "UPDATE cache SET expires = ? WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                (self.get_backend_timeout(timeout), key, time.time()),
+            ).rowcount
+        return touched == 1
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._cursor() as connection:
+            row = connection.execute(
+                "UPDATE cache SET value = value + ? WHERE key = ? AND typeof(value) = 'integer' "
+                "AND (expires IS NULL OR expires > ?) RETURNING value",
+                (delta, key, time.time()),
+            ).fetchone()
+        if row is None:
+            raise ValueError(f"Key '{key}' not found or not an integer")
+        return row[0]
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._cursor() as connection:
+            return connection.execute("DELETE FROM cache WHERE key = ?", (key,)).rowcount == 1
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._cursor() as connection:
+            row = connection.execute(
+                "SELECT 1 FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                (key, time.time()),
+            ).fetchone()
+        return row is not None
+
+    def get_many(self, keys, version=None):
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        names = list(key_map)
+        found = {}
+        now = time.time()
+        with self._cursor() as connection:
+            for start in range(0, len(names), MAX_PARAMS):
+                chunk = names[start:start + MAX_PARAMS]
+                rows = connection.execute(
+                    f"SELECT key, value FROM cache WHERE key IN ({', '.join('?' * len(chunk))}) "
+                    "AND (expires IS NULL OR expires > ?)",
+                    (*chunk, now),
+                )
+                found.update((key_map[name], _decode(value)) for name, value in rows)
+        return found
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        expires = self.get_backend_timeout(timeout)
+        rows = [
+            (self.make_and_validate_key(key, version=version), _encode(value), expires)
+            for key, value in data.items()
+        ]
+        with self._cursor() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.executemany(
+                "INSERT INTO cache (key, value, expires) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires",
+                rows,
+            )
+            connection.execute("COMMIT")
+            self._wrote(connection, len(rows))
+        return []
+
+    def delete_many(self, keys, version=None):
+        names = [(self.make_and_validate_key(key, version=version),) for key in keys]
+        with self._cursor() as connection:
+            connection.executemany("DELETE FROM cache WHERE key = ?", names)
+
+    def clear(self):
+        with self._cursor() as connection:
+            connection.execute("DELETE FROM cache")
+
+    def close(self, **kwargs):
+        # Bağlantılar istekler arasında havuzda kalır (request_finished her istekte çağırır)
+        pass
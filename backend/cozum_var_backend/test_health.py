@@ -0,0 +1,74 @@
+import time
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from cozum_var_backend import health
+
+
+@pytest.mark.django_db
+class TestHealthChecks:
+    def setup_method(self):
+        self.client = APIClient()
+        cache.clear()
+
+    def test_live_does_no_io(self):
+        with mock.patch.object(health, "check_database") as db, mock.patch.object(
+            health.default_storage, "save"
+        ) as save:
+            res = self.client.get(reverse("health_live"))
+        assert res.status_code == 200
+        assert res.json()["status"] == "alive"
+        db.assert_not_called()
+        save.assert_not_called()
+
+    def test_ready_reports_latency_per_dependency(self):
+        res = self.client.get(reverse("health_ready"))
+        assert res.status_code == 200
+        checks = res.json()["checks"]
+        assert set(checks) == {"database", "cache"}
+        assert all(check["status"] == "ok" and check["latency_ms"] >= 0 for check in checks.values())
+
+    def test_ready_returns_503_when_database_fails(self):
+        with mock.patch.object(health, "check_database", side_effect=RuntimeError("down")):
+            res = self.client.get(reverse("health_ready"))
+        assert res.status_code == 503
+        assert res.json()["checks"]["database"]["error"] == "down"
+
+    def test_deep_check_serves_cached_probe_without_storage_calls(self):
+        health.refresh_storage_probe()
+        with mock.patch.object(health.default_storage, "save") as save:
+            res = self.client.get(reverse("health_check"))
+        assert res.status_code == 200
+        storage = res.json()["checks"]["storage"]
+        assert storage["status"] == "ok" and not storage["stale"]
+        assert set(storage["latency_ms"]) == {"write", "delete"}
+        save.assert_not_called()
+
+    def test_stale_probe_is_refreshed_in_background_once(self, settings):
+        settings.HEALTH_STORAGE_PROBE_TTL = 60
+        old = {"status": "ok", "checked_at": time.time() - 120, "latency_ms": {}}
+        cache.set(health.PROBE_CACHE_KEY, old)
+        with mock.patch.object(health.threading, "Thread") as thread:
+            res = self.client.get(reverse("health_check"))
+            self.client.get(reverse("health_check"))
+        # Eski sonuç hemen döner; ikinci istek kilit nedeniyle yeni yoklama başlatmaz
+        assert res.json()["checks"]["storage"]["stale"] is True
+        thread.assert_called_once()
+        thread.return_value.start.assert_called_once()
+
+        health._refresh_and_unlock()
+        assert cache.get(health.PROBE_CACHE_KEY)["checked_at"] > old["checked_at"]
+        assert cache.get(health.PROBE_LOCK_KEY) is None
+
+    def test_failed_probe_marks_deep_check_unhealthy(self):
+        with mock.patch.object(health.default_storage, "save", side_effect=OSError("denied")):
+            health.refresh_storage_probe()
+        res = self.client.get(reverse("health_check"))
+        assert res.status_code == 503
+        storage = res.json()["checks"]["storage"]
+        assert storage["failed_step"] == "write"
+        assert "denied" in storage["error"]
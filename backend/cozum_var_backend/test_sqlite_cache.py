@@ -0,0 +1,63 @@
+import multiprocessing
+import time
+
+import pytest
+
+from cozum_var_backend.sqlite_cache import SQLiteCache
+
+
+def make_cache(path, **options):
+    return SQLiteCache(str(path), {"TIMEOUT": 300, "OPTIONS": options})
+
+
+def increment_many(path, count):
+    cache = make_cache(path)
+    for _ in range(count):
+        cache.incr("counter")
+
+
+class TestSQLiteCache:
+    def test_round_trips_values(self, tmp_path):
+        cache = make_cache(tmp_path / "cache.sqlite3")
+        cache.set("dict", {"a": [1, 2]})
+        cache.set("int", 7)
+        cache.set("flag", True)
+        assert cache.get("dict") == {"a": [1, 2]}
+        assert cache.get("int") == 7
+        assert cache.get("flag") is True
+        assert cache.get("missing", "default") == "default"
+        assert cache.get_many(["int", "dict", "missing"]) == {"int": 7, "dict": {"a": [1, 2]}}
+        assert cache.delete("int") is True
+        assert cache.has_key("int") is False
+
+    def test_expired_entries_are_invisible_and_replaceable_by_add(self, tmp_path):
+        cache = make_cache(tmp_path / "cache.sqlite3")
+        cache.set("key", "old", timeout=0.05)
+        assert cache.add("key", "new") is False
+        time.sleep(0.1)
+        assert cache.get("key") is None
+        with pytest.raises(ValueError):
+            cache.incr("key")
+        assert cache.add("key", "new") is True
+        assert cache.get("key") == "new"
+
+    def test_incr_is_atomic_across_processes(self, tmp_path):
+        path = tmp_path / "cache.sqlite3"
+        cache = make_cache(path)
+        cache.set("counter", 0)
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=increment_many, args=(path, 200)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=30)
+            assert worker.exitcode == 0
+        assert cache.get("counter") == 800
+
+    def test_culls_to_max_entries(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("cozum_var_backend.sqlite_cache.CULL_EVERY", 10)
+        cache = make_cache(tmp_path / "cache.sqlite3", MAX_ENTRIES=20, CULL_FREQUENCY=2)
+        cache.set_many({f"key-{index}": index for index in range(30)})
+        cache.set("permanent", 1, timeout=None)
+        assert cache.get("permanent") == 1
+        assert len(cache.get_many([f"key-{index}" for index in range(30)])) == 15
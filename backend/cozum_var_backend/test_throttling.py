@@ -0,0 +1,103 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+
+from cozum_var_backend.throttling import ScopedSlidingWindowThrottle, UserSlidingWindowThrottle
+from reports.models import Category, Report
+
+User = get_user_model()
+
+
+class ScopedView:
+    throttle_scope = "login"
+    throttle_methods = ["POST"]
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_throttle(clock, throttle_class=ScopedSlidingWindowThrottle):
+    throttle = throttle_class()
+    throttle.timer = clock
+    return throttle
+
+
+class TestSlidingWindowThrottle:
+    def setup_method(self):
+        self.factory = APIRequestFactory()
+        self.clock = Clock(600.0)  # dakikalık pencerenin başı
+
+    def request(self, method="post"):
+        request = getattr(self.factory, method)("/api/auth/login/", REMOTE_ADDR="10.0.0.1")
+        request.user = None
+        return request
+
+    def allow(self, method="post"):
+        throttle = make_throttle(self.clock)
+        return throttle.allow_request(self.request(method), ScopedView()), throttle
+
+    def test_limits_scope_with_two_integer_counters(self):
+        results = [self.allow()[0] for _ in range(6)]
+        assert results == [True] * 5 + [False]
+        # Anahtar başına zaman damgası listesi değil yalnızca pencere sayacı tutulur
+        assert cache.get("throttle:login:10.0.0.1:10") == 6
+
+    def test_previous_window_is_weighted_by_overlap(self):
+        for _ in range(5):
+            self.allow()
+        # Sonraki pencerenin %40'ı geçti: 5 * 0.6 = 3 önceki istek hâlâ sayılır
+        self.clock.now = 660.0 + 24
+        assert [self.allow()[0] for _ in range(3)] == [True, True, False]
+
+    def test_wait_reports_time_until_next_allowed_request(self):
+        for _ in range(5):
+            self.allow()
+        allowed, throttle = self.allow()
+        assert allowed is False
+        # Sonraki pencerede 6 * (1 - f) + 1 <= 5 için f >= 1/3 gerekir: 60 + 20 saniye
+        assert throttle.wait() == pytest.approx(80.0)
+
+    def test_ignores_methods_outside_throttle_methods(self):
+        assert all(self.allow("get")[0] for _ in range(10))
+        assert cache.get("throttle:login:10.0.0.1:10") is None
+
+    def test_user_throttle_keys_by_user(self):
+        user = User(pk=42)
+        request = self.request()
+        request.user = user
+        throttle = make_throttle(self.clock, UserSlidingWindowThrottle)
+        assert throttle.allow_request(request, ScopedView())
+        assert cache.get(f"throttle:user:42:{int(600 // 3600)}") == 1
+
+
+@pytest.mark.django_db
+class TestScopedThrottlesOnViews:
+    def setup_method(self):
+        self.client = APIClient()
+
+    def test_login_scope_returns_429_with_retry_after(self):
+        data = {"email": "nobody@example.com", "password": "wrong"}
+        statuses = [self.client.post(reverse("auth-login"), data, format="json").status_code for _ in range(6)]
+        assert statuses[:5] == [401] * 5
+        assert statuses[5] == 429
+
+        res = self.client.post(reverse("auth-login"), data, format="json")
+        assert int(res["Retry-After"]) > 0
+
+    def test_comment_limit_counts_only_posts(self):
+        user = User.objects.create_user(email="c@example.com", password="pass", username="c", role="OPERATOR")
+        category = Category.objects.create(name="Genel")
+        report = Report.objects.create(title="Yorum", description="Test", reporter=user, category=category)
+        self.client.force_authenticate(user)
+        url = reverse("report-comments", args=[report.id])
+        assert all(self.client.get(url).status_code != 429 for _ in range(10))
+        statuses = [self.client.post(url, {"content": "x"}, format="json").status_code for _ in range(6)]
+        assert 429 not in statuses[:5]
+        assert statuses[5] == 429
@@ -0,0 +1,108 @@
+"""Sabit bellekli kayan pencere hız sınırlayıcıları (DRF throttle).
+
+DRF'in SimpleRateThrottle'ı anahtar başına bir zaman damgası listesi tutar; her istekte
+liste okunur, kırpılır ve yeniden yazılır (O(n) zaman ve yer). Burada anahtar başına yalnızca
+iki sabit pencere sayacı tutulur ve oran şu tahminle uygulanır:
+
+    önceki pencere * (önceki pencereden hâlâ kayan pencereye düşen oran) + geçerli pencere
+
+İstek başına geçerli sayaç tek bir atomik `incr` ile artırılır (pencerenin ilk isteğinde
+`add`); geçerli sayaç tek başına sınırı aşmıyorsa önceki pencere bir `get` ile okunur.
+Reddedilen istekler de sayılır; sınırı zorlamaya devam eden istemci engelli kalır.
+
+Sayaçlar varsayılan önbellekte tutulur; işçiler arasında paylaşılması için CACHE_BACKEND
+'sqlite' veya 'redis' olmalıdır.
+"""
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    cache_format = "throttle:%(scope)s:%(ident)s"
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, elapsed = divmod(self.now, self.duration)
+        self.fraction = elapsed / self.duration
+        self.previous = 0
+        self.current = self._increment(f"{self.key}:{int(window)}")
+        if self.current > self.num_requests:
+            return self.throttle_failure()
+        self.previous = self.cache.get(f"{self.key}:{int(window) - 1}", 0)
+        if self.previous * (1 - self.fraction) + self.current > self.num_requests:
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def _increment(self, key):
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # Pencerenin ilk isteği; sayaç sonraki pencerede "önceki" olarak okunabilsin
+            if self.cache.add(key, 1, timeout=2 * self.duration):
+                return 1
+            return self.cache.incr(key)
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        """Bir sonraki isteğin kabul edileceği ana kadar kalan süre (saniye)."""
+        available = self.num_requests - self.current - 1
+        if available >= 0 and self.previous:
+            # Geçerli pencere içinde, önceki pencerenin ağırlığı yeterince azalınca
+            return max(0.0, 1 - available / self.previous - self.fraction) * self.duration
+        # Sonraki pencerede geçerli sayaç "önceki" olur
+        needed = max(0.0, 1 - (self.num_requests - 1) / max(self.current, 1))
+        return (1 - self.fraction + needed) * self.duration
+
+
+class AnonSlidingWindowThrottle(SlidingWindowRateThrottle):
+    """Kimliği doğrulanmamış istekler için IP başına `anon` oranı."""
+
+    scope = "anon"
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+class UserSlidingWindowThrottle(SlidingWindowRateThrottle):
+    """Kullanıcı başına (anonimse IP başına) `user` oranı."""
+
+    scope = "user"
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+class ScopedSlidingWindowThrottle(UserSlidingWindowThrottle):
+    """View'daki `throttle_scope` oranı; `throttle_methods` verilmişse yalnızca bu yöntemlerde.
+
+    `throttle_scope` tanımlamayan view'ları etkilemez (ScopedRateThrottle gibi).
+    """
+
+    scope_attr = "throttle_scope"
+
+    def __init__(self):
+        # Oran, view'a göre allow_request içinde belirlenir
+        pass
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        methods = getattr(view, "throttle_methods", None)
+        if not self.scope or (methods and request.method not in methods):
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
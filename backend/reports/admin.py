@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Category, Comment, Media, Report
+from .models import Category, Comment, Media, MediaBlob, Report, ReportDailyStat, ResumableUpload
 
 
 @admin.register(Category)
@@ -19,8 +19,11 @@ class ReportAdmin(admin.ModelAdmin):
         "reporter",
         "category",
         "assigned_team",
+        "media_count",
+        "comment_count",
         "created_at",
     )
+    readonly_fields = ("media_count", "comment_count", "cover_media")
     list_filter = ("status", "priority", "category", "assigned_team", "created_at")
     search_fields = ("title", "description", "location")
     raw_id_fields = ("reporter",)
@@ -28,8 +31,8 @@ class ReportAdmin(admin.ModelAdmin):
 
 @admin.register(Media)
 class MediaAdmin(admin.ModelAdmin):
-    list_display = ("report", "media_type", "file_path", "file_size", "uploaded_at")
-    list_filter = ("media_type", "uploaded_at")
+    list_display = ("report", "media_type", "file_path", "file_size", "processing_state", "uploaded_at")
+    list_filter = ("media_type", "processing_state", "uploaded_at")
     search_fields = ("file_path",)
 
 
@@ -38,3 +41,23 @@ class CommentAdmin(admin.ModelAdmin):
     list_display = ("report", "user", "created_at")
     list_filter = ("created_at",)
     search_fields = ("content",)
+
+
+@admin.register(ReportDailyStat)
+class ReportDailyStatAdmin(admin.ModelAdmin):
+    list_display = ("day", "category", "status", "priority", "assigned_team", "count")
+    list_filter = ("day", "status", "priority", "category")
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    list_display = ("sha256", "file", "file_size", "ref_count", "created_at")
+    search_fields = ("sha256", "file")
+    readonly_fields = ("sha256", "file", "file_size", "variants", "ref_count", "created_at")
+
+
+@admin.register(ResumableUpload)
+class ResumableUploadAdmin(admin.ModelAdmin):
+    list_display = ("id", "user", "filename", "offset", "size", "key", "expires_at")
+    search_fields = ("id", "filename", "key", "user__email")
+    readonly_fields = ("user", "filename", "content_type", "size", "offset", "key", "created_at", "expires_at")
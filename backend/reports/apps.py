@@ -6,6 +6,9 @@ class ReportsConfig(AppConfig):
     name = "reports"
 
     def ready(self):
+        # Denormalize sayaç sinyallerini kaydet
+        from . import signals  # noqa: F401
+
         # HEIC/HEIF desteği: pillow-heif opsiyonel, varsa opener kaydını yap
         try:
             import pillow_heif  # type: ignore
@@ -14,3 +17,9 @@ class ReportsConfig(AppConfig):
         except Exception:
             # Bağımlılık yoksa veya kayıt sırasında hata olursa sessiz geç
             pass
+
+        # AVIF kodlama: Pillow 10 yerleşik desteklemez; pillow-avif-plugin opsiyonel
+        try:
+            import pillow_avif  # type: ignore  # noqa: F401
+        except Exception:
+            pass
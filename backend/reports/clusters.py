@@ -0,0 +1,168 @@
+"""Harita için zoom seviyesine duyarlı sunucu taraflı bildirim kümeleme.
+
+Bildirimler geohash öneklerine göre gruplanır; küme hassasiyeti zoom'dan türetilir ve
+her karo (tile) bir üst seviyedeki geohash hücresidir, yani bir karoda en fazla 32 küme
+bulunur. Önbellekte olmayan karoların tamamı tek bir gruplanmış sorguyla hesaplanır ve
+sonuçlar karo başına önbelleğe yazılır. Bir bildirim kaydedildiğinde/silindiğinde
+geohash'inin tüm öneklerinin sürüm anahtarları artırılır; böylece yalnızca o bildirimi
+içeren karoların önbelleği geçersiz olur.
+
+Sürüm anahtarlarının işçiler arasında paylaşılması gerekir (CACHE_BACKEND 'sqlite' veya
+'redis'). Süreç içi LocMemCache'te bir işçideki geçersiz kılma diğerlerine ulaşmadığından
+karolar ve sürümler `REPORT_MAP_LOCAL_CACHE_TIMEOUT` saniyeden uzun tutulmaz.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models import Avg, Count, FloatField, Q
+from django.db.models.functions import Cast, Substr
+
+from . import geo
+from .models import Report
+
+# Zoom seviyesinin alt sınırı -> küme geohash uzunluğu (~hücre boyutu)
+ZOOM_PRECISIONS = (
+    (0, 1),    # ~5000 km
+    (3, 2),    # ~1250 km
+    (5, 3),    # ~156 km
+    (8, 4),    # ~39 km
+    (10, 5),   # ~4.9 km
+    (13, 6),   # ~1.2 km
+    (15, 7),   # ~153 m
+    (17, 8),   # ~38 m
+)
+MAX_ZOOM = 22
+MAX_TILES = 64
+MAX_TILE_LENGTH = ZOOM_PRECISIONS[-1][1] - 1
+VERSION_KEY = "report-clusters:version:{tile}"
+TILE_KEY = "report-clusters:{precision}:{tile}:{scope}:{version}"
+
+
+def cache_is_shared():
+    """Varsayılan önbellek tüm işçilerce görülüyor mu (LocMemCache süreç içidir)."""
+    return not isinstance(caches["default"], LocMemCache)
+
+
+def local_timeout(timeout):
+    """Paylaşılmayan önbellekte bayat kalma süresini sınırlar."""
+    if cache_is_shared():
+        return timeout
+    limit = getattr(settings, "REPORT_MAP_LOCAL_CACHE_TIMEOUT", 30)
+    return limit if timeout is None else min(timeout, limit)
+
+
+def cache_timeout():
+    return local_timeout(getattr(settings, "REPORT_CLUSTER_CACHE_TIMEOUT", 600))
+
+
+def cluster_precision(zoom):
+    """Zoom seviyesine karşılık gelen küme geohash uzunluğu."""
+    precision = ZOOM_PRECISIONS[0][1]
+    for min_zoom, value in ZOOM_PRECISIONS:
+        if zoom >= min_zoom:
+            precision = value
+    return precision
+
+
+def tiles_for_bbox(min_lat, min_lon, max_lat, max_lon, precision):
+    """Alanı örten karolar ve küme hassasiyeti.
+
+    Karo sayısı MAX_TILES'ı aşarsa (ör. yakın zoom'da çok geniş alan) kümeler kabalaştırılır.
+    """
+    tile_precision = precision - 1
+    while tile_precision > 0 and geo.count_cells(min_lat, min_lon, max_lat, max_lon, tile_precision) > MAX_TILES:
+        tile_precision -= 1
+    return geo.cells_in_bbox(min_lat, min_lon, max_lat, max_lon, tile_precision), tile_precision + 1
+
+
+def tile_versions(tiles):
+    """Karoların önbellek sürümleri; tek get_many ile okunur."""
+    keys = {tile: VERSION_KEY.format(tile=tile) for tile in tiles}
+    versions = cache.get_many(list(keys.values()))
+    result = {}
+    for tile, key in keys.items():
+        if key not in versions:
+            # Sürüm anahtarı düşerse eski karo anahtarlarıyla çakışmaması için zamanla başlat
+            cache.add(key, time.time_ns(), timeout=local_timeout(None))
+            versions[key] = cache.get(key)
+        result[tile] = versions[key]
+    return result
+
+
+def invalidate(*geohashes):
+    """Verilen geohash'leri içeren tüm karoların önbelleğini geçersiz kılar."""
+    tiles = {gh[:length] for gh in geohashes if gh for length in range(MAX_TILE_LENGTH + 1)}
+    for tile in tiles:
+        key = VERSION_KEY.format(tile=tile)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=local_timeout(None))
+
+
+def scope_key(parts):
+    """Kapsam/filtre bileşenlerinden kısa, kararlı bir önbellek anahtarı."""
+    return hashlib.sha1(repr(sorted(parts)).encode("utf-8")).hexdigest()[:16]
+
+
+def cell_aggregates(queryset, precision, statuses=()):
+    """Geohash önekine göre gruplanmış sayı, ağırlık merkezi ve durum sayıları (tek sorgu)."""
+    return (
+        queryset.order_by()
+        .filter(geohash__isnull=False)
+        .annotate(cell=Substr("geohash", 1, precision))
+        .values("cell")
+        .annotate(
+            count=Count("id"),
+            latitude=Avg(Cast("latitude", FloatField())),
+            longitude=Avg(Cast("longitude", FloatField())),
+            **{f"status_{value}": Count("id", filter=Q(status=value)) for value in statuses},
+        )
+    )
+
+
+def compute_clusters(queryset, tiles, precision):
+    """Verilen karolardaki kümeleri tek gruplanmış sorguyla hesaplar: {karo: [küme, ...]}."""
+    statuses = [value for value, _ in Report.STATUS_CHOICES]
+    rows = cell_aggregates(queryset.filter(geo.prefix_q(tiles)), precision, statuses)
+    result = {tile: [] for tile in tiles}
+    tile_length = precision - 1
+    for row in rows:
+        tile = row["cell"][:tile_length]
+        if tile not in result:
+            continue
+        result[tile].append(
+            {
+                "geohash": row["cell"],
+                "count": row["count"],
+                "latitude": round(row["latitude"], 6),
+                "longitude": round(row["longitude"], 6),
+                "status_counts": {value: row[f"status_{value}"] for value in statuses if row[f"status_{value}"]},
+            }
+        )
+    return result
+
+
+def clusters_for_bbox(queryset, bbox, zoom, scope):
+    """Alan ve zoom için kümeleri önbellekten okur, eksik karoları hesaplayıp yazar."""
+    min_lat, min_lon, max_lat, max_lon = bbox
+    tiles, precision = tiles_for_bbox(min_lat, min_lon, max_lat, max_lon, cluster_precision(zoom))
+    versions = tile_versions(tiles)
+    keys = {
+        tile: TILE_KEY.format(precision=precision, tile=tile or "-", scope=scope, version=versions[tile])
+        for tile in tiles
+    }
+    cached = cache.get_many(list(keys.values()))
+    found = {tile: cached[key] for tile, key in keys.items() if key in cached}
+    missing = [tile for tile in tiles if tile not in found]
+    if missing:
+        computed = compute_clusters(queryset, missing, precision)
+        cache.set_many({keys[tile]: clusters for tile, clusters in computed.items()}, cache_timeout())
+        found.update(computed)
+
+    clusters = [cluster for tile in tiles for cluster in found[tile]]
+    return {"zoom": zoom, "precision": precision, "clusters": clusters}
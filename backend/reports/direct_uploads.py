@@ -0,0 +1,215 @@
+"""Bildirim medyalarının uygulama sunucusuna uğramadan depoya yüklenmesi.
+
+İstemci önce `issue_upload` ile her dosya için kısa ömürlü bir PUT adresi alır, baytları
+doğrudan depoya (R2/S3) yükler ve ardından nesne anahtarlarını bildirime bağlatır
+(`verify_uploads` + `attach_uploads`). Bağlanan kayıtlar PENDING olarak oluşturulur;
+piksel bütçesi, optimizasyon, blob tekilleştirme ve dHash mevcut işleme hattında
+(reports.media_processing) yapılır.
+
+Varsayılan depo S3Storage değilse (geliştirme/test) aynı akış, imzalı bir belirteçle
+korunan yerel bir PUT uç noktasıyla (`receive_local_upload`) taklit edilir.
+
+Anahtarlar `reports/uploads/<kullanıcı id>/` altında üretilir; kullanıcı yalnızca kendi
+önekindeki nesneleri bağlayabilir. Bağlanmayan nesneler depo yaşam döngüsü kuralıyla
+temizlenmelidir.
+"""
+
+import logging
+import os
+import tempfile
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.files import File
+from django.db import IntegrityError, transaction
+from django.urls import reverse
+
+from .models import Media
+
+try:
+    from storages.backends.s3 import S3Storage
+except ImportError:  # django-storages/boto3 kurulu değil
+    S3Storage = None
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_PREFIX = "reports/uploads"
+CONTENT_TYPES = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/heic": ".heic",
+    "image/heif": ".heif",
+}
+TOKEN_SALT = "reports.direct_uploads"
+ALREADY_ATTACHED = "Yükleme zaten bir bildirime bağlanmış."
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class UploadError(ValueError):
+    """Yükleme isteği veya bağlanacak nesne geçersiz."""
+
+
+def expires_in():
+    return getattr(settings, "MEDIA_DIRECT_UPLOAD_EXPIRES", 600)
+
+
+def max_upload_bytes():
+    return getattr(settings, "MEDIA_DIRECT_UPLOAD_MAX_BYTES", 20 * 1024 * 1024)
+
+
+def max_files():
+    return getattr(settings, "MEDIA_DIRECT_UPLOAD_MAX_FILES", 10)
+
+
+def media_storage():
+    return Media._meta.get_field("file").storage
+
+
+def presigns_with_s3(storage):
+    return S3Storage is not None and isinstance(storage, S3Storage)
+
+
+def user_prefix(user):
+    return f"{UPLOAD_PREFIX}/{user.pk}/"
+
+
+def upload_key(user, content_type):
+    return f"{user_prefix(user)}{uuid.uuid4().hex}{CONTENT_TYPES[content_type]}"
+
+
+def issue_upload(user, content_type, size, request=None):
+    """Tek dosya için PUT adresi üretir.
+
+    S3Storage'da boto3 ile imzalı adres döner; Content-Type ve Content-Length imzaya
+    dahildir, farklı tür veya boyutta gövde depo tarafından reddedilir.
+    """
+    if content_type not in CONTENT_TYPES:
+        raise UploadError("Desteklenmeyen dosya türü.")
+    if size > max_upload_bytes():
+        raise UploadError(f"Dosya boyutu en fazla {max_upload_bytes()} bayt olabilir.")
+    key = upload_key(user, content_type)
+    storage = media_storage()
+    if presigns_with_s3(storage):
+        url = storage.connection.meta.client.generate_presigned_url(
+            "put_object",
+            Params={
+                "Bucket": storage.bucket_name,
+                "Key": storage._normalize_name(key),
+                "ContentType": content_type,
+                "ContentLength": size,
+            },
+            ExpiresIn=expires_in(),
+            HttpMethod="PUT",
+        )
+    else:
+        token = signing.dumps({"key": key, "content_type": content_type, "size": size}, salt=TOKEN_SALT)
+        url = reverse("report-upload-local", args=[token])
+        if request is not None:
+            url = request.build_absolute_uri(url)
+    return {
+        "key": key,
+        "url": url,
+        "method": "PUT",
+        "headers": {"Content-Type": content_type},
+        "expires_in": expires_in(),
+    }
+
+
+def receive_local_upload(token, stream, content_type, content_length):
+    """Yerel depo için imzalı PUT gövdesini diske akıtır (S3'ün imza kontrollerini taklit eder)."""
+    try:
+        payload = signing.loads(token, salt=TOKEN_SALT, max_age=expires_in())
+    except signing.BadSignature:
+        raise UploadError("Yükleme bağlantısı geçersiz veya süresi dolmuş.")
+    if content_type != payload["content_type"]:
+        raise UploadError("Content-Type imzalı değerle eşleşmiyor.")
+    if content_length != payload["size"]:
+        raise UploadError("Content-Length imzalı değerle eşleşmiyor.")
+
+    storage = media_storage()
+    key = payload["key"]
+    with tempfile.SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE) as buffer:
+        remaining = content_length
+        while remaining > 0:
+            chunk = stream.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            buffer.write(chunk)
+            remaining -= len(chunk)
+        if remaining:
+            raise UploadError("Gövde Content-Length'ten kısa.")
+        buffer.seek(0)
+        # S3 gibi aynı anahtara yazım üzerine yazar
+        if storage.exists(key):
+            storage.delete(key)
+        storage.save(key, File(buffer, name=os.path.basename(key)))
+    return key
+
+
+def _object_size(storage, key):
+    try:
+        return storage.size(key)
+    except Exception:
+        logger.info("Direct upload %s not found in storage", key, exc_info=True)
+        return None
+
+
+def verify_uploads(user, keys):
+    """Bağlanacak anahtarları doğrular; [(anahtar, bayt), ...] döndürür.
+
+    Anahtar kullanıcının önekinde olmalı, izinli bir uzantı taşımalı, daha önce
+    bağlanmamış ve depoda gerçekten bulunmalıdır. Bağlanmamışlık burada yalnızca erken
+    hata için bakılır; eşzamanlı isteklere karşı asıl güvence `attach_uploads`'tadır.
+    """
+    if not keys:
+        raise UploadError("En az bir yükleme anahtarı gereklidir.")
+    if len(keys) > max_files():
+        raise UploadError(f"En fazla {max_files()} dosya bağlanabilir.")
+    if len(set(keys)) != len(keys):
+        raise UploadError("Aynı anahtar birden fazla kez gönderildi.")
+    prefix = user_prefix(user)
+    extensions = set(CONTENT_TYPES.values())
+    for key in keys:
+        name = key[len(prefix):]
+        if not key.startswith(prefix) or not name or "/" in name or os.path.splitext(name)[1] not in extensions:
+            raise UploadError(f"Geçersiz yükleme anahtarı: {key}")
+    if Media.objects.filter(file__in=keys).exists():
+        raise UploadError(ALREADY_ATTACHED)
+
+    storage = media_storage()
+    uploads = []
+    for key in keys:
+        size = _object_size(storage, key)
+        if size is None:
+            raise UploadError(f"Dosya depoya yüklenmemiş: {key}")
+        if size > max_upload_bytes():
+            raise UploadError(f"Dosya boyutu en fazla {max_upload_bytes()} bayt olabilir: {key}")
+        uploads.append((key, size))
+    return uploads
+
+
+def attach_uploads(report, uploads):
+    """Doğrulanmış yüklemeler için PENDING Media kayıtları oluşturur.
+
+    İşleme, post_save sinyaliyle commit sonrasında kuyruğa alınır (reports.signals).
+    Anahtar bu arada başka bir kayda bağlandıysa benzersizlik kısıtı ihlal edilir ve
+    UploadError yükseltilir; çağıranın işlemi geri alınmalıdır.
+    """
+    medias = []
+    for key, size in uploads:
+        media = Media(
+            report=report,
+            file=key,
+            file_size=size,
+            media_type="IMAGE",
+            processing_state=Media.PROCESSING_PENDING,
+        )
+        try:
+            with transaction.atomic():
+                media.save()
+        except IntegrityError:
+            raise UploadError(ALREADY_ATTACHED)
+        medias.append(media)
+    return medias
@@ -0,0 +1,171 @@
+"""Algısal özet (dHash) ve konum yakınlığına göre olası mükerrer bildirimler.
+
+Her görüntü için 64 bitlik dHash hesaplanır ve Media üzerinde dört 16 bitlik parça
+(`dhash_0`..`dhash_3`) olarak indeksli saklanır (çoklu indeks özetleme). Hamming
+mesafesi d olan iki özetin en az bir parçasında güvercin yuvası ilkesiyle en fazla
+d // 4 bit farklıdır; bu yüzden her parça için o yarıçaptaki tüm değerler `IN` ile
+aranır ve adaylar indeks üzerinden bulunur. Kesin mesafe yalnızca bu küçük aday
+kümesinde hesaplanır; milyonlarca görüntüde de sorgu milisaniyeler sürer.
+
+Her iki bildirimde de koordinat varsa adaylar `REPORT_DUPLICATE_RADIUS_M` içinde olmalıdır.
+"""
+
+from itertools import combinations
+
+from django.conf import settings
+from django.db.models import Q
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from . import geo
+from .models import Media, Report
+
+CHUNK_FIELDS = ("dhash_0", "dhash_1", "dhash_2", "dhash_3")
+CHUNK_BITS = 16
+HASH_SIZE = 8
+MAX_RESULTS = 5
+# Kesin mesafe hesabı için veritabanından alınan en fazla aday görüntü; düşük entropili
+# (düz/karanlık) özetler tablonun büyük kısmıyla eşleşebilir
+MAX_CANDIDATES = 500
+
+
+def max_distance():
+    return getattr(settings, "REPORT_DUPLICATE_MAX_DISTANCE", 6)
+
+
+def radius_m():
+    return getattr(settings, "REPORT_DUPLICATE_RADIUS_M", 200)
+
+
+def image_dhash(img):
+    """Açık görüntünün 64 bit dHash'i (yan yana piksellerin parlaklık farkı).
+
+    JPEG'ler draft ile küçük ölçekte çözülür; EXIF yönü uygulanır ki optimize edilmiş
+    (yönü piksellere işlenmiş) kopya ile aynı özet çıksın.
+    """
+    img.draft(None, (HASH_SIZE * 8, HASH_SIZE * 8))
+    img.thumbnail((HASH_SIZE * 8, HASH_SIZE * 8))
+    img = ImageOps.exif_transpose(img)
+    gray = img.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.LANCZOS)
+    pixels = list(gray.getdata())
+    value = 0
+    for row in range(HASH_SIZE):
+        for col in range(HASH_SIZE):
+            left = pixels[row * (HASH_SIZE + 1) + col]
+            right = pixels[row * (HASH_SIZE + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+
+def file_dhash(fileobj, formats=None):
+    """Dosya nesnesinin dHash'i; görüntü değilse None. Okuma konumu korunur.
+
+    `formats` verilirse yalnızca bu formatlar (ör. draft ile ucuz çözülenler) özetlenir,
+    diğerleri için çözmeden None döner.
+    """
+    position = fileobj.tell()
+    try:
+        fileobj.seek(0)
+        with Image.open(fileobj) as img:
+            if formats is not None and img.format not in formats:
+                return None
+            return image_dhash(img)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        return None
+    finally:
+        fileobj.seek(position)
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def chunks(value):
+    return [(value >> shift) & 0xFFFF for shift in (48, 32, 16, 0)]
+
+
+def neighbours(chunk, radius):
+    """16 bitlik parçaya en fazla `radius` bit uzaklıktaki tüm değerler."""
+    values = [chunk]
+    for distance in range(1, radius + 1):
+        for bits in combinations(range(CHUNK_BITS), distance):
+            flipped = chunk
+            for bit in bits:
+                flipped ^= 1 << bit
+            values.append(flipped)
+    return values
+
+
+def candidate_q(value, distance):
+    """Hamming mesafesi `distance` içindeki tüm özetleri kapsayan indeksli koşul."""
+    radius = distance // len(CHUNK_FIELDS)
+    condition = Q()
+    for field, chunk in zip(CHUNK_FIELDS, chunks(value)):
+        condition |= Q(**{f"{field}__in": neighbours(chunk, radius)})
+    return condition
+
+
+def find_similar(hashes, exclude_report_id=None, location=None, distance=None, limit=MAX_RESULTS):
+    """Özetlerden birine benzeyen görüntüsü olan bildirimler.
+
+    [{"id", "title", "status", "distance", "distance_m"}, ...] döndürür; görüntü
+    mesafesine, sonra konum mesafesine göre sıralıdır. `location` (enlem, boylam)
+    verilirse koordinatı olan adaylar sorguda yarıçapı örten alanla, sonra kesin
+    mesafeyle sınırlanır. Aday görüntüler en yeni bildirimlerden başlayarak
+    MAX_CANDIDATES ile sınırlıdır.
+    """
+    hashes = [value for value in hashes if value is not None]
+    if not hashes:
+        return []
+    distance = max_distance() if distance is None else distance
+    condition = Q()
+    for value in hashes:
+        condition |= candidate_q(value, distance)
+    candidates = Media.objects.filter(condition)
+    if exclude_report_id is not None:
+        candidates = candidates.exclude(report_id=exclude_report_id)
+    if location is not None:
+        bbox = geo.bbox_around(location[0], location[1], radius_m())
+        candidates = candidates.filter(
+            geo.bbox_q(*bbox, prefix="report__") | Q(report__geohash__isnull=True)
+        )
+
+    best = {}
+    rows = candidates.order_by("-report_id").values_list("report_id", *CHUNK_FIELDS)
+    for row in rows[:MAX_CANDIDATES]:
+        candidate = (row[1] << 48) | (row[2] << 32) | (row[3] << 16) | row[4]
+        score = min(hamming(value, candidate) for value in hashes)
+        if score <= distance and score < best.get(row[0], distance + 1):
+            best[row[0]] = score
+    if not best:
+        return []
+
+    results = []
+    reports = Report.objects.filter(pk__in=best).values("id", "title", "status", "latitude", "longitude")
+    for report in reports:
+        distance_m = None
+        if location is not None and report["latitude"] is not None and report["longitude"] is not None:
+            distance_m = geo.haversine_m(
+                location[0], location[1], float(report["latitude"]), float(report["longitude"])
+            )
+            if distance_m > radius_m():
+                continue
+        results.append(
+            {
+                "id": report["id"],
+                "title": report["title"],
+                "status": report["status"],
+                "distance": best[report["id"]],
+                "distance_m": round(distance_m) if distance_m is not None else None,
+            }
+        )
+    results.sort(key=lambda item: (item["distance"], item["distance_m"] or 0, item["id"]))
+    return results[:limit]
+
+
+def possible_duplicates(report, limit=MAX_RESULTS):
+    """Bildirimin görüntülerine benzeyen ve yakındaki diğer bildirimler."""
+    hashes = [media.perceptual_hash for media in report.media_files.all()]
+    location = None
+    if report.latitude is not None and report.longitude is not None:
+        location = (float(report.latitude), float(report.longitude))
+    return find_similar(hashes, exclude_report_id=report.pk, location=location, limit=limit)
@@ -0,0 +1,89 @@
+"""Reports app filtre backend'leri"""
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+
+from . import geo, search
+
+
+class ReportSearchFilter(filters.SearchFilter):
+    """PostgreSQL'de tsvector + GIN indeksi ile sıralı tam metin arama.
+
+    Diğer veritabanlarında `search_fields` üzerinden icontains aramasına düşer.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms or not search.is_supported(queryset.db):
+            return super().filter_queryset(request, queryset, view)
+
+        query = SearchQuery(" ".join(terms), search_type="websearch", config=search.search_config())
+        # float8'e çevrilen skor keyset sayfalama imlecinde kayıpsız taşınır
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=Cast(SearchRank(F("search_vector"), query), output_field=FloatField())
+        )
+
+
+class ReportOrderingFilter(filters.OrderingFilter):
+    """Açık sıralama istenmediyse arama sonuçlarını skora göre sıralar."""
+
+    def get_ordering(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param)
+        if not params and "search_rank" in queryset.query.annotations:
+            return ["-search_rank", *(self.get_default_ordering(view) or [])]
+        return super().get_ordering(request, queryset, view)
+
+
+class ReportGeoFilter(filters.BaseFilterBackend):
+    """Harita görünümleri için alan ve yarıçap filtreleri.
+
+    `?bbox=minlon,minlat,maxlon,maxlat` ve `?near=lat,lon&radius_m=` parametreleri, geohash
+    indeksi üzerinde aday hücrelere daraltılır; sonuç enlem/boylam sınırları ve haversine
+    mesafesiyle kesinleştirilir. Yarıçap sorgusunda `distance_m` annotation'ı eklenir.
+    """
+
+    bbox_param = "bbox"
+    near_param = "near"
+    radius_param = "radius_m"
+    max_radius_m = 50_000
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        if params.get(self.bbox_param):
+            min_lon, min_lat, max_lon, max_lat = self.parse_floats(params[self.bbox_param], 4, self.bbox_param)
+            if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lon <= 180 and -180 <= max_lon <= 180):
+                raise ValidationError({self.bbox_param: "Geçersiz sınırlar."})
+            queryset = self.within_bbox(queryset, min_lat, min_lon, max_lat, max_lon)
+
+        if params.get(self.near_param):
+            latitude, longitude = self.parse_floats(params[self.near_param], 2, self.near_param)
+            if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                raise ValidationError({self.near_param: "Geçersiz koordinat."})
+            try:
+                radius = float(params.get(self.radius_param, ""))
+            except ValueError:
+                raise ValidationError({self.radius_param: "Metre cinsinden yarıçap gerekli."})
+            if not 0 < radius <= self.max_radius_m:
+                raise ValidationError({self.radius_param: f"0 ile {self.max_radius_m} arasında olmalı."})
+            queryset = self.within_bbox(queryset, *geo.bbox_around(latitude, longitude, radius))
+            queryset = queryset.annotate(
+                distance_m=geo.haversine_expression(latitude, longitude)
+            ).filter(distance_m__lte=radius)
+        return queryset
+
+    @staticmethod
+    def parse_floats(value, count, param):
+        try:
+            numbers = [float(part) for part in value.split(",")]
+        except ValueError:
+            numbers = []
+        if len(numbers) != count:
+            raise ValidationError({param: f"{count} adet virgülle ayrılmış sayı bekleniyor."})
+        return numbers
+
+    @staticmethod
+    def within_bbox(queryset, min_lat, min_lon, max_lat, max_lon):
+        return geo.filter_bbox(queryset, min_lat, min_lon, max_lat, max_lon)
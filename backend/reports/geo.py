@@ -0,0 +1,227 @@
+"""PostGIS gerektirmeyen geohash tabanlı mekânsal yardımcılar.
+
+Bildirimlerin koordinatları B-tree indeksli bir geohash sütununda saklanır. Bir alan
+sorgusu, alanı örten geohash hücrelerine (önek) çevrilir ve her önek indeks üzerinde
+`geohash >= önek AND geohash < sonraki_önek` aralık taramasına dönüşür. Hücreler alanı
+taştığı için kesin sonuç enlem/boylam karşılaştırması veya haversine ile süzülür.
+"""
+
+import math
+
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cast, Cos, Least, Power, Radians, Sin, Sqrt
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9
+EARTH_RADIUS_M = 6371008.8
+
+
+def encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Koordinatı verilen uzunlukta geohash'e çevirir."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    latitude, longitude = float(latitude), float(longitude)
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        rng, coord = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        if coord >= mid:
+            value = (value << 1) | 1
+            rng[0] = mid
+        else:
+            value <<= 1
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
+def decode_bbox(geohash):
+    """Geohash hücresinin (min_lat, min_lon, max_lat, max_lon) sınırları."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = BASE32.index(char)
+        for shift in range(4, -1, -1):
+            rng = lon_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if (value >> shift) & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+    return lat_range[0], lon_range[0], lat_range[1], lon_range[1]
+
+
+def cell_size(precision):
+    """Verilen uzunluktaki hücrenin (enlem yüksekliği, boylam genişliği) derece cinsinden."""
+    bits = 5 * precision
+    lon_bits = (bits + 1) // 2
+    lat_bits = bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def _cell_ranges(min_lat, min_lon, max_lat, max_lon, precision):
+    height, width = cell_size(precision)
+    rows = range(int((min_lat + 90) // height), int(min((max_lat + 90) // height, 180 / height - 1)) + 1)
+    cols = range(int((min_lon + 180) // width), int(min((max_lon + 180) // width, 360 / width - 1)) + 1)
+    return rows, cols, height, width
+
+
+def cover(min_lat, min_lon, max_lat, max_lon, max_cells=32):
+    """Alanı örten en ince geohash hücrelerini (en fazla `max_cells`) döndürür.
+
+    Boylam aralığı 180. meridyeni geçiyorsa (min_lon > max_lon) iki parçaya ayrılır.
+    Alan tek harfli hücrelerle bile sınırı aşıyorsa boş liste döner (önek filtresi yok).
+    """
+    if min_lon > max_lon:
+        west = cover(min_lat, min_lon, max_lat, 180.0, max_cells // 2)
+        east = cover(min_lat, -180.0, max_lat, max_lon, max_cells // 2)
+        return west + east if west and east else []
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        rows, cols, _, _ = _cell_ranges(min_lat, min_lon, max_lat, max_lon, precision)
+        if len(rows) * len(cols) <= max_cells:
+            return cells_in_bbox(min_lat, min_lon, max_lat, max_lon, precision)
+    return []
+
+
+def count_cells(min_lat, min_lon, max_lat, max_lon, precision):
+    """Alanı verilen uzunlukta örtmek için gereken hücre sayısı."""
+    if min_lon > max_lon:
+        return count_cells(min_lat, min_lon, max_lat, 180.0, precision) + count_cells(
+            min_lat, -180.0, max_lat, max_lon, precision
+        )
+    rows, cols, _, _ = _cell_ranges(min_lat, min_lon, max_lat, max_lon, precision)
+    return len(rows) * len(cols)
+
+
+def cells_in_bbox(min_lat, min_lon, max_lat, max_lon, precision):
+    """Alanla kesişen verilen uzunluktaki tüm geohash hücreleri (sıralı)."""
+    if precision == 0:
+        return [""]
+    if min_lon > max_lon:
+        return sorted(
+            {
+                *cells_in_bbox(min_lat, min_lon, max_lat, 180.0, precision),
+                *cells_in_bbox(min_lat, -180.0, max_lat, max_lon, precision),
+            }
+        )
+    rows, cols, height, width = _cell_ranges(min_lat, min_lon, max_lat, max_lon, precision)
+    cells = {
+        encode(-90 + (row + 0.5) * height, -180 + (col + 0.5) * width, precision)
+        for row in rows
+        for col in cols
+    }
+    return sorted(cells)
+
+
+def next_prefix(prefix):
+    """Sözlük sırasında önekle başlayan tüm değerlerden büyük en küçük geohash; yoksa None."""
+    chars = list(prefix)
+    while chars:
+        index = BASE32.index(chars[-1])
+        if index + 1 < len(BASE32):
+            chars[-1] = BASE32[index + 1]
+            return "".join(chars)
+        chars.pop()
+    return None
+
+
+def prefix_ranges(prefixes):
+    """Önekleri [alt, üst) aralıklarına çevirir; sözlük sırasında bitişik olanları birleştirir."""
+    ranges = []
+    for prefix in sorted(prefixes):
+        upper = next_prefix(prefix)
+        if ranges and ranges[-1][1] is not None and ranges[-1][1] >= prefix:
+            last_lower, last_upper = ranges[-1]
+            if upper is None or upper > last_upper:
+                ranges[-1] = (last_lower, upper)
+            continue
+        ranges.append((prefix, upper))
+    return ranges
+
+
+def prefix_q(prefixes, field="geohash"):
+    """Önek listesini indeks dostu aralık koşullarına çevirir.
+
+    LIKE 'önek%' SQLite'ta ve varsayılan harmanlamalı PostgreSQL'de B-tree kullanamaz;
+    yalnızca geohash alfabesindeki karakterlerle kurulan aralıklar harmanlamadan bağımsızdır.
+    """
+    condition = Q()
+    for lower, upper in prefix_ranges(prefixes):
+        term = Q(**{f"{field}__gte": lower})
+        if upper is not None:
+            term &= Q(**{f"{field}__lt": upper})
+        condition |= term
+    return condition
+
+
+def bbox_q(min_lat, min_lon, max_lat, max_lon, prefix=""):
+    """Alan koşulu: geohash aralıklarıyla adaylar, koordinatlarla kesin sınır.
+
+    `prefix` ilişkili modeldeki alanlar için kullanılır (ör. "report__").
+    """
+    condition = Q(**{f"{prefix}latitude__gte": min_lat, f"{prefix}latitude__lte": max_lat})
+    if min_lon <= max_lon:
+        condition &= Q(**{f"{prefix}longitude__gte": min_lon, f"{prefix}longitude__lte": max_lon})
+    else:
+        # 180. meridyeni geçen alan
+        condition &= Q(**{f"{prefix}longitude__gte": min_lon}) | Q(**{f"{prefix}longitude__lte": max_lon})
+    cells = cover(min_lat, min_lon, max_lat, max_lon)
+    if cells:
+        condition &= prefix_q(cells, field=f"{prefix}geohash")
+    return condition
+
+
+def filter_bbox(queryset, min_lat, min_lon, max_lat, max_lon):
+    """Sorguyu alana daraltır: geohash aralıklarıyla adaylar, koordinatlarla kesin sınır."""
+    return queryset.filter(bbox_q(min_lat, min_lon, max_lat, max_lon))
+
+
+def bbox_around(latitude, longitude, radius_m):
+    """Noktanın çevresindeki yarıçapı içine alan (min_lat, min_lon, max_lat, max_lon)."""
+    delta_lat = math.degrees(radius_m / EARTH_RADIUS_M)
+    min_lat, max_lat = latitude - delta_lat, latitude + delta_lat
+    if min_lat <= -90 or max_lat >= 90:
+        # Kutbu içeren dairede tüm boylamlar aday
+        return max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0
+    delta_lon = math.degrees(radius_m / (EARTH_RADIUS_M * math.cos(math.radians(latitude))))
+    if delta_lon >= 180:
+        return min_lat, -180.0, max_lat, 180.0
+    min_lon, max_lon = longitude - delta_lon, longitude + delta_lon
+    if min_lon < -180:
+        min_lon += 360
+    if max_lon > 180:
+        max_lon -= 360
+    return min_lat, min_lon, max_lat, max_lon
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """İki nokta arasındaki büyük daire mesafesi (metre)."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+def haversine_expression(latitude, longitude, lat_field="latitude", lon_field="longitude"):
+    """`haversine_m` ile aynı formülün ORM ifadesi (SQLite ve PostgreSQL'de çalışır)."""
+    lat = Radians(Cast(F(lat_field), FloatField()))
+    lon = Radians(Cast(F(lon_field), FloatField()))
+    origin_lat = math.radians(latitude)
+    origin_lon = math.radians(longitude)
+    a = Power(Sin((lat - origin_lat) / 2), 2) + math.cos(origin_lat) * Cos(lat) * Power(
+        Sin((lon - origin_lon) / 2), 2
+    )
+    # Yuvarlama hatasıyla 1'i aşan değerler PostgreSQL'de asin hatasına yol açar
+    return 2 * EARTH_RADIUS_M * ASin(Least(Sqrt(a), Value(1.0)))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from reports.models import ResumableUpload
+from reports.resumable import cleanup_expired
+
+
+class Command(BaseCommand):
+    help = 'Süresi dolan parça parça yüklemeleri, geçici dosyalarını ve bildirime bağlanmamış nesnelerini siler'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Tek seferde alınacak kayıt sayısı (varsayılan: 200)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Silmeden süresi dolan yükleme sayısını raporla',
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        if options['dry_run']:
+            expired = ResumableUpload.objects.filter(expires_at__lte=now)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'[dry-run] {expired.count()} süresi dolmuş yükleme '
+                    f'({expired.filter(key="").count()} yarım) silinecek.'
+                )
+            )
+            return
+        removed, failed = cleanup_expired(now=now, batch_size=max(1, options['batch_size']))
+        self.stdout.write(self.style.SUCCESS(f'{removed} süresi dolmuş yükleme silindi, {failed} hata.'))
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from reports.duplicates import CHUNK_FIELDS, chunks, file_dhash
+from reports.models import Media
+
+
+class Command(BaseCommand):
+    help = 'Algısal özeti (dHash) olmayan medya görüntüleri için özet hesaplar (mükerrer bildirim tespiti)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Tek seferde okunacak kayıt sayısı (varsayılan: 500)',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        queryset = Media.objects.filter(media_type='IMAGE', dhash_0__isnull=True).exclude(file='').order_by('pk')
+        hashed = skipped = 0
+        last_pk = 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk).only('pk', 'file')[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            for media in batch:
+                try:
+                    with media.file.open('rb') as fh:
+                        value = file_dhash(fh)
+                except Exception as exc:
+                    self.stderr.write(f'Medya {media.pk} okunamadı: {exc}')
+                    value = None
+                if value is None:
+                    skipped += 1
+                    continue
+                Media.objects.filter(pk=media.pk).update(**dict(zip(CHUNK_FIELDS, chunks(value))))
+                hashed += 1
+            self.stdout.write(f'{hashed} medya özetlendi...')
+
+        self.stdout.write(self.style.SUCCESS(f'{hashed} medya özetlendi, {skipped} atlandı.'))
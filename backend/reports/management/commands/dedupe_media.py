@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+
+from reports.media_processing import dedupe_existing, file_sha256
+from reports.models import Media, MediaBlob
+
+
+class Command(BaseCommand):
+    help = 'İşlenmiş medyaları içerik özetine (SHA-256) göre tekilleştirip MediaBlob kayıtlarına bağlar'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Tek seferde okunacak kayıt sayısı (varsayılan: 200)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Değişiklik yapmadan tekrar eden kayıtları ve kazanılacak alanı raporla',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        dry_run = options['dry_run']
+        queryset = Media.objects.filter(
+            media_type='IMAGE', processing_state=Media.PROCESSING_DONE, content_hash__isnull=True
+        ).exclude(file='').order_by('pk')
+
+        seen = set(MediaBlob.objects.values_list('sha256', flat=True)) if dry_run else set()
+        scanned = duplicates = reclaimed = failed = 0
+        last_pk = 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            for media in batch:
+                scanned += 1
+                try:
+                    if dry_run:
+                        with media.file.open('rb') as fh:
+                            sha256 = file_sha256(fh)
+                        shared = sha256 in seen
+                        seen.add(sha256)
+                    else:
+                        shared = dedupe_existing(media)
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f'Medya {media.pk} okunamadı: {exc}')
+                    continue
+                if shared:
+                    duplicates += 1
+                    reclaimed += media.file_size or 0
+            self.stdout.write(f'{scanned} medya tarandı...')
+
+        prefix = '[dry-run] ' if dry_run else ''
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{prefix}{scanned} medya tarandı, {duplicates} tekrar eden kayıt paylaşılan içeriğe bağlandı '
+                f'(~{reclaimed / 1e6:.1f} MB), {failed} hata.'
+            )
+        )
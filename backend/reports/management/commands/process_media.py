@@ -0,0 +1,63 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from reports.media_processing import process_pending, process_pool, process_pool_size
+
+
+class Command(BaseCommand):
+    help = 'Optimizasyon kuyruğundaki (PENDING) medya görüntülerini işler'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Kuyruğu bir kez boşaltıp çık; varsayılan: sürekli çalış',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Tek seferde alınacak kayıt sayısı (varsayılan: 50)',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=2.0,
+            help='Kuyruk boşken bekleme süresi, saniye (varsayılan: 2)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Çözme/boyutlandırma süreç havuzu boyutu (varsayılan: MEDIA_PROCESSING_WORKERS)',
+        )
+        parser.add_argument(
+            '--stale-after',
+            type=int,
+            default=600,
+            help='Bu kadar saniyedir PROCESSING kalan kayıtları yeniden al (varsayılan: 600)',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        stale_after = timedelta(seconds=options['stale_after'])
+        workers = options['workers'] or process_pool_size()
+        pool = process_pool(workers)
+        total = 0
+        try:
+            while True:
+                processed = process_pending(limit=batch_size, stale_after=stale_after, pool=pool)
+                total += processed
+                if processed:
+                    self.stdout.write(f'{processed} medya işlendi.')
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        self.stdout.write(self.style.SUCCESS(f'Toplam {total} medya işlendi.'))
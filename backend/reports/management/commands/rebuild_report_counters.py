@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from reports.models import Comment, Media, Report
+from reports.signals import first_media_subquery
+
+
+def child_count(model):
+    counts = (
+        model.objects.filter(report=OuterRef("pk"))
+        .order_by()
+        .values("report")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), Value(0))
+
+
+class Command(BaseCommand):
+    help = 'Bildirimlerin medya/yorum sayaçlarını ve kapak medyasını toplu olarak yeniden hesaplar'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Tek UPDATE ile işlenecek bildirim id aralığı (varsayılan: 5000)',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        ids = Report.objects.order_by().values_list('id', flat=True)
+        last_id = ids.order_by('-id').first()
+        if last_id is None:
+            self.stdout.write(self.style.WARNING('Güncellenecek bildirim bulunamadı.'))
+            return
+
+        updated = 0
+        start = 0
+        # id aralıklarıyla ilerleyerek her partiyi tek UPDATE sorgusu ile yeniden hesapla
+        while start <= last_id:
+            end = start + batch_size
+            with transaction.atomic():
+                updated += Report.objects.filter(id__gte=start, id__lt=end).update(
+                    media_count=child_count(Media),
+                    comment_count=child_count(Comment),
+                    cover_media=first_media_subquery(),
+                )
+            start = end
+
+        self.stdout.write(
+            self.style.SUCCESS(f'{updated} bildirimin sayaçları yeniden hesaplandı.')
+        )
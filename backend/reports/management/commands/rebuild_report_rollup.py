@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from reports.stats import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = 'Günlük bildirim istatistik tablosunu bildirimlerden yeniden oluşturur'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since',
+            help='Yalnızca bu tarihten (YYYY-AA-GG) itibaren yeniden hesapla; varsayılan: tümü',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Toplu ekleme boyutu (varsayılan: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = parse_date(options['since'])
+            except ValueError:
+                since = None
+            if since is None:
+                raise CommandError('Geçersiz tarih, YYYY-AA-GG biçiminde olmalı.')
+
+        created = rebuild_daily_stats(since=since, batch_size=max(1, options['batch_size']))
+
+        self.stdout.write(
+            self.style.SUCCESS(f'{created} günlük istatistik satırı oluşturuldu.')
+        )
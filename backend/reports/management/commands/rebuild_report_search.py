@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from reports.search import is_supported, update_search_vectors
+
+
+class Command(BaseCommand):
+    help = 'Bildirimlerin PostgreSQL tam metin arama vektörlerini yeniden hesaplar'
+
+    def handle(self, *args, **options):
+        if not is_supported():
+            self.stdout.write(
+                self.style.WARNING('Tam metin arama yalnızca PostgreSQL ile kullanılabilir, atlandı.')
+            )
+            return
+
+        updated = update_search_vectors()
+
+        self.stdout.write(
+            self.style.SUCCESS(f'{updated} bildirimin arama vektörü güncellendi.')
+        )
@@ -0,0 +1,662 @@
+"""Medya görüntülerinin istek dışında optimize edilmesi.
+
+`Media.save` orijinal dosyayı olduğu gibi kaydeder ve `processing_state` alanını PENDING
+yapar; transaction commit edildikten sonra `enqueue` çağrılır. `MEDIA_PROCESSING_MODE`
+ayarına göre:
+
+- ``sync``: optimizasyon commit sonrasında aynı süreçte yapılır (geliştirme/test).
+- ``queue``: PENDING satırları veritabanı kuyruğu olarak kullanılır ve
+  ``python manage.py process_media`` çalışanı tarafından işlenir. Bildirim oluşturma
+  süresi görüntü boyutu ve sayısından bağımsız olur.
+
+İşleme sırasında görüntü bir kez çözülür ve `VARIANT_SIZES` boyutlarında (1024 px
+`Media.file`, 480 px kart ve 160 px küçük resim `Media.variants`) yeniden kodlanır.
+Çıktı formatı ve kalite/efor ayarları `MEDIA_ENCODING_POLICY` ile seçilir (WebP/AVIF
+seçildiğinde ayrıca JPEG yedeği üretilir); meta veriler her durumda atılır.
+
+Optimize dosyalar içerik adreslidir (`MediaBlob`, reports/blobs/<sha256>): aynı içeriğe
+sahip kayıtlar tek bir blob'u referans sayacıyla paylaşır ve aynı orijinalin tekrar
+yüklenmesi kodlama ile depo yazmasını tamamen atlar.
+
+Kayıtlar koşullu UPDATE ile sahiplenildiği için birden fazla çalışan güvenle çalışabilir.
+Çalışan, bir gruptaki görüntüleri `MEDIA_PROCESSING_WORKERS` boyutlu süreç havuzunda
+paralel çözer/boyutlandırır; depo okuma/yazmaları `MEDIA_UPLOAD_THREADS` iş parçacığıyla
+eşzamanlı yapılır. Orijinaller ve kodlanan çıktılar belleğe alınmaz: orijinal parça parça
+geçici dosyaya indirilir, çıktılar doğrudan geçici dosyalara kodlanır ve depoya akıtılır
+(S3'te çok parçalı yükleme); çalışan belleği görüntü sayısından bağımsız kalır.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import timedelta
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files import File
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .duplicates import CHUNK_FIELDS, chunks, file_dhash
+from .models import Media, MediaBlob
+
+logger = logging.getLogger(__name__)
+
+MAX_DIMENSION = 1024
+FALLBACK_VARIANT = "fallback"
+# Liste/ızgara ekranları için küçük boyutlar; en büyüğü Media.file olarak saklanır
+PRIMARY_VARIANT = "full"
+VARIANT_SIZES = {PRIMARY_VARIANT: MAX_DIMENSION, "card": 480, "thumb": 160}
+VARIANT_LABELS = tuple(sorted(VARIANT_SIZES, key=VARIANT_SIZES.get, reverse=True))
+FORMAT_EXTENSIONS = {
+    "JPEG": (".jpg", ".jpeg"),
+    "PNG": (".png",),
+    "WEBP": (".webp",),
+    "AVIF": (".avif",),
+}
+# DCT ölçeklemeli (draft) çözülebilen formatlar; MPO telefonların çoklu resim JPEG'leridir
+DRAFT_FORMATS = ("JPEG", "MPO")
+BLOB_PREFIX = "reports/blobs"
+HASH_CHUNK_SIZE = 1 << 20
+# MEDIA_ENCODING_POLICY -> hedef format ('original': giriş formatı korunur)
+ENCODING_POLICIES = {"original": None, "webp": "WEBP", "avif": "AVIF"}
+# Biçim başına save() ayarları; MEDIA_ENCODING_OPTIONS ile ezilebilir.
+# WebP `method` 0-6 (yüksek: daha yavaş, daha küçük), AVIF `speed` 0-10 (düşük: daha yavaş)
+ENCODER_OPTIONS = {
+    "JPEG": {"quality": 85, "optimize": True},
+    "PNG": {"optimize": True},
+    "WEBP": {"quality": 80, "method": 6},
+    "AVIF": {"quality": 60, "speed": 6},
+}
+
+
+def processing_mode():
+    return getattr(settings, "MEDIA_PROCESSING_MODE", "sync")
+
+
+class ImageTooLarge(ValueError):
+    """Görüntü piksel bütçesini (MEDIA_MAX_IMAGE_PIXELS) aşıyor."""
+
+
+def max_image_pixels():
+    return getattr(settings, "MEDIA_MAX_IMAGE_PIXELS", 64_000_000)
+
+
+def check_pixel_budget(img):
+    """Yalnızca başlık okunmuşken boyutu bütçeyle karşılaştırır (dekompresyon bombası koruması)."""
+    width, height = img.size
+    budget = max_image_pixels()
+    if width * height > budget:
+        raise ImageTooLarge(
+            f"Görüntü çok büyük ({width}x{height}); en fazla {budget // 1_000_000} megapiksel."
+        )
+
+
+def validate_pixel_budget(fileobj):
+    """Yükleme anında yalnızca başlığı okuyarak piksel bütçesini denetler.
+
+    Görüntü olarak tanınmayan dosyalar burada reddedilmez (uzantı doğrulaması modelde).
+    """
+    position = fileobj.tell()
+    try:
+        with Image.open(fileobj) as img:
+            check_pixel_budget(img)
+    except Image.DecompressionBombError as exc:
+        raise ImageTooLarge(str(exc))
+    except (UnidentifiedImageError, OSError):
+        pass
+    finally:
+        fileobj.seek(position)
+
+
+def avif_supported():
+    """Pillow derlemesi (veya pillow-avif-plugin) AVIF yazabiliyor mu."""
+    Image.init()
+    return "AVIF" in Image.SAVE
+
+
+def encoding_policy():
+    """`MEDIA_ENCODING_POLICY` ayarını kodlayıcı ayarlarına çözer.
+
+    Süreç havuzundaki çalışanlar ayarlara erişmeden kullanabilsin diye sade bir sözlük
+    döndürür: {"format": hedef format veya None (giriş formatı korunur), "options": biçim
+    başına save() ayarları}. AVIF desteklenmiyorsa WebP'ye düşülür.
+    """
+    policy = getattr(settings, "MEDIA_ENCODING_POLICY", "original").lower()
+    if policy == "avif" and not avif_supported():
+        logger.warning("AVIF encoding is not available in this Pillow build; falling back to WebP")
+        policy = "webp"
+    overrides = getattr(settings, "MEDIA_ENCODING_OPTIONS", {})
+    options = {
+        image_format: {**defaults, **overrides.get(image_format, {})}
+        for image_format, defaults in ENCODER_OPTIONS.items()
+    }
+    return {"format": ENCODING_POLICIES.get(policy), "options": options}
+
+
+def _encode(img, image_format, options, icc_profile, open_output=None, label=None):
+    """Görüntüyü kodlar; baytları döndürür.
+
+    `open_output` verilmişse çıktı onun döndürdüğü dosyaya yazılır ve o dosya döner.
+    """
+    if image_format in ("JPEG",) and img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    elif image_format in ("WEBP", "AVIF") and img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB")
+    target = open_output(label) if open_output else BytesIO()
+    save_kwargs = dict(options.get(image_format, {}))
+    if icc_profile:
+        save_kwargs["icc_profile"] = icc_profile
+    img.save(target, format=image_format, **save_kwargs)
+    return target if open_output else target.getvalue()
+
+
+def _content_type(image_format):
+    return "image/jpeg" if image_format == "JPEG" else f"image/{image_format.lower()}"
+
+
+def render_variants(fileobj, name, sizes=None, encoding=None, open_output=None):
+    """Görüntüyü bir kez çözüp her boyut kutusu için yeniden kodlar.
+
+    {etiket: (içerik baytları, dosya adı, içerik türü, (genişlik, yükseklik))} döndürür;
+    `open_output(etiket)` verilirse her çıktı onun döndürdüğü dosyaya kodlanır ve baytlar
+    yerine o dosya nesnesi döner.
+    Piksel bütçesini aşan görüntüler çözülmeden ImageTooLarge ile reddedilir. JPEG ve MPO
+    görüntüler `draft` ile doğrudan en büyük kutunun üzerindeki en yakın 1/2, 1/4 veya 1/8
+    ölçekte çözülür; 48 MP bir fotoğraf tam çözünürlükte (~150 MB RGB) belleğe açılmaz.
+    Küçük boyutlar bir öncekinden sırayla küçültülür; kaynak zaten kutuya sığıyorsa o boyut
+    üretilmez (en büyük boyut her zaman üretilir).
+
+    EXIF yönü piksellere uygulanır ve ICC profili dışındaki tüm meta veriler (EXIF/GPS,
+    XMP, yorumlar) atılır. `encoding` bir hedef format belirtiyorsa (WebP/AVIF) tüm
+    boyutlar o formatta kodlanır ve eski istemciler için en büyük boyutun JPEG kopyası
+    FALLBACK_VARIANT olarak eklenir; aksi halde giriş formatı korunur, desteklenmeyen
+    formatlar JPEG'e çevrilir.
+    """
+    sizes = sizes or VARIANT_SIZES
+    encoding = encoding or {"format": None, "options": ENCODER_OPTIONS}
+    labels = sorted(sizes, key=sizes.get, reverse=True)
+    outputs = {}
+    with Image.open(fileobj) as img:
+        check_pixel_budget(img)
+        img_format = (img.format or "").upper()
+        if img_format in ("JPG",):
+            img_format = "JPEG"
+        # Geçersiz formatlarda JPEG'e düş
+        final_format = encoding["format"] or (img_format if img_format in FORMAT_EXTENSIONS else "JPEG")
+        icc_profile = img.info.get("icc_profile")
+
+        largest = sizes[labels[0]]
+        if img_format in DRAFT_FORMATS and (img.height > largest or img.width > largest):
+            # DCT ölçekleme: çözme sırasında küçült, sonra LANCZOS ile hedef boyuta in
+            img.draft(None, (largest, largest))
+
+        root, ext = os.path.splitext(name)
+        extensions = FORMAT_EXTENSIONS[final_format]
+        extension = ext if ext.lower() in extensions else extensions[0]
+
+        for index, label in enumerate(labels):
+            box = sizes[label]
+            if index and img.width <= box and img.height <= box:
+                continue
+            # Diğer formatlarda thumbnail önce tam sayı katsayılı reduce() uygular
+            img.thumbnail((box, box), Image.Resampling.LANCZOS)
+            if index == 0:
+                # Yön etiketi atılacağı için önce piksellere uygula; ardından meta veriyi temizle
+                img = ImageOps.exif_transpose(img)
+                img.info = {"transparency": img.info["transparency"]} if "transparency" in img.info else {}
+                if encoding["format"]:
+                    outputs[FALLBACK_VARIANT] = (
+                        _encode(img, "JPEG", encoding["options"], icc_profile, open_output, FALLBACK_VARIANT),
+                        f"{root}_{FALLBACK_VARIANT}.jpg",
+                        _content_type("JPEG"),
+                        img.size,
+                    )
+            variant_name = f"{root}{extension}" if index == 0 else f"{root}_{label}{extension}"
+            outputs[label] = (
+                _encode(img, final_format, encoding["options"], icc_profile, open_output, label),
+                variant_name,
+                _content_type(final_format),
+                img.size,
+            )
+    return outputs
+
+
+def optimize_image(fileobj, name):
+    """Görüntüyü 1024x1024 içine sığdırıp yeniden kodlar; (içerik, dosya adı, içerik türü) döndürür."""
+    content, new_name, content_type, _ = render_variants(
+        fileobj, name, {PRIMARY_VARIANT: MAX_DIMENSION}
+    )[PRIMARY_VARIANT]
+    return content, new_name, content_type
+
+
+def temp_dir():
+    """Çalışanın geçici dosya dizini (Django yüklemeleriyle aynı; None: sistem varsayılanı)."""
+    return getattr(settings, "FILE_UPLOAD_TEMP_DIR", None) or None
+
+
+def process_pool_size():
+    return max(1, getattr(settings, "MEDIA_PROCESSING_WORKERS", 1))
+
+
+def upload_thread_count():
+    return max(1, getattr(settings, "MEDIA_UPLOAD_THREADS", 4))
+
+
+def process_pool(workers=None):
+    """Çözme/boyutlandırma için sınırlı süreç havuzu; tek çalışanda None (aynı süreçte)."""
+    workers = workers or process_pool_size()
+    if workers <= 1:
+        return None
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def save_files(storage, items, max_length=None):
+    """[(ad, içerik), ...] dosyalarını iş parçacığı havuzunda eşzamanlı yazar.
+
+    Kaydedilen adları aynı sırayla döndürür. Herhangi biri başarısız olursa o ana kadar
+    yazılmış tüm nesneler silinir ve hata yeniden yükseltilir.
+    """
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=min(upload_thread_count(), len(items))) as executor:
+        futures = [
+            executor.submit(storage.save, name, content, max_length=max_length) for name, content in items
+        ]
+        wait(futures)
+    stored = [future.result() for future in futures if future.exception() is None]
+    if len(stored) != len(futures):
+        delete_files(storage, stored)
+        for future in futures:
+            if future.exception() is not None:
+                raise future.exception()
+    return stored
+
+
+def delete_files(storage, names):
+    """Depodaki nesneleri siler.
+
+    Temizlik hataları asıl hatayı gölgelemesin diye yalnızca loglanır.
+    """
+    for name in names:
+        try:
+            storage.delete(name)
+        except Exception:
+            logger.exception("Could not delete orphaned media object %s", name)
+
+
+def store_uploads(medias):
+    """Henüz kaydedilmemiş Media nesnelerinin dosyalarını depoya eşzamanlı yükler.
+
+    Dosya alanları kaydedilmiş adlara işaretlenir, böylece sonraki `save()` tekrar
+    yüklemez. Aynı orijinal daha önce işlenmişse dosya hiç yüklenmez; kayıt doğrudan
+    mevcut blob'a bağlanır ve DONE olur (blob referansı çağıranın transaction'ındadır).
+    Yalnızca gerçekten yüklenen adlar döner; çağıran, veritabanı hatasında bunları
+    `delete_files` ile silmelidir.
+    """
+    if not medias:
+        return []
+    field = medias[0]._meta.get_field("file")
+    storage = medias[0].file.storage
+    uploads = []
+    for media in medias:
+        if media.media_type == "IMAGE":
+            # Algısal özet yalnızca draft ile küçük ölçekte çözülebilen formatlarda yüklemede
+            # hesaplanır (oluşturma yanıtı olası mükerrerleri içerir); diğerlerini çalışan,
+            # en küçük varyanttan hesaplar
+            media.perceptual_hash = file_dhash(media.file.file, formats=DRAFT_FORMATS)
+            media.source_hash = file_sha256(media.file.file)
+            blob = blob_for_source(media.source_hash)
+            if blob is not None:
+                if media.perceptual_hash is None:
+                    media.perceptual_hash = blob_perceptual_hash(blob)
+                media.file_size = blob.file_size
+                media.file.name = blob.file
+                media.file._committed = True
+                media.variants = blob.variants
+                media.content_hash = blob.sha256
+                media.processing_state = Media.PROCESSING_DONE
+                continue
+        uploads.append(media)
+    items = [(field.generate_filename(media, media.file.name), media.file.file) for media in uploads]
+    stored = save_files(storage, items, max_length=field.max_length)
+    for media, name in zip(uploads, stored):
+        media.file_size = media.file.size
+        media.file.name = name
+        media.file._committed = True
+        if media.media_type == "IMAGE":
+            media.processing_state = Media.PROCESSING_PENDING
+    return stored
+
+
+def file_sha256(fileobj):
+    """Dosya nesnesinin SHA-256 özeti; okuma konumu korunur."""
+    position = fileobj.tell()
+    fileobj.seek(0)
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: fileobj.read(HASH_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    fileobj.seek(position)
+    return digest.hexdigest()
+
+
+def blob_name(sha256, label, extension):
+    """İçerik adresli depo yolu: reports/blobs/ab/cd/<sha256>[_etiket].uzantı"""
+    suffix = "" if label == PRIMARY_VARIANT else f"_{label}"
+    return f"{BLOB_PREFIX}/{sha256[:2]}/{sha256[2:4]}/{sha256}{suffix}{extension}"
+
+
+def acquire_blob(sha256):
+    """Blob varsa referans sayısını artırıp döndürür; yoksa None."""
+    if MediaBlob.objects.filter(sha256=sha256).update(ref_count=F("ref_count") + 1):
+        return MediaBlob.objects.get(sha256=sha256)
+    return None
+
+
+def blob_for_source(source_hash):
+    """Aynı orijinalden daha önce üretilmiş blob'a referans alır; yoksa None."""
+    content_hash = (
+        Media.objects.filter(source_hash=source_hash, content_hash__isnull=False)
+        .values_list("content_hash", flat=True)
+        .first()
+    )
+    return acquire_blob(content_hash) if content_hash else None
+
+
+def create_blob(sha256, outputs, saved, file_size):
+    """Yeni yazılan dosyalardan blob oluşturur (ref_count=1); `file_size` ana dosyanın baytıdır.
+
+    Aynı içerik eşzamanlı başka bir çalışan tarafından kaydedildiyse yazılan dosyalar
+    silinir ve mevcut blob'a referans alınır.
+    """
+    variants = {}
+    for label, name in saved.items():
+        if label != PRIMARY_VARIANT:
+            width, height = outputs[label][3]
+            variants[label] = {"name": name, "width": width, "height": height}
+    try:
+        with transaction.atomic():
+            return MediaBlob.objects.create(
+                sha256=sha256,
+                file=saved[PRIMARY_VARIANT],
+                file_size=file_size,
+                variants=variants,
+                ref_count=1,
+            )
+    except IntegrityError:
+        delete_files(Media._meta.get_field("file").storage, saved.values())
+        return acquire_blob(sha256)
+
+
+def release_blob(sha256):
+    """Referans sayısını düşürür; sıfıra inen blob commit sonrası silinir."""
+    MediaBlob.objects.filter(sha256=sha256, ref_count__gt=0).update(ref_count=F("ref_count") - 1)
+    transaction.on_commit(lambda: collect_blob(sha256))
+
+
+def collect_blob(sha256):
+    """Referansı kalmamış blob'u ve dosyalarını siler; silindiyse True döner."""
+    blob = MediaBlob.objects.filter(sha256=sha256, ref_count=0).first()
+    # Koşullu silme: arada referans alındıysa blob korunur
+    if blob is None or not MediaBlob.objects.filter(pk=blob.pk, ref_count=0).delete()[0]:
+        return False
+    delete_files(Media._meta.get_field("file").storage, blob.storage_names())
+    return True
+
+
+def _render_files(path, name, encoding, directory):
+    """Orijinal dosyadan boyutları `directory` altındaki geçici dosyalara kodlar.
+
+    Süreç havuzunda çalışır: Django/veritabanı erişimi yok, yalnızca Pillow ve yerel
+    dosyalar; süreçler arasında bayt yerine yalnızca yollar taşınır.
+    ({etiket: (yol, dosya adı, içerik türü, (genişlik, yükseklik))}, dHash) döndürür.
+    """
+    targets = {}
+
+    def open_output(label):
+        targets[label] = tempfile.NamedTemporaryFile(dir=directory, suffix=f"_{label}", delete=False)
+        return targets[label]
+
+    try:
+        with open(path, "rb") as fh:
+            outputs = render_variants(fh, name, encoding=encoding, open_output=open_output)
+    finally:
+        for target in targets.values():
+            target.close()
+    outputs = {label: (target.name, *rest) for label, (target, *rest) in outputs.items()}
+    # Algısal özet en küçük çıktıdan hesaplanır (yeniden çözme maliyeti ihmal edilebilir)
+    smallest = min(outputs.values(), key=lambda output: output[3][0] * output[3][1])
+    with open(smallest[0], "rb") as fh:
+        return outputs, file_dhash(fh)
+
+
+def enqueue(media_id):
+    """Commit sonrası çağrılır; kuyruk modunda iş çalışana bırakılır."""
+    if processing_mode() == "sync":
+        process_media(media_id)
+
+
+def claim(media_id, stale_before=None):
+    """Kaydı işlenmek üzere sahiplenir; başka bir çalışan aldıysa False döner."""
+    condition = Q(processing_state=Media.PROCESSING_PENDING)
+    if stale_before is not None:
+        # Çöken çalışanın yarım bıraktığı kayıtları yeniden al
+        condition |= Q(
+            processing_state=Media.PROCESSING_PROCESSING, processing_started_at__lt=stale_before
+        )
+    return bool(
+        Media.objects.filter(condition, pk=media_id).update(
+            processing_state=Media.PROCESSING_PROCESSING, processing_started_at=timezone.now()
+        )
+    )
+
+
+def _download(storage, name, directory):
+    """Orijinali parça parça geçici dosyaya indirir; (yol, SHA-256) döndürür."""
+    digest = hashlib.sha256()
+    with storage.open(name, "rb") as source, tempfile.NamedTemporaryFile(
+        dir=directory, suffix=os.path.splitext(name)[1], delete=False
+    ) as target:
+        for chunk in iter(lambda: source.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            target.write(chunk)
+    return target.name, digest.hexdigest()
+
+
+def _save_path(storage, name, path):
+    # Depo dosyayı parça parça okur; S3Storage `transfer_config` ile çok parçalı yükler
+    with open(path, "rb") as fh:
+        return storage.save(name, File(fh, name=os.path.basename(name)))
+
+
+def _mark_failed(media_id, exc):
+    if isinstance(exc, (UnidentifiedImageError, OSError, ImageTooLarge, Image.DecompressionBombError)):
+        logger.warning("Media %s could not be optimized: %s", media_id, exc)
+    else:
+        logger.error("Unexpected error while optimizing media %s: %r", media_id, exc)
+    Media.objects.filter(pk=media_id).update(processing_state=Media.PROCESSING_FAILED)
+
+
+def process_batch(media_ids, stale_before=None, pool=None):
+    """Bir grup medyayı optimize eder ve işlenen sayısını döndürür.
+
+    Orijinaller ile optimize dosya ve küçük boyut varyantları iş parçacığı havuzunda
+    eşzamanlı, geçici dosyalar üzerinden parça parça okunup yazılır; çözme/boyutlandırma
+    `pool` verilmişse süreç havuzunda paralel yapılır. Orijinalin veya optimize çıktının
+    SHA-256'sı mevcut bir blob ile eşleşirse sırasıyla kodlama ya da depo yazması atlanır
+    ve kayıt o blob'a bağlanır.
+    Hata durumunda orijinal dosya yerinde kalır ve durum FAILED olur.
+    """
+    claimed = [media_id for media_id in media_ids if claim(media_id, stale_before=stale_before)]
+    if not claimed:
+        return 0
+    medias = Media.objects.in_bulk(claimed)
+    claimed = [media_id for media_id in claimed if media_id in medias]
+    if not claimed:
+        return 0
+    storage = medias[claimed[0]].file.storage
+    names = {media_id: medias[media_id].file.name for media_id in claimed}
+    encoding = encoding_policy()
+
+    sources = {}
+    blobs = {}
+    perceptual = {}
+    # Orijinaller ve çıktılar bu dizinde diskte tutulur; iş parçacıkları bitmeden silinmez
+    with tempfile.TemporaryDirectory(dir=temp_dir()) as workdir, ThreadPoolExecutor(
+        max_workers=min(upload_thread_count(), len(claimed))
+    ) as io:
+        downloads = {media_id: io.submit(_download, storage, names[media_id], workdir) for media_id in claimed}
+        jobs = {}
+        for media_id, future in downloads.items():
+            try:
+                path, sources[media_id] = future.result()
+            except Exception as exc:
+                _mark_failed(media_id, exc)
+                continue
+            blob = blob_for_source(sources[media_id])
+            if blob is not None:
+                # Aynı orijinal daha önce işlendi: kodlama ve depo yazması atlanır
+                blobs[media_id] = blob
+                continue
+            executor = io if pool is None else pool
+            jobs[media_id] = executor.submit(_render_files, path, names[media_id], encoding, workdir)
+
+        results = {}
+        uploads = {}
+        for media_id, future in jobs.items():
+            try:
+                outputs, perceptual[media_id] = future.result()
+                with open(outputs[PRIMARY_VARIANT][0], "rb") as fh:
+                    content_hash = file_sha256(fh)
+            except Exception as exc:
+                _mark_failed(media_id, exc)
+                continue
+            blob = acquire_blob(content_hash)
+            if blob is not None:
+                # Farklı orijinal, aynı optimize içerik: depo yazması atlanır
+                blobs[media_id] = blob
+                continue
+            results[media_id] = (content_hash, outputs)
+            uploads[media_id] = {
+                label: io.submit(
+                    _save_path,
+                    storage,
+                    blob_name(content_hash, label, os.path.splitext(variant_name)[1]),
+                    path,
+                )
+                for label, (path, variant_name, _, _) in outputs.items()
+            }
+
+        for media_id, futures in uploads.items():
+            wait(futures.values())
+            saved = {label: future.result() for label, future in futures.items() if future.exception() is None}
+            if len(saved) == len(futures):
+                content_hash, outputs = results[media_id]
+                file_size = os.path.getsize(outputs[PRIMARY_VARIANT][0])
+                blobs[media_id] = create_blob(content_hash, outputs, saved, file_size)
+                continue
+            delete_files(storage, saved.values())
+            _mark_failed(media_id, next(f.exception() for f in futures.values() if f.exception() is not None))
+
+    for media_id, blob in blobs.items():
+        attach_blob(
+            medias[media_id], names[media_id], sources[media_id], blob, storage, perceptual.get(media_id)
+        )
+    return len(claimed)
+
+
+def blob_perceptual_hash(blob):
+    """Aynı blob'u paylaşan bir kaydın algısal özeti; yoksa None."""
+    sibling = Media.objects.filter(content_hash=blob.sha256, dhash_0__isnull=False).first()
+    return sibling.perceptual_hash if sibling else None
+
+
+def attach_blob(media, original_name, source_hash, blob, storage, perceptual_hash=None):
+    """İşlenen kaydı blob'a bağlar; artık kullanılmayan orijinali ve eski referansı bırakır.
+
+    Kaydın algısal özeti yoksa verilen özet, o da yoksa aynı içeriği paylaşan bir kaydınki
+    yazılır.
+    """
+    fields = {}
+    if media.perceptual_hash is None:
+        if perceptual_hash is None:
+            perceptual_hash = blob_perceptual_hash(blob)
+        fields = dict(zip(CHUNK_FIELDS, chunks(perceptual_hash))) if perceptual_hash is not None else {}
+    updated = Media.objects.filter(pk=media.pk, file=original_name).update(
+        file=blob.file,
+        file_path=blob.file,
+        file_size=blob.file_size,
+        variants=blob.variants,
+        content_hash=blob.sha256,
+        source_hash=source_hash,
+        processing_state=Media.PROCESSING_DONE,
+        **fields,
+    )
+    if not updated:
+        # İşlem sırasında kayıt silindi veya dosyası değişti; alınan referansı geri ver
+        release_blob(blob.sha256)
+        return
+    blob_names = set(blob.storage_names())
+    if original_name not in blob_names:
+        delete_files(storage, [original_name])
+    if media.content_hash:
+        if media.content_hash != blob.sha256:
+            release_blob(media.content_hash)
+    else:
+        # Blob öncesi (yeniden işlenen) kayıtların kendi varyant dosyaları
+        obsolete = [variant.get("name") for variant in (media.variants or {}).values()]
+        delete_files(storage, [name for name in obsolete if name and name not in blob_names])
+
+
+def dedupe_existing(media):
+    """İşlenmiş ama blob'a bağlanmamış kaydı içerik özetine göre bir blob'a bağlar.
+
+    Aynı içerikte blob varsa kayıt ona bağlanır ve kendi dosyaları silinir; yoksa kaydın
+    mevcut dosyaları yerinde yeni blob olarak benimsenir. Blob'un paylaşıldığı (dosyaların
+    silindiği) durumda True döner.
+    """
+    storage = media.file.storage
+    original_name = media.file.name
+    with storage.open(original_name, "rb") as fh:
+        sha256 = file_sha256(fh)
+    blob = acquire_blob(sha256)
+    shared = blob is not None
+    if blob is None:
+        try:
+            with transaction.atomic():
+                blob = MediaBlob.objects.create(
+                    sha256=sha256,
+                    file=original_name,
+                    file_size=media.file_size or media.file.size,
+                    variants=media.variants or {},
+                    ref_count=1,
+                )
+        except IntegrityError:
+            blob = acquire_blob(sha256)
+            shared = True
+    attach_blob(media, original_name, media.source_hash, blob, storage)
+    return shared
+
+
+def process_media(media_id, stale_before=None):
+    """Tek bir medyayı optimize eder; işlendiyse True döner."""
+    return bool(process_batch([media_id], stale_before=stale_before))
+
+
+def pending_media_ids(limit=50, stale_before=None):
+    condition = Q(processing_state=Media.PROCESSING_PENDING)
+    if stale_before is not None:
+        condition |= Q(
+            processing_state=Media.PROCESSING_PROCESSING, processing_started_at__lt=stale_before
+        )
+    return list(Media.objects.filter(condition).order_by("pk").values_list("pk", flat=True)[:limit])
+
+
+def process_pending(limit=50, stale_after=timedelta(minutes=10), pool=None):
+    """Kuyruktaki bir grup medyayı işler ve işlenen sayısını döndürür."""
+    stale_before = timezone.now() - stale_after if stale_after else None
+    return process_batch(pending_media_ids(limit, stale_before), stale_before=stale_before, pool=pool)
@@ -0,0 +1,63 @@
+"""Medya URL'lerinin depo çağrısı yapılmadan üretilmesi.
+
+URL tabanı `USE_R2`, `R2_CUSTOM_DOMAIN` ve `MEDIA_URL` ayarlarından süreç başına bir kez
+hesaplanır; her satırda `FieldFile.url` (S3Storage'da nesne başına URL/imza işi) ve ayar
+kontrolleri yerine depo adı tabana eklenir. Yerel depoda taban istek başına bir kez
+mutlak hale getirilir (`base_for`).
+"""
+
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.encoding import filepath_to_uri
+
+URL_SETTINGS = {"USE_R2", "R2_CUSTOM_DOMAIN", "R2_ACCOUNT_ID", "R2_BUCKET_NAME", "MEDIA_URL"}
+
+
+class MediaURLResolver:
+    """Depo adlarını `base_url` ile birleştirir; `absolute` değilse taban istekten tamamlanır."""
+
+    def __init__(self, base_url, absolute):
+        self.base_url = base_url if base_url.endswith("/") else f"{base_url}/"
+        self.absolute = absolute
+
+    @classmethod
+    def from_settings(cls):
+        if getattr(settings, "USE_R2", False):
+            domain = (getattr(settings, "R2_CUSTOM_DOMAIN", "") or "").strip()
+            if domain:
+                return cls(f"https://{domain}/", absolute=True)
+            base = settings.MEDIA_URL
+            if base.startswith("//"):
+                base = f"https:{base}"
+            elif not base.startswith("http"):
+                # Doğrudan R2 uç noktası (sanal barındırma adresi)
+                account_id = getattr(settings, "R2_ACCOUNT_ID", "")
+                bucket_name = getattr(settings, "R2_BUCKET_NAME", "")
+                base = f"https://{bucket_name}.{account_id}.r2.cloudflarestorage.com/"
+            return cls(base, absolute=True)
+        base = settings.MEDIA_URL
+        return cls(base, absolute=base.startswith(("http://", "https://")))
+
+    def base_for(self, request=None):
+        """İstek için URL tabanı; her serileştirme çağrısında bir kez hesaplanmalı."""
+        if self.absolute or request is None:
+            return self.base_url
+        return request.build_absolute_uri(self.base_url)
+
+    def url(self, name, base=None):
+        return f"{base or self.base_url}{filepath_to_uri(name)}"
+
+
+@lru_cache(maxsize=None)
+def get_resolver():
+    return MediaURLResolver.from_settings()
+
+
+@receiver(setting_changed)
+def reset_resolver(*, setting, **kwargs):
+    # Testlerde override_settings ile değişen ayarlar önbelleği geçersiz kılar
+    if setting in URL_SETTINGS:
+        get_resolver.cache_clear()
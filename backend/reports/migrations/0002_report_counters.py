@@ -0,0 +1,67 @@
+# Generated by Django 4.2.23 on 2026-10-18 01:02
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def backfill_counters(apps, schema_editor):
+    Report = apps.get_model("reports", "Report")
+    Media = apps.get_model("reports", "Media")
+    Comment = apps.get_model("reports", "Comment")
+
+    def child_count(model):
+        counts = (
+            model.objects.filter(report=OuterRef("pk"))
+            .order_by()
+            .values("report")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        return Coalesce(Subquery(counts), Value(0))
+
+    Report.objects.update(
+        media_count=child_count(Media),
+        comment_count=child_count(Comment),
+        cover_media=Subquery(
+            Media.objects.filter(report=OuterRef("pk")).order_by("pk").values("pk")[:1]
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="report",
+            name="comment_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Yorum Sayısı"
+            ),
+        ),
+        migrations.AddField(
+            model_name="report",
+            name="cover_media",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="reports.media",
+                verbose_name="Kapak Medyası",
+            ),
+        ),
+        migrations.AddField(
+            model_name="report",
+            name="media_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Medya Sayısı"
+            ),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,113 @@
+# Generated by Django 4.2.23 on 2026-10-18 01:06
+
+from django.db import migrations, models
+from django.db.models import Count, DateField
+from django.db.models.functions import TruncDay
+import django.db.models.deletion
+
+
+def backfill_daily_stats(apps, schema_editor):
+    Report = apps.get_model("reports", "Report")
+    ReportDailyStat = apps.get_model("reports", "ReportDailyStat")
+
+    rows = (
+        Report.objects.order_by()
+        .annotate(day=TruncDay("created_at", output_field=DateField()))
+        .values("day", "category_id", "status", "priority", "assigned_team_id")
+        .annotate(total=Count("id"))
+    )
+    ReportDailyStat.objects.bulk_create(
+        (
+            ReportDailyStat(
+                day=row["day"],
+                category_id=row["category_id"],
+                status=row["status"],
+                priority=row["priority"],
+                assigned_team_id=row["assigned_team_id"],
+                count=row["total"],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0001_initial"),
+        ("reports", "0002_report_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReportDailyStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("day", models.DateField(verbose_name="Gün")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("BEKLEMEDE", "Beklemede"),
+                            ("INCELENIYOR", "İnceleniyor"),
+                            ("COZULDU", "Çözüldü"),
+                            ("REDDEDILDI", "Reddedildi"),
+                        ],
+                        max_length=20,
+                        verbose_name="Durum",
+                    ),
+                ),
+                (
+                    "priority",
+                    models.CharField(
+                        choices=[
+                            ("DUSUK", "Düşük"),
+                            ("ORTA", "Orta"),
+                            ("YUKSEK", "Yüksek"),
+                            ("ACIL", "Acil"),
+                        ],
+                        max_length=20,
+                        verbose_name="Öncelik",
+                    ),
+                ),
+                ("count", models.IntegerField(default=0, verbose_name="Bildirim Sayısı")),
+                (
+                    "assigned_team",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="daily_stats",
+                        to="users.team",
+                        verbose_name="Atanan Takım",
+                    ),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_stats",
+                        to="reports.category",
+                        verbose_name="Kategori",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Günlük Bildirim İstatistiği",
+                "verbose_name_plural": "Günlük Bildirim İstatistikleri",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="reportdailystat",
+            constraint=models.UniqueConstraint(
+                fields=("day", "category", "status", "priority", "assigned_team"),
+                name="unique_report_daily_stat",
+            ),
+        ),
+        migrations.RunPython(backfill_daily_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.23 on 2026-10-18 01:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0003_report_daily_stat"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(fields=["report", "-created_at"], name="comment_report_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="media",
+            index=models.Index(fields=["report", "uploaded_at"], name="media_report_uploaded_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="report",
+            index=models.Index(fields=["-created_at", "-id"], name="report_created_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="report",
+            index=models.Index(
+                fields=["reporter", "-created_at"], name="report_reporter_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="report",
+            index=models.Index(
+                fields=["assigned_team", "status", "-created_at"],
+                name="report_team_status_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="report",
+            index=models.Index(fields=["status", "-created_at"], name="report_status_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="report",
+            index=models.Index(
+                fields=["priority", "-created_at"], name="report_priority_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="report",
+            index=models.Index(fields=["-updated_at"], name="report_updated_idx"),
+        ),
+    ]
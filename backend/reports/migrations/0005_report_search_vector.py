@@ -0,0 +1,57 @@
+# Generated by Django 4.2.23 on 2026-10-18 01:13
+
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+# reports.search.update_search_vectors'ın bu göç anındaki şemaya göre sabitlenmiş hali;
+# canlı modüle bağlı kalırsa sonraki şema değişiklikleri göçün yeniden oynatılmasını bozar
+UPDATE_SEARCH_VECTORS = """
+    UPDATE reports_report AS r SET search_vector =
+        setweight(to_tsvector(%s::regconfig, coalesce(src.title, '')), 'A') ||
+        setweight(to_tsvector(%s::regconfig, coalesce(src.location, '')), 'B') ||
+        setweight(to_tsvector(%s::regconfig, coalesce(c.name, '')), 'B') ||
+        setweight(to_tsvector(%s::regconfig, coalesce(src.description, '')), 'C') ||
+        setweight(to_tsvector(%s::regconfig, coalesce(t.name, '')), 'D') ||
+        setweight(to_tsvector(%s::regconfig, coalesce(u.username, '')), 'D') ||
+        setweight(to_tsvector(%s::regconfig, coalesce(u.email, '')), 'D')
+    FROM reports_report AS src
+        JOIN reports_category AS c ON c.id = src.category_id
+        JOIN users_user AS u ON u.id = src.reporter_id
+        LEFT JOIN users_team AS t ON t.id = src.assigned_team_id
+    WHERE src.id = r.id
+"""
+
+
+def create_search_index(apps, schema_editor):
+    # GIN indeksi ve tsvector yalnızca PostgreSQL'de; SQLite'ta arama icontains ile yapılır
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS report_search_vector_idx "
+        "ON reports_report USING gin (search_vector)"
+    )
+    schema_editor.execute(
+        UPDATE_SEARCH_VECTORS, [getattr(settings, "REPORT_SEARCH_CONFIG", "turkish")] * 7
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS report_search_vector_idx")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0004_report_list_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="report",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
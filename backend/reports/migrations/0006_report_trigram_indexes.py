@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+# reports.suggest.Fold ile aynı ifade olmalı; sorgular indeksi ancak böyle kullanır
+FOLD = "(translate(lower(%s), 'çğıöşüâîûİ', 'cgiosuaiui'))"
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # pg_trgm yalnızca PostgreSQL'de; diğer veritabanlarında öneriler süreç içi indeksten gelir
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for field in ("title", "location"):
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS report_{field}_trgm_idx "
+            f"ON reports_report USING gin ({FOLD % field} gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for field in ("title", "location"):
+        schema_editor.execute(f"DROP INDEX IF EXISTS report_{field}_trgm_idx")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0005_report_search_vector"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
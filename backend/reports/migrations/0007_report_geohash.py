@@ -0,0 +1,45 @@
+# Generated by Django 4.2.23 on 2026-10-18 01:19
+
+from django.db import migrations, models
+
+
+def backfill_geohash(apps, schema_editor):
+    from reports.geo import encode
+
+    Report = apps.get_model("reports", "Report")
+    manager = Report.objects.db_manager(schema_editor.connection.alias)
+    reports = (
+        manager.filter(latitude__isnull=False, longitude__isnull=False)
+        .only("id", "latitude", "longitude")
+    )
+    batch = []
+    for report in reports.iterator(chunk_size=1000):
+        report.geohash = encode(report.latitude, report.longitude)
+        batch.append(report)
+        if len(batch) >= 1000:
+            manager.bulk_update(batch, ["geohash"])
+            batch = []
+    if batch:
+        manager.bulk_update(batch, ["geohash"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0006_report_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="report",
+            name="geohash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                max_length=12,
+                null=True,
+                verbose_name="Geohash",
+            ),
+        ),
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+    ]
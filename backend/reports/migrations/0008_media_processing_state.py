@@ -0,0 +1,36 @@
+# Generated by Django 4.2.23 on 2026-10-18 01:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0007_report_geohash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="media",
+            name="processing_started_at",
+            field=models.DateTimeField(
+                blank=True, editable=False, null=True, verbose_name="İşleme Başlangıcı"
+            ),
+        ),
+        migrations.AddField(
+            model_name="media",
+            name="processing_state",
+            field=models.CharField(
+                choices=[
+                    ("PENDING", "Bekliyor"),
+                    ("PROCESSING", "İşleniyor"),
+                    ("DONE", "Tamamlandı"),
+                    ("FAILED", "Başarısız"),
+                ],
+                db_index=True,
+                default="DONE",
+                editable=False,
+                max_length=12,
+                verbose_name="İşleme Durumu",
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.23 on 2026-10-18 01:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0008_media_processing_state"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="media",
+            name="variants",
+            field=models.JSONField(
+                blank=True, default=dict, editable=False, verbose_name="Boyut Varyantları"
+            ),
+        ),
+    ]
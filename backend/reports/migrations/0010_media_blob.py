@@ -0,0 +1,66 @@
+# Generated by Django 4.2.23 on 2026-10-18 01:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0009_media_variants"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MediaBlob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("sha256", models.CharField(max_length=64, unique=True, verbose_name="SHA-256")),
+                ("file", models.CharField(max_length=500, verbose_name="Dosya")),
+                ("file_size", models.PositiveIntegerField(verbose_name="Dosya Boyutu (bytes)")),
+                (
+                    "variants",
+                    models.JSONField(blank=True, default=dict, verbose_name="Boyut Varyantları"),
+                ),
+                (
+                    "ref_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Referans Sayısı"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Oluşturulma Tarihi"),
+                ),
+            ],
+            options={
+                "verbose_name": "Medya İçeriği",
+                "verbose_name_plural": "Medya İçerikleri",
+            },
+        ),
+        migrations.AddField(
+            model_name="media",
+            name="content_hash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                max_length=64,
+                null=True,
+                verbose_name="İçerik Özeti",
+            ),
+        ),
+        migrations.AddField(
+            model_name="media",
+            name="source_hash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                max_length=64,
+                null=True,
+                verbose_name="Kaynak Özeti",
+            ),
+        ),
+    ]
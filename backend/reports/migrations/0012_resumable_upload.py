@@ -0,0 +1,56 @@
+# Generated by Django 4.2.23 on 2026-10-18 02:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("reports", "0011_media_perceptual_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ResumableUpload",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                (
+                    "filename",
+                    models.CharField(blank=True, max_length=255, verbose_name="Dosya Adı"),
+                ),
+                ("content_type", models.CharField(max_length=50, verbose_name="İçerik Türü")),
+                ("size", models.PositiveBigIntegerField(verbose_name="Toplam Boyut (bytes)")),
+                (
+                    "offset",
+                    models.PositiveBigIntegerField(default=0, verbose_name="Alınan (bytes)"),
+                ),
+                ("key", models.CharField(blank=True, max_length=255, verbose_name="Depo Anahtarı")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Oluşturulma Tarihi"),
+                ),
+                ("expires_at", models.DateTimeField(db_index=True, verbose_name="Son Geçerlilik")),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="resumable_uploads",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Kullanıcı",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Sürdürülebilir Yükleme",
+                "verbose_name_plural": "Sürdürülebilir Yüklemeler",
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.23 on 2026-10-18 02:30
+
+from django.db import migrations
+from django.db.models import F
+
+
+def sync_file_path(apps, schema_editor):
+    # Eski Media.save dosya adını upload_to uygulanmadan file_path'e yazıyordu
+    Media = apps.get_model("reports", "Media")
+    Media.objects.exclude(file_path=F("file")).update(file_path=F("file"))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0012_resumable_upload"),
+    ]
+
+    operations = [
+        migrations.RunPython(sync_file_path, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.23 on 2026-10-18 03:25
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+KEY_FIELDS = ("day", "category", "status", "priority")
+
+
+def merge_unassigned_duplicates(apps, schema_editor):
+    # Eşzamanlı oluşturmalar ve takım silmeleri atanmamış satırlarda kopyalar bırakmış olabilir
+    ReportDailyStat = apps.get_model("reports", "ReportDailyStat")
+    unassigned = ReportDailyStat.objects.filter(assigned_team__isnull=True)
+    groups = (
+        unassigned.values(*KEY_FIELDS)
+        .annotate(rows=Count("id"), total=Sum("count"))
+        .filter(rows__gt=1)
+        .order_by()
+    )
+    for group in groups:
+        rows = unassigned.filter(**{field: group[field] for field in KEY_FIELDS}).order_by("pk")
+        keep = rows.first()
+        rows.exclude(pk=keep.pk).delete()
+        ReportDailyStat.objects.filter(pk=keep.pk).update(count=group["total"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0013_media_file_path_sync"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_unassigned_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="reportdailystat",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("assigned_team__isnull", True)),
+                fields=("day", "category", "status", "priority"),
+                name="unique_report_daily_stat_unassigned",
+            ),
+        ),
+    ]
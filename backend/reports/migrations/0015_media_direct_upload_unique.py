@@ -0,0 +1,20 @@
+# Generated by Django 4.2.23 on 2026-10-18 03:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0014_daily_stat_unassigned_unique"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="media",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("file__startswith", "reports/uploads/")),
+                fields=("file",),
+                name="unique_media_direct_upload",
+            ),
+        ),
+    ]
@@ -1,12 +1,11 @@
-import os
-
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import FileExtensionValidator
-from django.db import models
-from PIL import Image, UnidentifiedImageError
+from django.db import IntegrityError, models
 from datetime import date
-from io import BytesIO
-from django.core.files.uploadedfile import InMemoryUploadedFile
+import uuid
+
+from . import geo
 
 
 class Category(models.Model):
@@ -81,19 +80,67 @@ class Report(models.Model):
     longitude = models.DecimalField(
         max_digits=9, decimal_places=6, null=True, blank=True, verbose_name="Boylam"
     )
+    # Enlem/boylamdan hesaplanan geohash; bbox/yarıçap sorguları için B-tree indeksli (reports.geo)
+    geohash = models.CharField(
+        max_length=12, null=True, blank=True, editable=False, db_index=True, verbose_name="Geohash"
+    )
     created_at = models.DateTimeField(
         auto_now_add=True, verbose_name="Oluşturulma Tarihi"
     )
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Güncellenme Tarihi")
+    # Liste görünümü için denormalize alanlar (reports.signals tarafından güncel tutulur)
+    media_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Medya Sayısı"
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Yorum Sayısı"
+    )
+    cover_media = models.ForeignKey(
+        "Media",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+",
+        verbose_name="Kapak Medyası",
+    )
+    # PostgreSQL tam metin arama vektörü (reports.search tarafından doldurulur, GIN indeksli)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         verbose_name = "Bildirim"
         verbose_name_plural = "Bildirimler"
         ordering = ["-created_at"]
+        # Liste uç noktasının rol bazlı filtre + varsayılan sıralama erişim yolları
+        indexes = [
+            # Operatör: tüm liste ve keyset sayfalama (created_at, id)
+            models.Index(fields=["-created_at", "-id"], name="report_created_id_idx"),
+            # Vatandaş: kendi bildirimleri
+            models.Index(fields=["reporter", "-created_at"], name="report_reporter_created_idx"),
+            # Ekip: takıma atanan bildirimler, durum filtresiyle
+            models.Index(
+                fields=["assigned_team", "status", "-created_at"],
+                name="report_team_status_created_idx",
+            ),
+            # Operatör: durum/öncelik filtreleri
+            models.Index(fields=["status", "-created_at"], name="report_status_created_idx"),
+            models.Index(fields=["priority", "-created_at"], name="report_priority_created_idx"),
+            models.Index(fields=["-updated_at"], name="report_updated_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.get_status_display()}"
 
+    def save(self, *args, **kwargs):
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = geo.encode(self.latitude, self.longitude)
+        else:
+            self.geohash = None
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "geohash"}
+        super().save(*args, **kwargs)
+
 
 def report_media_upload_to(instance, filename):
     """Yükleme yolunu yil/ay/gun ve rapor ID bazlı oluşturur."""
@@ -112,6 +159,17 @@ class Media(models.Model):
         ("VIDEO", "Video"),
     ]
 
+    PROCESSING_PENDING = "PENDING"
+    PROCESSING_PROCESSING = "PROCESSING"
+    PROCESSING_DONE = "DONE"
+    PROCESSING_FAILED = "FAILED"
+    PROCESSING_STATE_CHOICES = [
+        (PROCESSING_PENDING, "Bekliyor"),
+        (PROCESSING_PROCESSING, "İşleniyor"),
+        (PROCESSING_DONE, "Tamamlandı"),
+        (PROCESSING_FAILED, "Başarısız"),
+    ]
+
     report = models.ForeignKey(
         Report,
         on_delete=models.CASCADE,
@@ -136,80 +194,74 @@ class Media(models.Model):
     uploaded_at = models.DateTimeField(
         auto_now_add=True, verbose_name="Yüklenme Tarihi"
     )
+    # Görüntü optimizasyonu durumu; PENDING kayıtlar process_media çalışanının kuyruğudur
+    processing_state = models.CharField(
+        max_length=12,
+        choices=PROCESSING_STATE_CHOICES,
+        default=PROCESSING_DONE,
+        db_index=True,
+        editable=False,
+        verbose_name="İşleme Durumu",
+    )
+    processing_started_at = models.DateTimeField(
+        null=True, blank=True, editable=False, verbose_name="İşleme Başlangıcı"
+    )
+    # İşleme sırasında üretilen küçük boyutlar: {"thumb": {"name", "width", "height"}, ...}
+    variants = models.JSONField(
+        default=dict, blank=True, editable=False, verbose_name="Boyut Varyantları"
+    )
+    # Optimize dosyanın SHA-256'sı (MediaBlob.sha256) ve yüklenen orijinalin SHA-256'sı;
+    # aynı orijinal tekrar yüklendiğinde kodlama ve depo yazması atlanır
+    content_hash = models.CharField(
+        max_length=64, null=True, blank=True, db_index=True, editable=False, verbose_name="İçerik Özeti"
+    )
+    source_hash = models.CharField(
+        max_length=64, null=True, blank=True, db_index=True, editable=False, verbose_name="Kaynak Özeti"
+    )
+    # 64 bit algısal özet (dHash) dört 16 bitlik parça halinde; her parça ayrı indeksli
+    # olduğundan benzer görüntüler Hamming mesafesiyle indeks üzerinden bulunur (reports.duplicates)
+    dhash_0 = models.PositiveIntegerField(null=True, blank=True, db_index=True, editable=False)
+    dhash_1 = models.PositiveIntegerField(null=True, blank=True, db_index=True, editable=False)
+    dhash_2 = models.PositiveIntegerField(null=True, blank=True, db_index=True, editable=False)
+    dhash_3 = models.PositiveIntegerField(null=True, blank=True, db_index=True, editable=False)
 
     class Meta:
         verbose_name = "Medya"
         verbose_name_plural = "Medyalar"
+        indexes = [
+            models.Index(fields=["report", "uploaded_at"], name="media_report_uploaded_idx"),
+        ]
+        constraints = [
+            # Doğrudan yüklenmiş bir nesne (reports.direct_uploads) yalnızca bir kayda bağlanabilir;
+            # eşzamanlı iki bağlama isteğinden biri veritabanında reddedilir
+            models.UniqueConstraint(
+                fields=["file"],
+                condition=models.Q(file__startswith="reports/uploads/"),
+                name="unique_media_direct_upload",
+            ),
+        ]
 
     def save(self, *args, **kwargs):
-        """Dosya bilgilerini otomatik doldur ve R2/S3 gibi uzak depolarla uyumlu şekilde görüntüleri optimize et"""
+        """Dosya bilgilerini doldur; görüntü optimizasyonu commit sonrası arka planda yapılır (reports.media_processing)"""
         if self.file:
-            # Yeni dosya yüklemelerinde (henüz storage'a yazılmamışken) optimize et
+            # Yeni yüklenen görüntüler orijinal haliyle kaydedilir ve işleme kuyruğuna alınır
             if not getattr(self.file, "_committed", False) and self.media_type == "IMAGE":
-                try:
-                    try:
-                        self.file.seek(0)
-                    except Exception:
-                        pass
-
-                    with Image.open(self.file) as img:
-                        img_format = (img.format or "").upper()
-                        if img_format in ("JPG",):
-                            img_format = "JPEG"
-
-                        # Büyük görselleri 1024x1024 içinde tut
-                        if img.height > 1024 or img.width > 1024:
-                            img.thumbnail((1024, 1024), Image.Resampling.LANCZOS)
-
-                        buffer = BytesIO()
-                        save_kwargs = {"optimize": True}
-                        if img_format == "JPEG":
-                            save_kwargs["quality"] = 85
-                        # Geçersiz formatlarda JPEG'e düş
-                        final_format = img_format if img_format in ("JPEG", "PNG", "WEBP") else "JPEG"
-                        img.save(buffer, format=final_format, **save_kwargs)
-                        buffer.seek(0)
-
-                        # İçerik türü belirle
-                        content_type = "image/jpeg" if final_format == "JPEG" else f"image/{final_format.lower()}"
-
-                        # Dosya adını koru, uzantıyı formatla eşleştir
-                        original_name = getattr(self.file, "name", "upload")
-                        root, ext = os.path.splitext(original_name)
-                        if final_format == "JPEG" and ext.lower() not in (".jpg", ".jpeg"):
-                            new_name = f"{root}.jpg"
-                        elif final_format == "PNG" and ext.lower() != ".png":
-                            new_name = f"{root}.png"
-                        elif final_format == "WEBP" and ext.lower() != ".webp":
-                            new_name = f"{root}.webp"
-                        else:
-                            new_name = original_name
-
-                        new_file = InMemoryUploadedFile(
-                            file=buffer,
-                            field_name="file",
-                            name=new_name,
-                            content_type=content_type,
-                            size=buffer.getbuffer().nbytes,
-                            charset=None,
-                        )
-                        self.file = new_file
-                except (UnidentifiedImageError, OSError):
-                    # Geçersiz/bozuk dosya içeriğinde optimizasyonu atla
-                    pass
-                except Exception:
-                    # Beklenmedik durumlarda optimizasyonu atla, yüklemeye engel olma
-                    pass
+                self.processing_state = self.PROCESSING_PENDING
 
-            # Dosya meta bilgileri
+            # Dosya meta bilgileri; önceden yüklenmiş dosyanın boyutu biliniyorsa depoya
+            # (S3/R2'de HEAD isteği) tekrar sorulmaz
             self.file_path = self.file.name
-            try:
-                self.file_size = self.file.size
-            except Exception:
-                self.file_size = None
+            if not getattr(self.file, "_committed", False) or self.file_size is None:
+                try:
+                    self.file_size = self.file.size
+                except Exception:
+                    self.file_size = None
 
         try:
             super().save(*args, **kwargs)
+        except IntegrityError:
+            # Kısıt ihlalleri depo hatası değildir; çağıran ayırt edebilsin
+            raise
         except Exception as e:
             # R2/S3 storage errors often show up here
             from django.core.exceptions import ValidationError
@@ -220,10 +272,96 @@ class Media(models.Model):
             else:
                 raise ValidationError(f"Dosya yükleme hatası: {str(e)}")
 
+        if self.file and self.file_path != self.file.name:
+            # Yeni yüklenen dosyanın depo adı (upload_to) kayıt sırasında belirlenir;
+            # URL'ler file_path'ten üretildiği için ad güncel tutulur
+            self.file_path = self.file.name
+            Media.objects.filter(pk=self.pk).update(file_path=self.file_path)
+
+    @property
+    def perceptual_hash(self):
+        """64 bit dHash; parçalardan birleştirilir (ilk parça en anlamlı 16 bit)"""
+        chunks = (self.dhash_0, self.dhash_1, self.dhash_2, self.dhash_3)
+        if None in chunks:
+            return None
+        value = 0
+        for chunk in chunks:
+            value = (value << 16) | chunk
+        return value
+
+    @perceptual_hash.setter
+    def perceptual_hash(self, value):
+        if value is None:
+            chunks = (None,) * 4
+        else:
+            chunks = tuple((value >> shift) & 0xFFFF for shift in (48, 32, 16, 0))
+        self.dhash_0, self.dhash_1, self.dhash_2, self.dhash_3 = chunks
+
     def __str__(self):
         return f"{self.report.title} - {self.get_media_type_display()}"
 
 
+class MediaBlob(models.Model):
+    """İçerik adresli optimize görüntü (dosya + boyut varyantları)
+
+    Aynı içeriğe sahip Media kayıtları tek bir blob'u paylaşır; `ref_count` blob'a
+    işaret eden Media sayısıdır. Sayaç sıfıra indiğinde blob ve dosyaları silinir
+    (reports.media_processing.release_blob).
+    """
+
+    sha256 = models.CharField(max_length=64, unique=True, verbose_name="SHA-256")
+    file = models.CharField(max_length=500, verbose_name="Dosya")
+    file_size = models.PositiveIntegerField(verbose_name="Dosya Boyutu (bytes)")
+    variants = models.JSONField(default=dict, blank=True, verbose_name="Boyut Varyantları")
+    ref_count = models.PositiveIntegerField(default=0, verbose_name="Referans Sayısı")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Oluşturulma Tarihi")
+
+    class Meta:
+        verbose_name = "Medya İçeriği"
+        verbose_name_plural = "Medya İçerikleri"
+
+    def storage_names(self):
+        return [self.file] + [variant["name"] for variant in (self.variants or {}).values()]
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.ref_count})"
+
+
+class ResumableUpload(models.Model):
+    """Parça parça gönderilen, kesintiden sonra kalınan yerden sürdürülebilen yükleme
+
+    Parçalar geçici bir dosyanın sonuna eklenir (reports.resumable); `offset` o ana
+    kadar alınan bayt sayısıdır. Tamamlanan dosya depoya `key` anahtarıyla yazılır ve
+    doğrudan yüklemeler gibi bildirime bağlanır.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="resumable_uploads",
+        verbose_name="Kullanıcı",
+    )
+    filename = models.CharField(max_length=255, blank=True, verbose_name="Dosya Adı")
+    content_type = models.CharField(max_length=50, verbose_name="İçerik Türü")
+    size = models.PositiveBigIntegerField(verbose_name="Toplam Boyut (bytes)")
+    offset = models.PositiveBigIntegerField(default=0, verbose_name="Alınan (bytes)")
+    key = models.CharField(max_length=255, blank=True, verbose_name="Depo Anahtarı")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Oluşturulma Tarihi")
+    expires_at = models.DateTimeField(db_index=True, verbose_name="Son Geçerlilik")
+
+    class Meta:
+        verbose_name = "Sürdürülebilir Yükleme"
+        verbose_name_plural = "Sürdürülebilir Yüklemeler"
+
+    @property
+    def is_complete(self):
+        return bool(self.key)
+
+    def __str__(self):
+        return f"{self.id} ({self.offset}/{self.size})"
+
+
 class Comment(models.Model):
     """Bildirim yorumları modeli"""
 
@@ -248,6 +386,60 @@ class Comment(models.Model):
         verbose_name = "Yorum"
         verbose_name_plural = "Yorumlar"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["report", "-created_at"], name="comment_report_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.email} - {self.report.title}"
+
+
+class ReportDailyStat(models.Model):
+    """Günlük bildirim sayıları (istatistik uç noktası için ön-toplanmış tablo)
+
+    reports.signals bildirim oluşturma/güncelleme/silme sırasında ilgili satırı artırıp
+    azaltır; takım silinirken satırları atanmamış satırlara katılır. `rebuild_report_rollup`
+    komutu tabloyu bildirimlerden yeniden üretir.
+    """
+
+    day = models.DateField(verbose_name="Gün")
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name="daily_stats",
+        verbose_name="Kategori",
+    )
+    status = models.CharField(
+        max_length=20, choices=Report.STATUS_CHOICES, verbose_name="Durum"
+    )
+    priority = models.CharField(
+        max_length=20, choices=Report.PRIORITY_CHOICES, verbose_name="Öncelik"
+    )
+    assigned_team = models.ForeignKey(
+        "users.Team",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="daily_stats",
+        verbose_name="Atanan Takım",
+    )
+    count = models.IntegerField(default=0, verbose_name="Bildirim Sayısı")
+
+    class Meta:
+        verbose_name = "Günlük Bildirim İstatistiği"
+        verbose_name_plural = "Günlük Bildirim İstatistikleri"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "category", "status", "priority", "assigned_team"],
+                name="unique_report_daily_stat",
+            ),
+            # NULL'lar birbirine eşit sayılmadığından atanmamış satırlar ayrıca korunur
+            models.UniqueConstraint(
+                fields=["day", "category", "status", "priority"],
+                condition=models.Q(assigned_team__isnull=True),
+                name="unique_report_daily_stat_unassigned",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.day} - {self.category_id} - {self.status}: {self.count}"
@@ -0,0 +1,108 @@
+"""Bağımlılıksız Mapbox Vector Tile (v2.1) kodlayıcı.
+
+Yalnızca nokta geometrileri ve string/tam sayı/ondalık öznitelikler desteklenir; ısı
+haritası ve küme katmanları için yeterlidir. Protobuf alan numaraları
+https://github.com/mapbox/vector-tile-spec/blob/master/2.1/vector_tile.proto ile aynıdır.
+"""
+
+import struct
+
+CONTENT_TYPE = "application/vnd.mapbox-vector-tile"
+DEFAULT_EXTENT = 4096
+POINT = 1
+MOVE_TO = 1
+
+
+def _varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _zigzag(value):
+    return (value << 1) ^ (value >> 63)
+
+
+def _key(field, wire_type):
+    return _varint((field << 3) | wire_type)
+
+
+def _varint_field(field, value):
+    return _key(field, 0) + _varint(value)
+
+
+def _bytes_field(field, payload):
+    return _key(field, 2) + _varint(len(payload)) + payload
+
+
+def _packed(field, values):
+    return _bytes_field(field, b"".join(_varint(value) for value in values))
+
+
+def _value(value):
+    if isinstance(value, bool):
+        return _varint_field(7, int(value))
+    if isinstance(value, int):
+        if value >= 0:
+            return _varint_field(5, value)
+        return _varint_field(6, _zigzag(value))
+    if isinstance(value, float):
+        return _key(3, 1) + struct.pack("<d", value)
+    return _bytes_field(1, str(value).encode("utf-8"))
+
+
+class Layer:
+    """Tek katman; anahtar/değer tabloları özellikler eklendikçe tekilleştirilir."""
+
+    def __init__(self, name, extent=DEFAULT_EXTENT):
+        self.name = name
+        self.extent = extent
+        self.keys = {}
+        self.values = {}
+        self.features = []
+
+    def _index(self, table, item):
+        if item not in table:
+            table[item] = len(table)
+        return table[item]
+
+    def add_point(self, x, y, properties=None, feature_id=None):
+        """Karo koordinatlarında (0..extent, tampon için taşabilir) bir nokta ekler."""
+        tags = []
+        for key, value in (properties or {}).items():
+            if value is None:
+                continue
+            tags.append(self._index(self.keys, key))
+            tags.append(self._index(self.values, (type(value), value)))
+
+        feature = b""
+        if feature_id is not None:
+            feature += _varint_field(1, feature_id)
+        if tags:
+            feature += _packed(2, tags)
+        feature += _varint_field(3, POINT)
+        feature += _packed(4, [(MOVE_TO & 0x7) | (1 << 3), _zigzag(int(x)), _zigzag(int(y))])
+        self.features.append(feature)
+
+    def encode(self):
+        payload = _bytes_field(1, self.name.encode("utf-8"))
+        for feature in self.features:
+            payload += _bytes_field(2, feature)
+        for key in self.keys:
+            payload += _bytes_field(3, key.encode("utf-8"))
+        for _, value in self.values:
+            payload += _bytes_field(4, _value(value))
+        payload += _varint_field(5, self.extent)
+        payload += _varint_field(15, 2)
+        return payload
+
+
+def encode_tile(layers):
+    """Boş olmayan katmanlardan karo gövdesi; hiç özellik yoksa boş bayt dizisi (geçerli boş karo)."""
+    return b"".join(_bytes_field(3, layer.encode()) for layer in layers if layer.features)
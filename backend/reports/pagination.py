@@ -0,0 +1,218 @@
+"""Reports app sayfalama sınıfları"""
+
+import base64
+import json
+from datetime import date, datetime
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def approximate_count(queryset):
+    """Sorgunun yaklaşık satır sayısını döndürür.
+
+    PostgreSQL'de COUNT(*) yerine planlayıcının satır tahmini kullanılır (tablo boyutundan
+    bağımsız, sabit maliyet). Diğer veritabanlarında gerçek sayım yapılır.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+
+    sql, params = queryset.order_by().values("pk").query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class KeysetPagination(BasePagination):
+    """Anahtar kümesi (keyset/cursor) sayfalama.
+
+    Sorgu parametrelerinde `cursor` veya `page_size` yoksa sayfalama yapılmaz ve mevcut
+    istemciler için liste yanıtı korunur. Sıralama, filtre backend'lerinin uyguladığı
+    `order_by` (yoksa modelin varsayılan sıralaması) üzerinden okunur ve benzersizlik için
+    sona `id` eklenir; böylece varsayılan `-created_at` sıralamasında anahtar
+    `(created_at, id)` olur ve her sayfa derinlikten bağımsız olarak indeks üzerinden
+    `WHERE (created_at, id) < (...) LIMIT n` maliyetinde okunur.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    total_query_param = "include_total"
+    page_size = 20
+    max_page_size = 100
+    invalid_cursor_message = "Geçersiz imleç."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        self.total = None
+        if params.get(self.total_query_param, "false").lower() == "true":
+            self.total = approximate_count(queryset)
+
+        values, reverse = self.decode_cursor(request, queryset.model)
+        ordering = self.ordering
+        if reverse:
+            ordering = [self._invert(field) for field in ordering]
+
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self._keyset_filter(ordering, values))
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        self.page = results
+        if reverse:
+            self.has_next = values is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = values is not None
+        return results
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        ordering = [
+            field for field in (queryset.query.order_by or queryset.model._meta.ordering)
+            if isinstance(field, str)
+        ]
+        names = {field.lstrip("-") for field in ordering}
+        if not names & {"id", "pk"}:
+            descending = bool(ordering) and ordering[0].startswith("-")
+            ordering.append("-id" if descending else "id")
+        return ordering
+
+    def get_paginated_response(self, data):
+        payload = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+        if self.total is not None:
+            payload["count"] = self.total
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "count": {"type": "integer", "description": "Yaklaşık toplam (include_total=true)"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self._link(self.page[0], reverse=True)
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")).decode("utf-8"))
+            raw_values = payload["v"]
+            reverse = bool(payload.get("r", False))
+            if len(raw_values) != len(self.ordering):
+                raise ValueError("ordering mismatch")
+            values = [
+                self._to_python(model, field.lstrip("-"), value)
+                for field, value in zip(self.ordering, raw_values)
+            ]
+        except (KeyError, TypeError, ValueError, UnicodeDecodeError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def encode_cursor(self, values, reverse):
+        payload = {"v": [self._to_json(value) for value in values]}
+        if reverse:
+            payload["r"] = True
+        return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+    def _link(self, obj, reverse):
+        values = [self._value_of(obj, field.lstrip("-")) for field in self.ordering]
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.encode_cursor(values, reverse)
+        )
+
+    @staticmethod
+    def _invert(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def _keyset_filter(ordering, values):
+        """(a, b, c) > (x, y, z) karşılaştırmasını sıralama yönlerine göre Q ifadesine açar."""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, values):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    @staticmethod
+    def _value_of(obj, name):
+        if name == "pk":
+            return obj.pk
+        value = obj
+        for part in name.split("__"):
+            value = getattr(value, part, None)
+            if value is None:
+                return None
+            if hasattr(value, "_meta"):
+                value = value.pk
+        return value
+
+    @staticmethod
+    def _to_json(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return value
+
+    @staticmethod
+    def _to_python(model, name, value):
+        if name == "pk":
+            name = model._meta.pk.name
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Sıralamada kullanılan annotation'lar (ör. arama skoru) JSON tipinde taşınır
+            return value
+        return field.to_python(value)
@@ -0,0 +1,192 @@
+"""Zayıf bağlantılar için kesintiye dayanıklı, parça parça (tus benzeri) medya yükleme.
+
+Akış:
+
+- ``POST``: yükleme oluşturulur (tür ve toplam boyut), boş bir geçici dosya açılır.
+- ``PATCH``: ``Upload-Offset`` başlığındaki konumdan gelen gövde geçici dosyanın sonuna
+  akıtılır. Bağlantı yarıda koparsa o ana kadar alınan baytlar korunur; istemci ``HEAD``
+  ile sunucudaki konumu öğrenip kalan kısımdan devam eder.
+- Son parça geldiğinde dosya depoya `reports/uploads/<kullanıcı id>/` altında yazılır
+  ve dönen anahtar presigned yüklemeler gibi bildirime bağlanır (reports.direct_uploads);
+  optimizasyon mevcut Media hattında yapılır.
+
+Aynı yüklemeye eşzamanlı PATCH'ler geçici dosya üzerindeki `flock` ile engellenir. Her
+parça son geçerlilik süresini uzatır; süresi dolan yüklemeler istek anında veya
+``python manage.py cleanup_uploads`` ile silinir. Geçici dizin
+(`MEDIA_RESUMABLE_UPLOAD_DIR`) aynı yüklemeyi alabilecek tüm süreçlerce paylaşılmalıdır.
+"""
+
+import fcntl
+import logging
+import os
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+
+from . import direct_uploads
+from .media_processing import ImageTooLarge, validate_pixel_budget
+from .models import Media, ResumableUpload
+
+logger = logging.getLogger(__name__)
+
+
+class UploadExpired(direct_uploads.UploadError):
+    """Yüklemenin süresi dolmuş veya geçici dosyası kaybolmuş."""
+
+
+class UploadBusy(direct_uploads.UploadError):
+    """Aynı yüklemeye başka bir parça şu anda yazılıyor."""
+
+
+class OffsetMismatch(direct_uploads.UploadError):
+    """İstemcinin bildirdiği konum sunucudakiyle eşleşmiyor."""
+
+    def __init__(self, offset):
+        super().__init__(f"Upload-Offset sunucudaki konumla eşleşmiyor ({offset}).")
+        self.offset = offset
+
+
+def upload_dir():
+    return getattr(settings, "MEDIA_RESUMABLE_UPLOAD_DIR", None) or os.path.join(
+        tempfile.gettempdir(), "cozum-resumable"
+    )
+
+
+def expiry():
+    return timedelta(seconds=getattr(settings, "MEDIA_RESUMABLE_UPLOAD_EXPIRES", 24 * 60 * 60))
+
+
+def temp_path(upload):
+    return os.path.join(upload_dir(), f"{upload.id.hex}.part")
+
+
+def create_upload(user, content_type, size, filename=""):
+    if content_type not in direct_uploads.CONTENT_TYPES:
+        raise direct_uploads.UploadError("Desteklenmeyen dosya türü.")
+    if size > direct_uploads.max_upload_bytes():
+        raise direct_uploads.UploadError(
+            f"Dosya boyutu en fazla {direct_uploads.max_upload_bytes()} bayt olabilir."
+        )
+    upload = ResumableUpload(
+        user=user,
+        filename=filename[:255],
+        content_type=content_type,
+        size=size,
+        expires_at=timezone.now() + expiry(),
+    )
+    os.makedirs(upload_dir(), exist_ok=True)
+    open(temp_path(upload), "xb").close()
+    upload.save()
+    return upload
+
+
+def is_expired(upload, now=None):
+    return upload.expires_at <= (now or timezone.now())
+
+
+def append_chunk(upload, stream, offset, content_length):
+    """Gövdeyi `offset` konumuna yazar ve güncel yüklemeyi döndürür.
+
+    Akış yarıda kesilse de alınan baytlar kaydedilir. Son parçada dosya depoya yazılır;
+    depo hatasında istemci aynı konumdan boş bir PATCH ile tamamlamayı yeniden dener.
+    """
+    if is_expired(upload):
+        discard(upload)
+        raise UploadExpired("Yüklemenin süresi dolmuş.")
+    if upload.is_complete:
+        if offset == upload.size and content_length == 0:
+            return upload
+        raise OffsetMismatch(upload.offset)
+    if content_length > upload.size - offset:
+        raise direct_uploads.UploadError("Parça bildirilen toplam boyutu aşıyor.")
+
+    try:
+        fh = open(temp_path(upload), "r+b")
+    except FileNotFoundError:
+        discard(upload)
+        raise UploadExpired("Yükleme bulunamadı; baştan başlatın.")
+    with fh:
+        try:
+            fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise UploadBusy("Bu yüklemeye başka bir parça yazılıyor.")
+        # Kilit alındıktan sonra konum yeniden okunur; bekleyen yazma artık bitmiştir
+        upload.refresh_from_db(fields=["offset", "key", "expires_at"])
+        if offset != upload.offset:
+            raise OffsetMismatch(upload.offset)
+
+        fh.seek(offset)
+        fh.truncate()
+        received = 0
+        try:
+            while received < content_length:
+                chunk = stream.read(min(direct_uploads.STREAM_CHUNK_SIZE, content_length - received))
+                if not chunk:
+                    break
+                fh.write(chunk)
+                received += len(chunk)
+        finally:
+            fh.flush()
+            os.fsync(fh.fileno())
+            upload.offset = offset + received
+            upload.expires_at = timezone.now() + expiry()
+            ResumableUpload.objects.filter(pk=upload.pk).update(
+                offset=upload.offset, expires_at=upload.expires_at
+            )
+        if upload.offset == upload.size:
+            _complete(upload, fh)
+    return upload
+
+
+def _complete(upload, fh):
+    """Birleştirilmiş dosyayı depoya yazar ve geçici dosyayı siler (kilit altında çağrılır)."""
+    fh.seek(0)
+    try:
+        validate_pixel_budget(fh)
+    except ImageTooLarge as exc:
+        discard(upload)
+        raise direct_uploads.UploadError(str(exc))
+    storage = direct_uploads.media_storage()
+    key = direct_uploads.upload_key(upload.user, upload.content_type)
+    upload.key = storage.save(key, File(fh, name=os.path.basename(key)))
+    ResumableUpload.objects.filter(pk=upload.pk).update(key=upload.key)
+    os.remove(temp_path(upload))
+
+
+def discard(upload):
+    """Yüklemeyi siler; bildirime bağlanmamış depo nesnesi de silinir.
+
+    Geçici dosya post_delete sinyaliyle kaldırılır (reports.signals).
+    """
+    if upload.key and not Media.objects.filter(file=upload.key).exists():
+        direct_uploads.media_storage().delete(upload.key)
+    upload.delete()
+
+
+def cleanup_expired(now=None, batch_size=200):
+    """Süresi dolan yüklemeleri siler; (silinen, hatalı) sayılarını döndürür.
+
+    Silinemeyen (ör. depo hatası) kayıtlar yerinde bırakılır ve sonraki çalıştırmada denenir.
+    """
+    now = now or timezone.now()
+    removed = 0
+    failed = set()
+    while True:
+        batch = list(
+            ResumableUpload.objects.filter(expires_at__lte=now)
+            .exclude(pk__in=failed)
+            .order_by("expires_at")[:batch_size]
+        )
+        if not batch:
+            return removed, len(failed)
+        for upload in batch:
+            try:
+                discard(upload)
+            except Exception:
+                logger.exception("Could not discard resumable upload %s", upload.pk)
+                failed.add(upload.pk)
+                continue
+            removed += 1
@@ -0,0 +1,61 @@
+"""PostgreSQL tam metin arama desteği.
+
+`Report.search_vector` alanı başlık, konum, açıklama ve ilişkili kategori/takım/bildiren
+bilgilerinden ağırlıklı bir tsvector olarak tutulur ve GIN indeksi ile aranır. İlişkili
+tablolardaki metinler de vektöre dahil edildiği için güncelleme tek bir
+`UPDATE ... FROM` sorgusuyla veritabanında yapılır. SQLite gibi diğer veritabanlarında
+alan boş kalır ve arama `SearchFilter`'ın icontains davranışına düşer.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+
+from .models import Category, Report
+
+
+def search_config():
+    return getattr(settings, "REPORT_SEARCH_CONFIG", "turkish")
+
+
+def is_supported(using="default"):
+    return connections[using].vendor == "postgresql"
+
+
+def update_search_vectors(using="default", **lookups):
+    """Verilen alan eşleşmelerine uyan bildirimlerin arama vektörünü yeniden hesaplar.
+
+    Örn. `update_search_vectors(id=5)`, `update_search_vectors(category_id=3)`; lookup
+    verilmezse tüm tablo güncellenir. PostgreSQL dışındaki veritabanlarında hiçbir şey yapmaz.
+    """
+    if not is_supported(using):
+        return 0
+
+    from users.models import Team
+
+    User = get_user_model()
+    conditions = []
+    params = [search_config()] * 7
+    for column, value in lookups.items():
+        conditions.append(f"src.{Report._meta.get_field(column).column} = %s")
+        params.append(value)
+    where = " AND ".join(["src.id = r.id", *conditions])
+
+    sql = f"""
+        UPDATE {Report._meta.db_table} AS r SET search_vector =
+            setweight(to_tsvector(%s::regconfig, coalesce(src.title, '')), 'A') ||
+            setweight(to_tsvector(%s::regconfig, coalesce(src.location, '')), 'B') ||
+            setweight(to_tsvector(%s::regconfig, coalesce(c.name, '')), 'B') ||
+            setweight(to_tsvector(%s::regconfig, coalesce(src.description, '')), 'C') ||
+            setweight(to_tsvector(%s::regconfig, coalesce(t.name, '')), 'D') ||
+            setweight(to_tsvector(%s::regconfig, coalesce(u.username, '')), 'D') ||
+            setweight(to_tsvector(%s::regconfig, coalesce(u.email, '')), 'D')
+        FROM {Report._meta.db_table} AS src
+            JOIN {Category._meta.db_table} AS c ON c.id = src.category_id
+            JOIN {User._meta.db_table} AS u ON u.id = src.reporter_id
+            LEFT JOIN {Team._meta.db_table} AS t ON t.id = src.assigned_team_id
+        WHERE {where}
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
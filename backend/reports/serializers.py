@@ -3,11 +3,55 @@
 from rest_framework import serializers  # pyright: ignore[reportMissingImports]
 from django.db import transaction, IntegrityError  # pyright: ignore[reportMissingImports]
 from django.core.exceptions import ValidationError as DjangoValidationError  # pyright: ignore[reportMissingImports]
-from django.conf import settings  # pyright: ignore[reportMissingImports]
 
 from users.serializers import TeamSerializer, UserDetailSerializer
 
-from .models import Category, Comment, Media, Report
+from . import direct_uploads, duplicates, media_urls
+from .media_processing import (
+    FALLBACK_VARIANT,
+    PRIMARY_VARIANT,
+    VARIANT_LABELS,
+    ImageTooLarge,
+    delete_files,
+    store_uploads,
+    validate_pixel_budget,
+)
+from .models import Category, Comment, Media, Report, ResumableUpload
+
+
+def media_url_base(context):
+    """İstek başına bir kez hesaplanan medya URL tabanı; serileştirici bağlamında saklanır"""
+    base = context.get("media_url_base")
+    if base is None:
+        base = context["media_url_base"] = media_urls.get_resolver().base_for(context.get("request"))
+    return base
+
+
+def media_file_url(media, base):
+    """Media.file_path'ten URL; depoya (FieldFile.url) gidilmez"""
+    name = media.file_path or getattr(media.file, "name", None)
+    if not name:
+        return None
+    return media_urls.get_resolver().url(name, base)
+
+
+def media_variant_urls(media, base):
+    """Her boyut etiketi için URL; üretilmemiş boyut bir büyüğüne (en son dosyanın kendisine) düşer"""
+    url = media_file_url(media, base)
+    if url is None:
+        return {}
+    resolver = media_urls.get_resolver()
+    variants = media.variants or {}
+    urls = {}
+    for label in VARIANT_LABELS + (FALLBACK_VARIANT,):
+        if label == FALLBACK_VARIANT:
+            # WebP/AVIF desteklemeyen istemciler için JPEG kopya; yoksa dosyanın kendisi
+            url = urls[PRIMARY_VARIANT]
+        name = (variants.get(label) or {}).get("name")
+        if name:
+            url = resolver.url(name, base)
+        urls[label] = url
+    return urls
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -23,6 +67,8 @@ class MediaSerializer(serializers.ModelSerializer):
 
     # 'file' alanını absolute URL olarak döndür
     file = serializers.SerializerMethodField()
+    # {"full", "card", "thumb", "fallback"} URL'leri
+    variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Media
@@ -33,42 +79,16 @@ class MediaSerializer(serializers.ModelSerializer):
             "file_size",
             "media_type",
             "uploaded_at",
+            "processing_state",
+            "variants",
         ]
-        read_only_fields = ["file_path", "file_size", "uploaded_at"]
+        read_only_fields = ["file_path", "file_size", "uploaded_at", "processing_state"]
 
     def get_file(self, obj):
-        file_field = getattr(obj, "file", None)
-        if not file_field:
-            return None
-        try:
-            url = file_field.url
-            # If using R2 storage, ensure URL has proper HTTPS protocol
-            if getattr(settings, 'USE_R2', False):
-                # For R2 storage, ensure URL starts with https://
-                if not url.startswith('https://'):
-                    if url.startswith('//'):
-                        url = 'https:' + url
-                    elif url.startswith('/'):
-                        # Build URL with either custom domain or direct endpoint
-                        domain = getattr(settings, 'R2_CUSTOM_DOMAIN', '')
-                        if domain and domain.strip():
-                            url = f'https://{domain}{url}'
-                        else:
-                            # Use direct R2 endpoint
-                            account_id = getattr(settings, 'R2_ACCOUNT_ID', '')
-                            bucket_name = getattr(settings, 'R2_BUCKET_NAME', '')
-                            url = f'https://{bucket_name}.{account_id}.r2.cloudflarestorage.com{url}'
-                    elif not url.startswith('http'):
-                        url = f'https://{url}'
-                return url
-            else:
-                # For local storage, build absolute URI
-                request = self.context.get("request") if hasattr(self, "context") else None
-                if request is not None:
-                    return request.build_absolute_uri(url)
-                return url
-        except Exception:
-            return None
+        return media_file_url(obj, media_url_base(self.context))
+
+    def get_variants(self, obj):
+        return media_variant_urls(obj, media_url_base(self.context))
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -88,9 +108,10 @@ class ReportListSerializer(serializers.ModelSerializer):
     reporter = UserDetailSerializer(read_only=True)
     category = CategorySerializer(read_only=True)
     assigned_team = TeamSerializer(read_only=True)
-    media_count = serializers.SerializerMethodField()
-    comment_count = serializers.SerializerMethodField()
     first_media_url = serializers.SerializerMethodField()
+    # Liste ızgaraları 1024 px dosya yerine küçük boyutları kullanır
+    first_media_card_url = serializers.SerializerMethodField()
+    first_media_thumb_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Report
@@ -108,47 +129,25 @@ class ReportListSerializer(serializers.ModelSerializer):
             "media_count",
             "comment_count",
             "first_media_url",
+            "first_media_card_url",
+            "first_media_thumb_url",
         ]
 
-    def get_media_count(self, obj):
-        return obj.media_files.count()
+    def get_first_media_url(self, obj):
+        # Kapak medyası Report üzerinde tutulur; liste sorgusu select_related ile getirir
+        return self._cover_variant_url(obj, "full")
 
-    def get_comment_count(self, obj):
-        return obj.comments.count()
+    def get_first_media_card_url(self, obj):
+        return self._cover_variant_url(obj, "card")
 
-    def get_first_media_url(self, obj):
-        media = obj.media_files.first()
-        if media and getattr(media, "file", None):
-            try:
-                url = media.file.url
-                # If using R2 storage, ensure URL has proper HTTPS protocol
-                if getattr(settings, 'USE_R2', False):
-                    # For R2 storage, ensure URL starts with https://
-                    if not url.startswith('https://'):
-                        if url.startswith('//'):
-                            url = 'https:' + url
-                        elif url.startswith('/'):
-                            # Build URL with either custom domain or direct endpoint
-                            domain = getattr(settings, 'R2_CUSTOM_DOMAIN', '')
-                            if domain and domain.strip():
-                                url = f'https://{domain}{url}'
-                            else:
-                                # Use direct R2 endpoint
-                                account_id = getattr(settings, 'R2_ACCOUNT_ID', '')
-                                bucket_name = getattr(settings, 'R2_BUCKET_NAME', '')
-                                url = f'https://{bucket_name}.{account_id}.r2.cloudflarestorage.com{url}'
-                        elif not url.startswith('http'):
-                            url = f'https://{url}'
-                    return url
-                else:
-                    # For local storage, build absolute URI
-                    request = self.context.get("request") if hasattr(self, "context") else None
-                    if request is not None:
-                        return request.build_absolute_uri(url)
-                    return url
-            except Exception:
-                return None
-        return None
+    def get_first_media_thumb_url(self, obj):
+        return self._cover_variant_url(obj, "thumb")
+
+    def _cover_variant_url(self, obj, label):
+        media = obj.cover_media
+        if media is None:
+            return None
+        return media_variant_urls(media, media_url_base(self.context)).get(label)
 
 
 class ReportDetailSerializer(serializers.ModelSerializer):
@@ -159,6 +158,8 @@ class ReportDetailSerializer(serializers.ModelSerializer):
     assigned_team = TeamSerializer(read_only=True)
     media_files = MediaSerializer(many=True, read_only=True)
     comments = CommentSerializer(many=True, read_only=True)
+    # Benzer görüntülü ve yakındaki diğer bildirimler (reports.duplicates)
+    possible_duplicates = serializers.SerializerMethodField()
 
     # DecimalField olabilecek alanları mobil uyumluluğu için float olarak serileştir
     latitude = serializers.FloatField(allow_null=True, required=False)
@@ -182,8 +183,12 @@ class ReportDetailSerializer(serializers.ModelSerializer):
             "updated_at",
             "media_files",
             "comments",
+            "possible_duplicates",
         ]
 
+    def get_possible_duplicates(self, obj):
+        return duplicates.possible_duplicates(obj)
+
 
 class ReportCreateSerializer(serializers.ModelSerializer):
     """Bildirim oluşturma serileştiricisi"""
@@ -191,6 +196,10 @@ class ReportCreateSerializer(serializers.ModelSerializer):
     media_files = serializers.ListField(
         child=serializers.FileField(allow_empty_file=False), write_only=True, required=False
     )
+    # Doğrudan depoya yüklenmiş dosyaların anahtarları (bkz. ReportUploadView)
+    media_keys = serializers.ListField(
+        child=serializers.CharField(max_length=255), write_only=True, required=False
+    )
 
     # Mobil taraf ile uyum için bu alanları float kabul et
     latitude = serializers.FloatField(allow_null=True, required=False)
@@ -207,6 +216,7 @@ class ReportCreateSerializer(serializers.ModelSerializer):
             "latitude",
             "longitude",
             "media_files",
+            "media_keys",
         ]
         read_only_fields = ["id"]
 
@@ -238,7 +248,20 @@ class ReportCreateSerializer(serializers.ModelSerializer):
                 if single:
                     files.append(single)
             if files:
+                # Dekompresyon bombalarını piksel verisi çözülmeden reddet
+                for media_file in files:
+                    try:
+                        validate_pixel_budget(media_file)
+                    except ImageTooLarge as exc:
+                        raise serializers.ValidationError({'media_files': str(exc)})
                 attrs["media_files"] = files
+            elif attrs.get("media_keys"):
+                try:
+                    attrs["media_uploads"] = direct_uploads.verify_uploads(
+                        request.user, attrs["media_keys"]
+                    )
+                except direct_uploads.UploadError as exc:
+                    raise serializers.ValidationError({'media_keys': str(exc)})
             else:
                 # Fotoğraf zorunlu (MVP gereği)
                 raise serializers.ValidationError({'media_files': 'En az bir fotoğraf yüklenmesi zorunludur.'})
@@ -247,6 +270,8 @@ class ReportCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         """Bildirim ve medya dosyalarını birlikte oluştur (atomik) ve hataları 4xx olarak döndür"""
         media_files = validated_data.pop("media_files", [])
+        media_uploads = validated_data.pop("media_uploads", [])
+        validated_data.pop("media_keys", None)
         
         # Debug logging
         import logging
@@ -255,25 +280,10 @@ class ReportCreateSerializer(serializers.ModelSerializer):
         logger.info(f"Validated data: {validated_data}")
 
         try:
-            with transaction.atomic():
-                # Bildirimi oluştur
-                report = Report.objects.create(**validated_data)
-                logger.info(f"Created report with ID: {report.id}")
-
-                # Medya dosyalarını oluştur (dosya validasyonlarını tetikle)
-                for i, media_file in enumerate(media_files):
-                    try:
-                        logger.info(f"Processing media file {i+1}: {media_file.name}, size: {media_file.size}")
-                        media = Media(report=report, file=media_file, media_type="IMAGE")
-                        # Model alan doğrulamalarını (örn. uzantı) çalıştır
-                        media.full_clean()
-                        media.save()
-                        logger.info(f"Saved media file {i+1} successfully")
-                    except Exception as media_error:
-                        logger.error(f"Error processing media file {i+1}: {str(media_error)}")
-                        raise
-
-                return report
+            return self._create_with_media(validated_data, media_files, logger, media_uploads)
+        except direct_uploads.UploadError as e:
+            # Anahtar eşzamanlı başka bir isteğin bildirimine bağlandı
+            raise serializers.ValidationError({'media_keys': str(e)})
         except DjangoValidationError as e:
             logger.error(f"Django validation error: {e}")
             # Model full_clean() veya alan hataları -> 400 döndür
@@ -289,6 +299,92 @@ class ReportCreateSerializer(serializers.ModelSerializer):
             # Beklenmeyen durumlar -> 400 ile anlamlı mesaj döndür (geçici teşhis için)
             raise serializers.ValidationError({"detail": f"Yükleme sırasında bir hata oluştu: {str(e)}"})
 
+    def _create_with_media(self, validated_data, media_files, logger, media_uploads=()):
+        """Rapor ve medya satırları tek transaction'da; dosyalar depoya eşzamanlı yüklenir"""
+        stored_names = []
+        try:
+            with transaction.atomic():
+                # Bildirimi oluştur
+                report = Report.objects.create(**validated_data)
+                logger.info(f"Created report with ID: {report.id}")
+
+                # Önce tüm dosyaları doğrula (örn. uzantı); hiçbir şey yüklenmeden 400 dönebilsin
+                medias = []
+                for i, media_file in enumerate(media_files):
+                    logger.info(f"Validating media file {i+1}: {media_file.name}, size: {media_file.size}")
+                    media = Media(report=report, file=media_file, media_type="IMAGE")
+                    media.full_clean()
+                    medias.append(media)
+
+                # Depoya eşzamanlı yükle; optimizasyon commit sonrası arka planda yapılır
+                stored_names = store_uploads(medias)
+                for media in medias:
+                    media.save()
+                # Doğrudan yüklenmiş nesneler zaten depoda; yalnızca kayıtları oluşturulur
+                medias.extend(direct_uploads.attach_uploads(report, media_uploads))
+                logger.info(f"Saved {len(medias)} media files successfully")
+                return report
+        except Exception:
+            # Rapor ve medya satırları geri alındı; depoya yüklenmiş nesneleri de temizle
+            if stored_names:
+                delete_files(Media._meta.get_field("file").storage, stored_names)
+            raise
+
+
+class UploadRequestSerializer(serializers.Serializer):
+    """Doğrudan yükleme adresi istenen tek dosya"""
+
+    name = serializers.CharField(max_length=255, required=False)
+    content_type = serializers.ChoiceField(choices=sorted(direct_uploads.CONTENT_TYPES))
+    size = serializers.IntegerField(min_value=1)
+
+    def validate_size(self, value):
+        if value > direct_uploads.max_upload_bytes():
+            raise serializers.ValidationError(
+                f"Dosya boyutu en fazla {direct_uploads.max_upload_bytes()} bayt olabilir."
+            )
+        return value
+
+
+class UploadPresignSerializer(serializers.Serializer):
+    """Doğrudan yükleme adresleri isteği"""
+
+    files = UploadRequestSerializer(many=True, allow_empty=False)
+
+    def validate_files(self, value):
+        if len(value) > direct_uploads.max_files():
+            raise serializers.ValidationError(f"En fazla {direct_uploads.max_files()} dosya yüklenebilir.")
+        return value
+
+
+class ResumableUploadSerializer(serializers.ModelSerializer):
+    """Sürdürülebilir yüklemenin durumu; tamamlandığında `key` bildirime bağlanabilir"""
+
+    class Meta:
+        model = ResumableUpload
+        fields = ["id", "filename", "content_type", "size", "offset", "key", "expires_at"]
+        read_only_fields = fields
+
+
+class UploadFinalizeSerializer(serializers.Serializer):
+    """Doğrudan yüklenmiş dosyaları mevcut bir bildirime bağlama isteği"""
+
+    report = serializers.PrimaryKeyRelatedField(queryset=Report.objects.all())
+    keys = serializers.ListField(child=serializers.CharField(max_length=255), allow_empty=False)
+
+    def validate_report(self, report):
+        user = self.context["request"].user
+        if report.reporter_id != user.pk and not user.is_staff:
+            raise serializers.ValidationError("Yalnızca kendi bildiriminize dosya ekleyebilirsiniz.")
+        return report
+
+    def validate(self, attrs):
+        try:
+            attrs["uploads"] = direct_uploads.verify_uploads(self.context["request"].user, attrs["keys"])
+        except direct_uploads.UploadError as exc:
+            raise serializers.ValidationError({"keys": str(exc)})
+        return attrs
+
 
 class ReportUpdateSerializer(serializers.ModelSerializer):
     """Bildirim güncelleme serileştiricisi (operatör/ekip için)"""
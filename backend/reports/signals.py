@@ -0,0 +1,229 @@
+"""Report üzerindeki denormalize verileri güncel tutan sinyaller.
+
+Medya/yorum sayaçları, kapak medyası, medya içerik referansları, yarım kalan yüklemelerin
+geçici dosyaları, günlük istatistik tablosu, PostgreSQL arama vektörü, süreç içi öneri
+indeksi ve harita kümesi önbelleği burada güncellenir. Güncellemeler F() ifadeleriyle tek
+UPDATE olarak yapılır; böylece eşzamanlı yüklemelerde sayaçlar kaybolmaz ve kayıt işlemiyle
+aynı transaction içinde kalır. Serializer, admin ve cascade silmeler aynı sinyallerden
+geçtiği için tüm yollar kapsanır.
+"""
+
+import os
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Value
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from users.models import Team
+
+from . import clusters, media_processing, resumable, suggest
+from .models import Category, Comment, Media, Report, ResumableUpload
+from .search import update_search_vectors
+from .stats import apply_rollup_delta, merge_team_stats, rollup_key
+
+COUNTER_FIELDS = {Media: "media_count", Comment: "comment_count"}
+
+
+def first_media_subquery():
+    """Raporun ilk (en düşük id'li) medyasını seçen alt sorgu."""
+    return Subquery(
+        Media.objects.filter(report=OuterRef("pk")).order_by("pk").values("pk")[:1]
+    )
+
+
+def _adjust_counter(report_id, field, delta):
+    value = F(field) + delta if delta > 0 else Greatest(F(field) + delta, Value(0))
+    Report.objects.filter(pk=report_id).update(**{field: value})
+
+
+def _refresh_cached_report(instance):
+    """İlişkili rapor bellekte yüklüyse denormalize alanlarını yenile."""
+    field = instance._meta.get_field("report")
+    if not field.is_cached(instance):
+        return
+    report = field.get_cached_value(instance)
+    if report is None or report.pk is None:
+        return
+    try:
+        report.refresh_from_db(fields=["media_count", "comment_count", "cover_media"])
+    except Report.DoesNotExist:
+        # Cascade silme sırasında rapor da silinmiş olabilir
+        pass
+
+
+@receiver(pre_save, sender=Media)
+@receiver(pre_save, sender=Comment)
+def remember_previous_report(sender, instance, **kwargs):
+    # Kayıt başka bir rapora taşınıyorsa eski raporun sayacını düşürebilmek için
+    instance._previous_report_id = None
+    if instance.pk is not None and not instance._state.adding:
+        instance._previous_report_id = (
+            sender.objects.filter(pk=instance.pk).values_list("report_id", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Media)
+@receiver(post_save, sender=Comment)
+def increment_report_counters(sender, instance, created, **kwargs):
+    if kwargs.get("raw"):
+        return
+    previous_report_id = getattr(instance, "_previous_report_id", None)
+    moved = not created and previous_report_id not in (None, instance.report_id)
+    if not created and not moved:
+        return
+
+    field = COUNTER_FIELDS[sender]
+    with transaction.atomic():
+        if moved:
+            _adjust_counter(previous_report_id, field, -1)
+            if sender is Media:
+                Report.objects.filter(pk=previous_report_id, cover_media=instance).update(
+                    cover_media=first_media_subquery()
+                )
+        _adjust_counter(instance.report_id, field, 1)
+        if sender is Media:
+            Report.objects.filter(pk=instance.report_id, cover_media__isnull=True).update(
+                cover_media=instance
+            )
+    _refresh_cached_report(instance)
+
+
+@receiver(post_save, sender=Media)
+def schedule_media_processing(sender, instance, **kwargs):
+    # Optimizasyon isteğin transaction'ı dışında, commit sonrasında yapılır
+    if kwargs.get("raw") or instance.processing_state != Media.PROCESSING_PENDING:
+        return
+    media_id = instance.pk
+    transaction.on_commit(lambda: media_processing.enqueue(media_id))
+
+
+@receiver(post_delete, sender=Media)
+def release_media_blob(sender, instance, **kwargs):
+    # Paylaşılan içerik dosyaları son referans silindiğinde (commit sonrası) silinir
+    if instance.content_hash:
+        media_processing.release_blob(instance.content_hash)
+
+
+@receiver(post_delete, sender=ResumableUpload)
+def remove_resumable_temp_file(sender, instance, **kwargs):
+    # Kullanıcı silinmesiyle gelen cascade silmeler de geçici dosyayı bırakmasın
+    try:
+        os.remove(resumable.temp_path(instance))
+    except FileNotFoundError:
+        pass
+
+
+@receiver(post_delete, sender=Media)
+@receiver(post_delete, sender=Comment)
+def decrement_report_counters(sender, instance, **kwargs):
+    field = COUNTER_FIELDS[sender]
+    with transaction.atomic():
+        _adjust_counter(instance.report_id, field, -1)
+        if sender is Media:
+            # cover_media SET_NULL ile boşaltıldı; kalan ilk medyayı kapak yap
+            Report.objects.filter(pk=instance.report_id, cover_media__isnull=True).update(
+                cover_media=first_media_subquery()
+            )
+    _refresh_cached_report(instance)
+
+
+@receiver(pre_save, sender=Report)
+def remember_previous_rollup_key(sender, instance, **kwargs):
+    # Durum/öncelik/kategori/takım değişiminde eski günlük istatistik satırını azaltmak için
+    # Konum değişiminde eski harita karosunu da geçersiz kılmak için önceki geohash saklanır
+    instance._previous_rollup_key = None
+    instance._previous_geohash = None
+    if instance.pk is not None and not instance._state.adding:
+        previous = (
+            Report.objects.filter(pk=instance.pk)
+            .only("created_at", "category_id", "status", "priority", "assigned_team_id", "geohash")
+            .first()
+        )
+        if previous is not None:
+            instance._previous_rollup_key = rollup_key(previous)
+            instance._previous_geohash = previous.geohash
+
+
+@receiver(post_save, sender=Report)
+def update_daily_stats_on_save(sender, instance, created, **kwargs):
+    if kwargs.get("raw"):
+        return
+    key = rollup_key(instance)
+    previous_key = getattr(instance, "_previous_rollup_key", None)
+    if not created and previous_key == key:
+        return
+    with transaction.atomic():
+        if previous_key is not None:
+            apply_rollup_delta(previous_key, -1)
+        apply_rollup_delta(key, 1)
+
+
+@receiver(post_delete, sender=Report)
+def update_daily_stats_on_delete(sender, instance, **kwargs):
+    apply_rollup_delta(rollup_key(instance), -1)
+
+
+@receiver(pre_delete, sender=Team)
+def merge_daily_stats_on_team_delete(sender, instance, **kwargs):
+    merge_team_stats(instance.pk)
+
+
+@receiver(post_save, sender=Report)
+def update_report_search_vector(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+    update_search_vectors(using=kwargs.get("using") or "default", id=instance.pk)
+
+
+@receiver(post_save, sender=Report)
+def update_report_suggest_index(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+    suggest.index_report(instance)
+
+
+@receiver(post_delete, sender=Report)
+def remove_report_from_suggest_index(sender, instance, **kwargs):
+    suggest.unindex_report(instance.pk)
+
+
+@receiver(post_save, sender=Report)
+def invalidate_report_clusters_on_save(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+    # Commit'ten önce geçersiz kılmak, eşzamanlı bir isteğin eski veriyi yeniden önbelleğe yazmasına izin verir
+    geohashes = (instance.geohash, getattr(instance, "_previous_geohash", None))
+    transaction.on_commit(lambda: clusters.invalidate(*geohashes))
+
+
+@receiver(post_delete, sender=Report)
+def invalidate_report_clusters_on_delete(sender, instance, **kwargs):
+    geohash = instance.geohash
+    transaction.on_commit(lambda: clusters.invalidate(geohash))
+
+
+@receiver(post_save, sender=Category)
+def update_category_search_vectors(sender, instance, created, **kwargs):
+    if created or kwargs.get("raw"):
+        return
+    update_search_vectors(using=kwargs.get("using") or "default", category_id=instance.pk)
+
+
+@receiver(post_save, sender=Team)
+def update_team_search_vectors(sender, instance, created, **kwargs):
+    if created or kwargs.get("raw"):
+        return
+    update_search_vectors(using=kwargs.get("using") or "default", assigned_team_id=instance.pk)
+
+
+@receiver(post_save, sender=get_user_model())
+def update_reporter_search_vectors(sender, instance, created, update_fields=None, **kwargs):
+    # Girişte yalnızca last_login kaydedilir; kullanıcı adı/e-posta değişmediyse atla
+    if created or kwargs.get("raw"):
+        return
+    if update_fields is not None and not {"username", "email"} & set(update_fields):
+        return
+    update_search_vectors(using=kwargs.get("using") or "default", reporter_id=instance.pk)
@@ -0,0 +1,158 @@
+"""Bildirim istatistikleri: dashboard için gruplanmış sayımlar"""
+
+from datetime import datetime, time
+
+from django.db import transaction
+from django.db.models import Count, DateField, F, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .models import Report, ReportDailyStat
+
+TIME_BUCKETS = {
+    "day": TruncDay,
+    "week": TruncWeek,
+    "month": TruncMonth,
+}
+
+
+def _grouped(sources, fields, names):
+    """Her kaynak için tek GROUP BY sorgusu ile sayar, sonuçları birleştirip yeniden adlandırır."""
+    totals = {}
+    for queryset, aggregate, _ in sources:
+        for row in queryset.values(*fields).annotate(count=aggregate).order_by(*fields):
+            key = tuple(row[field] for field in fields)
+            totals[key] = totals.get(key, 0) + row["count"]
+    rows = sorted(totals.items(), key=lambda item: -item[1])
+    return [
+        {**dict(zip(names, key)), "count": count}
+        for key, count in rows
+        if count
+    ]
+
+
+def _timeline(sources, trunc):
+    totals = {}
+    for queryset, aggregate, date_field in sources:
+        rows = (
+            queryset.annotate(period=trunc(date_field, output_field=DateField()))
+            .values("period")
+            .annotate(count=aggregate)
+        )
+        for row in rows:
+            totals[row["period"]] = totals.get(row["period"], 0) + row["count"]
+    return [{"date": period, "count": count} for period, count in sorted(totals.items()) if count]
+
+
+def report_statistics(queryset, bucket="day", rollup=None):
+    """Filtrelenmiş bildirim sorgusunu durum, öncelik, kategori, takım ve zaman dilimine göre sayar.
+
+    Her gruplama kaynak başına tek bir SQL sorgusudur; bildirim satırları Python tarafına
+    taşınmaz. `rollup` (filtrelenmiş ReportDailyStat sorgusu) verilirse bugünden önceki
+    günler ön-toplanmış tablodan, yalnızca bugün canlı tablodan okunur.
+    """
+    queryset = queryset.order_by()
+    sources = [(queryset, Count("id"), "created_at")]
+    if rollup is not None:
+        today = timezone.localdate()
+        start_of_today = timezone.make_aware(datetime.combine(today, time.min))
+        sources = [
+            (rollup.order_by().filter(day__lt=today), Sum("count"), "day"),
+            (queryset.filter(created_at__gte=start_of_today), Count("id"), "created_at"),
+        ]
+
+    by_status = _grouped(sources, ["status"], ["status"])
+    return {
+        "total": sum(row["count"] for row in by_status),
+        "bucket": bucket,
+        "by_status": by_status,
+        "by_priority": _grouped(sources, ["priority"], ["priority"]),
+        "by_category": _grouped(sources, ["category_id", "category__name"], ["id", "name"]),
+        "by_team": _grouped(
+            sources, ["assigned_team_id", "assigned_team__name"], ["id", "name"]
+        ),
+        "timeline": _timeline(sources, TIME_BUCKETS[bucket]),
+    }
+
+
+ROLLUP_DIMENSIONS = ("category_id", "status", "priority", "assigned_team_id")
+
+
+def rollup_key(report):
+    """Bildirimin günlük istatistik tablosundaki satır anahtarı."""
+    return (
+        timezone.localdate(report.created_at),
+        report.category_id,
+        report.status,
+        report.priority,
+        report.assigned_team_id,
+    )
+
+
+def apply_rollup_delta(key, delta):
+    """Günlük istatistik satırını atomik olarak artırır/azaltır."""
+    day, category_id, status, priority, assigned_team_id = key
+    lookups = {
+        "day": day,
+        "category_id": category_id,
+        "status": status,
+        "priority": priority,
+        "assigned_team_id": assigned_team_id,
+    }
+    with transaction.atomic():
+        updated = ReportDailyStat.objects.filter(**lookups).update(count=F("count") + delta)
+        if not updated and delta > 0:
+            stat, created = ReportDailyStat.objects.get_or_create(
+                **lookups, defaults={"count": delta}
+            )
+            if not created:
+                ReportDailyStat.objects.filter(pk=stat.pk).update(count=F("count") + delta)
+
+
+def merge_team_stats(team_id):
+    """Silinen takımın satırlarını atanmamış (NULL) satırlara katar.
+
+    Bildirimler SET_NULL ile atanmamış olur; istatistik satırları ayrıca NULL'a çekilirse
+    atanmamış satırların kopyaları oluşurdu.
+    """
+    rows = ReportDailyStat.objects.filter(assigned_team_id=team_id)
+    with transaction.atomic():
+        for day, category_id, status, priority, count in rows.values_list(
+            "day", "category_id", "status", "priority", "count"
+        ):
+            if count:
+                apply_rollup_delta((day, category_id, status, priority, None), count)
+        rows.delete()
+
+
+def rebuild_daily_stats(since=None, batch_size=1000):
+    """Günlük istatistik tablosunu bildirimlerden tek gruplanmış sorgu ile yeniden üretir."""
+    reports = Report.objects.order_by()
+    stats = ReportDailyStat.objects.all()
+    if since is not None:
+        start = timezone.make_aware(datetime.combine(since, time.min))
+        reports = reports.filter(created_at__gte=start)
+        stats = stats.filter(day__gte=since)
+
+    rows = (
+        reports.annotate(day=TruncDay("created_at", output_field=DateField()))
+        .values("day", *ROLLUP_DIMENSIONS)
+        .annotate(total=Count("id"))
+    )
+    with transaction.atomic():
+        stats.delete()
+        created = ReportDailyStat.objects.bulk_create(
+            (
+                ReportDailyStat(
+                    day=row["day"],
+                    category_id=row["category_id"],
+                    status=row["status"],
+                    priority=row["priority"],
+                    assigned_team_id=row["assigned_team_id"],
+                    count=row["total"],
+                )
+                for row in rows.iterator()
+            ),
+            batch_size=batch_size,
+        )
+    return len(created)
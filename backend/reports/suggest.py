@@ -0,0 +1,207 @@
+"""Bildirim başlığı ve konumu için yazım hatasına dayanıklı otomatik tamamlama.
+
+PostgreSQL'de `pg_trgm` GIN indeksleri üzerinden kelime benzerliği (`<%`) kullanılır;
+indeksler ve sorgu `normalize` ile aynı şekilde katlanmış metin (`Fold`) üzerindedir.
+Diğer veritabanlarında süreç içinde tutulan bir trigram indeksi (NgramIndex) kullanılır;
+indeks ilk istekte veritabanından kurulur, bu süreçte kaydedilen bildirimler anında eklenir
+ve diğer süreçlerdeki değişiklikler için `REPORT_SUGGEST_INDEX_TTL` saniyede bir yenilenir.
+"""
+
+import heapq
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections, transaction
+from django.db.models import Func, TextField
+
+from .models import Report
+
+SUGGEST_FIELDS = ("title", "location")
+
+_TURKISH_FOLD = str.maketrans("çğıöşüâîû", "cgiosuaiu")
+
+
+def normalize(text):
+    """Türkçe büyük/küçük harf ve aksan farklarını yok sayan arama anahtarı."""
+    text = (text or "").replace("I", "ı").replace("İ", "i").lower()
+    return " ".join(text.translate(_TURKISH_FOLD).split())
+
+
+class Fold(Func):
+    """`normalize` karşılığı SQL ifadesi; 0006 göçündeki trigram indeksleri bununla aynıdır."""
+
+    template = "translate(lower(%(expressions)s), 'çğıöşüâîûİ', 'cgiosuaiui')"
+    output_field = TextField()
+
+
+def trigrams(text):
+    """pg_trgm ile aynı şekilde: her kelime başa iki, sona bir boşlukla doldurulur."""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def min_similarity():
+    return getattr(settings, "REPORT_SUGGEST_MIN_SIMILARITY", 0.3)
+
+
+class NgramIndex:
+    """Terim -> trigram ters indeksi; benzerlik pg_trgm word_similarity'ye yakındır."""
+
+    def __init__(self):
+        self.terms = []
+        self.term_ids = {}
+        self.postings = defaultdict(set)
+        self.report_terms = defaultdict(set)
+        self.lock = threading.Lock()
+        self.built_at = time.monotonic()
+
+    def add(self, report_id, field, text):
+        key = normalize(text)
+        if not key:
+            return
+        with self.lock:
+            term_id = self.term_ids.get((field, key))
+            if term_id is None:
+                term_id = len(self.terms)
+                self.term_ids[(field, key)] = term_id
+                self.terms.append({"text": text, "field": field, "key": key, "reports": set()})
+                for gram in trigrams(key):
+                    self.postings[gram].add(term_id)
+            self.terms[term_id]["reports"].add(report_id)
+            self.report_terms[report_id].add(term_id)
+
+    def discard(self, report_id):
+        """Raporu indeksten çıkarır; başka raporu kalmayan terimler artık önerilmez."""
+        with self.lock:
+            for term_id in self.report_terms.pop(report_id, ()):
+                self.terms[term_id]["reports"].discard(report_id)
+
+    def search(self, query, limit=8, allowed_ids=None):
+        key = normalize(query)
+        query_grams = trigrams(key)
+        if not query_grams:
+            return []
+
+        shared = defaultdict(int)
+        # add/discard sinyal işleyicilerinden başka iş parçacıklarında çalışabilir;
+        # kümeler kilit altında sayılır, terimlerin rapor kümeleri kopyalanır
+        with self.lock:
+            for gram in query_grams:
+                for term_id in self.postings.get(gram, ()):
+                    shared[term_id] += 1
+            candidates = [
+                (term_id, count, self.terms[term_id], set(self.terms[term_id]["reports"]))
+                for term_id, count in shared.items()
+            ]
+
+        threshold = min_similarity()
+        scored = []
+        for term_id, count, term, reports in candidates:
+            # word_similarity yaklaşımı: sorgu trigramlarının ne kadarı terimde geçiyor
+            score = count / len(query_grams)
+            if not reports:
+                continue
+            if any(word.startswith(key) for word in [term["key"], *term["key"].split()]):
+                score += 1.0
+            if score < threshold:
+                continue
+            if allowed_ids is not None and not reports & allowed_ids:
+                continue
+            scored.append((score, -len(term["key"]), term_id, term))
+
+        best = heapq.nlargest(limit, scored, key=lambda item: item[:3])
+        return [
+            {"text": term["text"], "field": term["field"], "score": round(min(score, 1.0), 3)}
+            for score, _, _, term in best
+        ]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """Süreç içi indeksi döndürür; yoksa veya süresi dolduysa veritabanından yeniden kurar."""
+    global _index
+    ttl = getattr(settings, "REPORT_SUGGEST_INDEX_TTL", 300)
+    with _index_lock:
+        if _index is None or time.monotonic() - _index.built_at > ttl:
+            index = NgramIndex()
+            rows = Report.objects.order_by().values_list("id", *SUGGEST_FIELDS)
+            for report_id, *values in rows.iterator(chunk_size=5000):
+                for field, value in zip(SUGGEST_FIELDS, values):
+                    index.add(report_id, field, value)
+            _index = index
+        return _index
+
+
+def index_report(report):
+    """Kaydedilen bildirimi (indeks kuruluysa) süreç içi indekste günceller."""
+    if _index is not None:
+        _index.discard(report.pk)
+        for field in SUGGEST_FIELDS:
+            _index.add(report.pk, field, getattr(report, field))
+
+
+def unindex_report(report_id):
+    if _index is not None:
+        _index.discard(report_id)
+
+
+def reset_index():
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def suggest(queryset, query, limit=8, scoped=True):
+    """Kapsamlandırılmış bildirim sorgusu içinden başlık/konum önerilerini döndürür.
+
+    `scoped` False ise (tüm bildirimleri görebilen kullanıcılar) süreç içi indekste
+    kimlik filtrelemesi yapılmaz.
+    """
+    if connections[queryset.db].vendor == "postgresql":
+        return _suggest_postgres(queryset, query, limit)
+    allowed_ids = set(queryset.values_list("id", flat=True)) if scoped else None
+    return get_index().search(query, limit=limit, allowed_ids=allowed_ids)
+
+
+def _suggest_postgres(queryset, query, limit):
+    key = normalize(query)
+    rows_by_field = {}
+    # Eşik yalnızca bu işlemde geçerli; havuzdaki bağlantının diğer sorgularını etkilemez
+    with transaction.atomic(using=queryset.db):
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                [str(min_similarity())],
+            )
+        for field in SUGGEST_FIELDS:
+            rows_by_field[field] = list(
+                queryset.order_by()
+                .alias(folded=Fold(field))
+                .filter(folded__trigram_word_similar=key)
+                .annotate(score=TrigramWordSimilarity(key, Fold(field)))
+                .order_by("-score")
+                .values_list(field, "score")[: limit * 3]
+            )
+
+    results = {}
+    for field, rows in rows_by_field.items():
+        for text, score in rows:
+            if normalize(text).startswith(key) or any(
+                word.startswith(key) for word in normalize(text).split()
+            ):
+                score += 1.0
+            dedupe_key = (field, normalize(text))
+            if dedupe_key not in results or results[dedupe_key]["score"] < score:
+                results[dedupe_key] = {"text": text, "field": field, "score": score}
+
+    best = heapq.nlargest(limit, results.values(), key=lambda item: item["score"])
+    return [{**item, "score": round(min(item["score"], 1.0), 3)} for item in best]
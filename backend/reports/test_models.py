@@ -1,7 +1,9 @@
 import pytest
+from io import StringIO
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
-from reports.models import Category, Report, Media
+from django.utils import timezone
+from reports.models import Category, Comment, Report, ReportDailyStat, Media, MediaBlob
 from users.models import Team
 
 User = get_user_model()
@@ -265,3 +267,616 @@ class TestMediaModelEdgeCases:
         
         # file_path is empty string when no file is provided
         assert media.file_path == ""
+
+
+@pytest.mark.django_db
+class TestReportDenormalizedCounters:
+    def setup_method(self):
+        self.user = User.objects.create_user(
+            email="counter@example.com",
+            password="Pass123!",
+            username="counteruser"
+        )
+        self.category = Category.objects.create(name="Counter Category")
+        self.report = Report.objects.create(
+            title="Counter Report",
+            description="Test Description",
+            reporter=self.user,
+            category=self.category
+        )
+
+    def create_media(self, report=None, name="test.jpg"):
+        return Media.objects.create(
+            report=report or self.report,
+            file=SimpleUploadedFile(name, b"fake image content", content_type="image/jpeg"),
+            media_type="IMAGE"
+        )
+
+    def test_media_create_and_delete_update_counter_and_cover(self):
+        first = self.create_media(name="first.jpg")
+        second = self.create_media(name="second.jpg")
+
+        self.report.refresh_from_db()
+        assert self.report.media_count == 2
+        assert self.report.cover_media_id == first.id
+
+        first.delete()
+        self.report.refresh_from_db()
+        assert self.report.media_count == 1
+        assert self.report.cover_media_id == second.id
+
+        second.delete()
+        self.report.refresh_from_db()
+        assert self.report.media_count == 0
+        assert self.report.cover_media_id is None
+
+    def test_comment_create_and_delete_update_counter(self):
+        comment = Comment.objects.create(report=self.report, user=self.user, content="Bir")
+        Comment.objects.create(report=self.report, user=self.user, content="İki")
+
+        self.report.refresh_from_db()
+        assert self.report.comment_count == 2
+
+        comment.delete()
+        self.report.refresh_from_db()
+        assert self.report.comment_count == 1
+
+    def test_moving_media_between_reports_updates_both(self):
+        other = Report.objects.create(
+            title="Other Report",
+            description="Test Description",
+            reporter=self.user,
+            category=self.category
+        )
+        media = self.create_media()
+
+        media.report = other
+        media.save()
+
+        self.report.refresh_from_db()
+        other.refresh_from_db()
+        assert self.report.media_count == 0
+        assert self.report.cover_media_id is None
+        assert other.media_count == 1
+        assert other.cover_media_id == media.id
+
+    def test_report_cascade_delete(self):
+        self.create_media()
+        Comment.objects.create(report=self.report, user=self.user, content="Yorum")
+
+        self.report.delete()
+
+        assert Media.objects.count() == 0
+        assert Comment.objects.count() == 0
+
+    def test_rebuild_report_counters_command(self):
+        from django.core.management import call_command
+
+        media = self.create_media()
+        Comment.objects.create(report=self.report, user=self.user, content="Yorum")
+        Report.objects.filter(pk=self.report.pk).update(
+            media_count=0, comment_count=7, cover_media=None
+        )
+
+        call_command("rebuild_report_counters", batch_size=1, stdout=StringIO())
+
+        self.report.refresh_from_db()
+        assert self.report.media_count == 1
+        assert self.report.comment_count == 1
+        assert self.report.cover_media_id == media.id
+
+
+@pytest.mark.django_db
+class TestReportDailyStatRollup:
+    def setup_method(self):
+        self.user = User.objects.create_user(
+            email="rollup@example.com",
+            password="Pass123!",
+            username="rollupuser"
+        )
+        self.category = Category.objects.create(name="Rollup Category")
+
+    def stat_counts(self):
+        return {
+            (stat.status, stat.priority): stat.count
+            for stat in ReportDailyStat.objects.filter(category=self.category)
+        }
+
+    def test_rollup_follows_create_update_delete(self):
+        report = Report.objects.create(
+            title="Rollup", description="Test", reporter=self.user, category=self.category
+        )
+        assert self.stat_counts() == {("BEKLEMEDE", "ORTA"): 1}
+
+        report.status = "COZULDU"
+        report.save()
+        assert self.stat_counts() == {("BEKLEMEDE", "ORTA"): 0, ("COZULDU", "ORTA"): 1}
+
+        report.title = "Yalnızca başlık"
+        report.save()
+        assert self.stat_counts() == {("BEKLEMEDE", "ORTA"): 0, ("COZULDU", "ORTA"): 1}
+
+        report.delete()
+        assert self.stat_counts() == {("BEKLEMEDE", "ORTA"): 0, ("COZULDU", "ORTA"): 0}
+
+    def test_rebuild_report_rollup_command(self):
+        from django.core.management import call_command
+
+        Report.objects.create(title="A", description="Test", reporter=self.user, category=self.category)
+        Report.objects.create(title="B", description="Test", reporter=self.user, category=self.category,
+                              priority="ACIL")
+        ReportDailyStat.objects.all().delete()
+
+        call_command("rebuild_report_rollup", stdout=StringIO())
+
+        assert self.stat_counts() == {("BEKLEMEDE", "ORTA"): 1, ("BEKLEMEDE", "ACIL"): 1}
+
+    def test_unassigned_rows_stay_unique(self):
+        from django.db import IntegrityError, transaction
+
+        from reports.stats import apply_rollup_delta
+
+        key = (timezone.localdate(), self.category.id, "BEKLEMEDE", "ORTA", None)
+        apply_rollup_delta(key, 1)
+        apply_rollup_delta(key, 1)
+        assert self.stat_counts() == {("BEKLEMEDE", "ORTA"): 2}
+        # get_or_create yarışında ikinci satır kısıtla reddedilir
+        with pytest.raises(IntegrityError), transaction.atomic():
+            ReportDailyStat.objects.create(
+                day=key[0], category=self.category, status="BEKLEMEDE", priority="ORTA", count=1
+            )
+
+    def test_team_delete_merges_rows_into_unassigned(self):
+        team = Team.objects.create(name="Rollup Team", created_by=self.user)
+        Report.objects.create(title="A", description="Test", reporter=self.user, category=self.category)
+        Report.objects.create(
+            title="B", description="Test", reporter=self.user, category=self.category, assigned_team=team
+        )
+
+        team.delete()
+
+        stats = ReportDailyStat.objects.filter(category=self.category)
+        assert [(stat.assigned_team_id, stat.count) for stat in stats] == [(None, 2)]
+
+
+@pytest.mark.django_db
+class TestReportGeohash:
+    def setup_method(self):
+        self.user = User.objects.create_user(
+            email="geo@example.com",
+            password="Pass123!",
+            username="geouser"
+        )
+        self.category = Category.objects.create(name="Geo Category")
+
+    def test_geohash_follows_coordinates(self):
+        report = Report.objects.create(
+            title="Geo", description="Test", reporter=self.user, category=self.category,
+            latitude="57.649110", longitude="10.407440"
+        )
+        assert report.geohash == "u4pruydqq"
+
+        report.latitude = None
+        report.save(update_fields=["latitude"])
+        report.refresh_from_db()
+        assert report.geohash is None
+
+    def test_cover_contains_points_inside_bbox(self):
+        from reports import geo
+
+        cells = geo.cover(41.00, 28.95, 41.05, 29.05)
+        assert 0 < len(cells) <= 32
+        for lat, lon in [(41.0, 28.95), (41.025, 29.0), (41.05, 29.05)]:
+            assert any(geo.encode(lat, lon).startswith(cell) for cell in cells)
+
+    def test_prefix_ranges_merge_adjacent_cells(self):
+        from reports import geo
+
+        assert geo.prefix_ranges(["u4", "u", "v", "z"]) == [("u", "w"), ("z", None)]
+        assert geo.next_prefix("sxkz") == "sxm"
+
+    def test_haversine_distance(self):
+        from reports import geo
+
+        # Bir derece enlem ~111.2 km
+        assert abs(geo.haversine_m(41.0, 29.0, 42.0, 29.0) - 111195) < 10
+
+
+@pytest.mark.django_db
+class TestMediaBackgroundProcessing:
+    def setup_method(self):
+        self.user = User.objects.create_user(
+            email="processing@example.com",
+            password="Pass123!",
+            username="processinguser"
+        )
+        self.category = Category.objects.create(name="Processing Category")
+        self.report = Report.objects.create(
+            title="Processing Report",
+            description="Test Description",
+            reporter=self.user,
+            category=self.category
+        )
+
+    def large_png(self, name="large.png"):
+        from io import BytesIO
+        from PIL import Image
+
+        buffer = BytesIO()
+        Image.new("RGB", (2048, 1536), (200, 30, 30)).save(buffer, format="PNG")
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+    def test_original_is_stored_and_optimized_after_commit(self, settings, django_capture_on_commit_callbacks):
+        from PIL import Image
+
+        settings.MEDIA_PROCESSING_MODE = "sync"
+        with django_capture_on_commit_callbacks(execute=True):
+            media = Media.objects.create(report=self.report, file=self.large_png(), media_type="IMAGE")
+            # Commit'ten önce orijinal olduğu gibi saklanır
+            assert media.processing_state == Media.PROCESSING_PENDING
+            original_name = media.file.name
+
+        media.refresh_from_db()
+        assert media.processing_state == Media.PROCESSING_DONE
+        assert media.file_path == media.file.name
+        with media.file.open("rb") as fh, Image.open(fh) as img:
+            assert max(img.size) == 1024
+        # Optimize dosya yeni adla yazılır ve orijinal silinir
+        assert media.file.name != original_name
+        assert not media.file.storage.exists(original_name)
+        # Yükleme dışı yollarda algısal özet çalışan tarafından hesaplanır
+        assert media.perceptual_hash is not None
+
+    def test_worker_streams_through_temp_files(self, settings, monkeypatch, tmp_path, django_capture_on_commit_callbacks):
+        import os
+        from reports import media_processing
+
+        settings.MEDIA_PROCESSING_MODE = "sync"
+        temp_dir = tmp_path / "tmp"
+        temp_dir.mkdir()
+        settings.FILE_UPLOAD_TEMP_DIR = str(temp_dir)
+        seen = []
+        original_render = media_processing.render_variants
+
+        def recording_render(fileobj, name, **kwargs):
+            seen.append((getattr(fileobj, "name", None), kwargs.get("open_output")))
+            return original_render(fileobj, name, **kwargs)
+
+        monkeypatch.setattr(media_processing, "render_variants", recording_render)
+        with django_capture_on_commit_callbacks(execute=True):
+            media = Media.objects.create(report=self.report, file=self.large_png(), media_type="IMAGE")
+
+        media.refresh_from_db()
+        assert media.processing_state == Media.PROCESSING_DONE
+        # Orijinal geçici dosyadan çözülür, çıktılar baytlar yerine dosyalara kodlanır
+        [(source, open_output)] = seen
+        assert source.startswith(str(temp_dir)) and open_output is not None
+        assert media.file_size == media.file.storage.size(media.file.name)
+        assert os.listdir(temp_dir) == []
+
+    def test_queue_mode_defers_to_worker_command(self, settings, django_capture_on_commit_callbacks):
+        from django.core.management import call_command
+
+        settings.MEDIA_PROCESSING_MODE = "queue"
+        with django_capture_on_commit_callbacks(execute=True):
+            media = Media.objects.create(report=self.report, file=self.large_png(), media_type="IMAGE")
+
+        media.refresh_from_db()
+        assert media.processing_state == Media.PROCESSING_PENDING
+
+        call_command("process_media", once=True, stdout=StringIO())
+        media.refresh_from_db()
+        assert media.processing_state == Media.PROCESSING_DONE
+        assert media.file_size < 100_000
+
+    def test_corrupt_image_is_marked_failed_and_kept(self, settings, django_capture_on_commit_callbacks):
+        settings.MEDIA_PROCESSING_MODE = "sync"
+        with django_capture_on_commit_callbacks(execute=True):
+            media = Media.objects.create(
+                report=self.report,
+                file=SimpleUploadedFile("broken.jpg", b"not an image", content_type="image/jpeg"),
+                media_type="IMAGE"
+            )
+
+        media.refresh_from_db()
+        assert media.processing_state == Media.PROCESSING_FAILED
+        assert media.file.storage.exists(media.file.name)
+
+    @pytest.mark.parametrize("image_format", ["JPEG", "MPO"])
+    def test_jpeg_is_decoded_in_draft_mode(self, monkeypatch, image_format):
+        from io import BytesIO
+        from PIL import Image, JpegImagePlugin
+        from reports.media_processing import optimize_image
+
+        buffer = BytesIO()
+        image = Image.new("RGB", (4096, 3072), (90, 90, 200))
+        if image_format == "MPO":
+            # Telefonların çoklu resim JPEG'i (ör. portre modu derinlik karesi)
+            image.save(buffer, format="MPO", save_all=True, append_images=[image.resize((640, 480))])
+        else:
+            image.save(buffer, format="JPEG")
+        buffer.seek(0)
+        with Image.open(buffer) as img:
+            assert img.format == image_format
+        buffer.seek(0)
+
+        decoded_sizes = []
+        original_load = JpegImagePlugin.JpegImageFile.load
+
+        def tracking_load(img):
+            decoded_sizes.append(img.size)
+            return original_load(img)
+
+        monkeypatch.setattr(JpegImagePlugin.JpegImageFile, "load", tracking_load)
+        content, name, content_type = optimize_image(buffer, "photo.jpg")
+
+        # 1/2 ölçekte (2048x1536) çözülür; tam çözünürlük belleğe açılmaz
+        assert decoded_sizes[0] == (2048, 1536)
+        with Image.open(BytesIO(content)) as img:
+            assert img.size == (1024, 768)
+        assert (name, content_type) == ("photo.jpg", "image/jpeg")
+
+    def test_pixel_budget_marks_processing_failed(self, settings, django_capture_on_commit_callbacks):
+        settings.MEDIA_PROCESSING_MODE = "sync"
+        settings.MEDIA_MAX_IMAGE_PIXELS = 1_000_000
+        with django_capture_on_commit_callbacks(execute=True):
+            media = Media.objects.create(report=self.report, file=self.large_png(), media_type="IMAGE")
+
+        media.refresh_from_db()
+        assert media.processing_state == Media.PROCESSING_FAILED
+
+    def test_variants_are_generated_once(self, settings, django_capture_on_commit_callbacks):
+        from PIL import Image
+
+        settings.MEDIA_PROCESSING_MODE = "sync"
+        with django_capture_on_commit_callbacks(execute=True):
+            media = Media.objects.create(report=self.report, file=self.large_png("variant.png"), media_type="IMAGE")
+
+        media.refresh_from_db()
+        assert set(media.variants) == {"card", "thumb"}
+        assert (media.variants["card"]["width"], media.variants["card"]["height"]) == (480, 360)
+        assert (media.variants["thumb"]["width"], media.variants["thumb"]["height"]) == (160, 120)
+        storage = media.file.storage
+        for variant in media.variants.values():
+            with storage.open(variant["name"], "rb") as fh, Image.open(fh) as img:
+                assert img.size == (variant["width"], variant["height"])
+                assert img.format == "PNG"
+
+    def test_small_image_skips_variants(self, settings, django_capture_on_commit_callbacks):
+        from io import BytesIO
+        from PIL import Image
+
+        settings.MEDIA_PROCESSING_MODE = "sync"
+        buffer = BytesIO()
+        Image.new("RGB", (300, 200), (10, 120, 10)).save(buffer, format="JPEG")
+        with django_capture_on_commit_callbacks(execute=True):
+            media = Media.objects.create(
+                report=self.report,
+                file=SimpleUploadedFile("small.jpg", buffer.getvalue(), content_type="image/jpeg"),
+                media_type="IMAGE"
+            )
+
+        media.refresh_from_db()
+        assert media.processing_state == Media.PROCESSING_DONE
+        # Kaynak zaten 480 px kutusuna sığdığı için yalnızca küçük resim üretilir
+        assert set(media.variants) == {"thumb"}
+
+    def test_webp_policy_strips_metadata_and_keeps_jpeg_fallback(self, settings, django_capture_on_commit_callbacks):
+        from io import BytesIO
+        from PIL import Image
+
+        settings.MEDIA_PROCESSING_MODE = "sync"
+        settings.MEDIA_ENCODING_POLICY = "webp"
+        exif = Image.Exif()
+        exif[0x0112] = 6  # 90 derece döndürülmüş telefon fotoğrafı
+        exif[0x010F] = "PhoneMaker"
+        buffer = BytesIO()
+        Image.new("RGB", (2048, 1536), (30, 60, 90)).save(buffer, format="JPEG", exif=exif, comment=b"secret")
+        with django_capture_on_commit_callbacks(execute=True):
+            media = Media.objects.create(
+                report=self.report,
+                file=SimpleUploadedFile("phone.jpg", buffer.getvalue(), content_type="image/jpeg"),
+                media_type="IMAGE"
+            )
+
+        media.refresh_from_db()
+        assert media.file.name.endswith(".webp")
+        assert set(media.variants) == {"card", "thumb", "fallback"}
+        storage = media.file.storage
+        names = [media.file.name] + [variant["name"] for variant in media.variants.values()]
+        for name in names:
+            with storage.open(name, "rb") as fh, Image.open(fh) as img:
+                assert img.format == ("JPEG" if name == media.variants["fallback"]["name"] else "WEBP")
+                # Yön piksellere uygulanır, EXIF ve yorum atılır
+                assert img.height > img.width
+                assert not img.getexif()
+                assert "comment" not in img.info
+
+    def test_avif_policy_falls_back_to_webp(self, settings, monkeypatch):
+        from reports import media_processing
+
+        settings.MEDIA_ENCODING_POLICY = "avif"
+        monkeypatch.setattr(media_processing, "avif_supported", lambda: False)
+        assert media_processing.encoding_policy()["format"] == "WEBP"
+
+        settings.MEDIA_ENCODING_POLICY = "original"
+        settings.MEDIA_ENCODING_OPTIONS = {"WEBP": {"quality": 50}}
+        encoding = media_processing.encoding_policy()
+        assert encoding["format"] is None
+        assert encoding["options"]["WEBP"] == {"quality": 50, "method": 6}
+
+    def test_claim_is_exclusive(self):
+        from reports.media_processing import claim
+
+        media = Media.objects.create(report=self.report, file=self.large_png(), media_type="IMAGE")
+        assert claim(media.pk) is True
+        assert claim(media.pk) is False
+
+
+@pytest.mark.django_db
+class TestMediaDeduplication:
+    def setup_method(self):
+        self.user = User.objects.create_user(
+            email="dedupe@example.com",
+            password="Pass123!",
+            username="dedupeuser"
+        )
+        self.category = Category.objects.create(name="Dedupe Category")
+        self.reports = [
+            Report.objects.create(
+                title=f"Dedupe Report {index}",
+                description="Test Description",
+                reporter=self.user,
+                category=self.category
+            )
+            for index in range(2)
+        ]
+
+    def photo_bytes(self, color=(200, 30, 30)):
+        from io import BytesIO
+        from PIL import Image
+
+        buffer = BytesIO()
+        Image.new("RGB", (1600, 1200), color).save(buffer, format="JPEG")
+        return buffer.getvalue()
+
+    def create_media(self, report, data, name="photo.jpg"):
+        return Media.objects.create(
+            report=report, file=SimpleUploadedFile(name, data, content_type="image/jpeg"), media_type="IMAGE"
+        )
+
+    def test_duplicate_photo_skips_encoding_and_shares_blob(self, settings, monkeypatch, django_capture_on_commit_callbacks):
+        from reports import media_processing
+
+        settings.MEDIA_PROCESSING_MODE = "sync"
+        renders = []
+        original_render = media_processing.render_variants
+
+        def counting_render(*args, **kwargs):
+            renders.append(args[1])
+            return original_render(*args, **kwargs)
+
+        monkeypatch.setattr(media_processing, "render_variants", counting_render)
+        data = self.photo_bytes()
+        with django_capture_on_commit_callbacks(execute=True):
+            first = self.create_media(self.reports[0], data)
+        with django_capture_on_commit_callbacks(execute=True):
+            second = self.create_media(self.reports[1], data, "again.jpg")
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert len(renders) == 1
+        assert second.processing_state == Media.PROCESSING_DONE
+        assert first.file.name == second.file.name
+        assert first.file.name.startswith(f"reports/blobs/{first.content_hash[:2]}/")
+        assert first.variants == second.variants
+        blob = MediaBlob.objects.get(sha256=first.content_hash)
+        assert blob.ref_count == 2
+
+    def test_blob_is_deleted_with_last_reference(self, settings, django_capture_on_commit_callbacks):
+        settings.MEDIA_PROCESSING_MODE = "sync"
+        data = self.photo_bytes((20, 40, 200))
+        with django_capture_on_commit_callbacks(execute=True):
+            first = self.create_media(self.reports[0], data)
+        with django_capture_on_commit_callbacks(execute=True):
+            self.create_media(self.reports[1], data)
+        first.refresh_from_db()
+        storage = first.file.storage
+        names = MediaBlob.objects.get(sha256=first.content_hash).storage_names()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            first.delete()
+        assert MediaBlob.objects.get(sha256=first.content_hash).ref_count == 1
+        assert all(storage.exists(name) for name in names)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            # Bildirim silindiğinde medya cascade ile silinir ve son referans bırakılır
+            self.reports[1].delete()
+        assert not MediaBlob.objects.filter(sha256=first.content_hash).exists()
+        assert not any(storage.exists(name) for name in names)
+
+    def test_dedupe_media_command_links_existing_copies(self, django_capture_on_commit_callbacks):
+        from django.core.files.base import ContentFile
+        from django.core.management import call_command
+
+        data = self.photo_bytes((90, 90, 90))
+        legacy = []
+        for report in self.reports:
+            media = Media(report=report, media_type="IMAGE")
+            media.file.save("legacy.jpg", ContentFile(data), save=False)
+            media.save()
+            legacy.append(media)
+        # Blob öncesi işlenmiş kayıtlar: DONE, özet yok, her biri kendi dosyasında
+        assert legacy[0].processing_state == Media.PROCESSING_DONE
+        assert legacy[0].file.name != legacy[1].file.name
+
+        out = StringIO()
+        call_command("dedupe_media", dry_run=True, stdout=out)
+        assert "1 tekrar eden" in out.getvalue()
+        assert not MediaBlob.objects.exists()
+
+        original_names = [media.file.name for media in legacy]
+        with django_capture_on_commit_callbacks(execute=True):
+            call_command("dedupe_media", stdout=StringIO())
+        for media in legacy:
+            media.refresh_from_db()
+        # İlk kopya yerinde blob olarak benimsenir, ikincisi ona bağlanıp silinir
+        assert legacy[0].file.name == legacy[1].file.name == original_names[0]
+        assert not legacy[0].file.storage.exists(original_names[1])
+        assert MediaBlob.objects.get(sha256=legacy[0].content_hash).ref_count == 2
+        assert Media.objects.filter(content_hash__isnull=True).count() == 0
+
+
+class TestPerceptualHash:
+    def test_multi_index_candidates_cover_max_distance(self):
+        from reports.duplicates import candidate_q, chunks, neighbours
+
+        value = 0x0123456789ABCDEF
+        assert len(neighbours(0, 1)) == 17
+        condition = candidate_q(value, 7)
+        # Her parçada 1 bitlik yarıçap: 7 bitlik farkta en az bir parça en fazla 1 bit farklıdır
+        changed = value ^ 0b1 ^ (0b11 << 16) ^ (0b11 << 32) ^ (0b11 << 48)
+        probes = [child[1] for child in condition.children]
+        assert any(part in probe for part, probe in zip(chunks(changed), probes))
+
+    def test_perceptual_hash_round_trips_through_chunks(self):
+        media = Media()
+        media.perceptual_hash = 0xFEDCBA9876543210
+        assert (media.dhash_0, media.dhash_3) == (0xFEDC, 0x3210)
+        assert media.perceptual_hash == 0xFEDCBA9876543210
+        media.perceptual_hash = None
+        assert media.perceptual_hash is None
+
+
+@pytest.mark.django_db(transaction=True)
+class TestMediaProcessingPool:
+    def test_batch_is_optimized_in_process_pool(self, settings):
+        from io import BytesIO
+        from PIL import Image
+        from reports.media_processing import process_pending, process_pool
+
+        settings.MEDIA_PROCESSING_MODE = "queue"
+        user = User.objects.create_user(email="pool@example.com", password="Pass123!", username="pooluser")
+        report = Report.objects.create(
+            title="Pool", description="Test", reporter=user, category=Category.objects.create(name="Pool")
+        )
+        for index in range(3):
+            buffer = BytesIO()
+            Image.new("RGB", (1600, 1200), (index * 40, 0, 0)).save(buffer, format="JPEG")
+            Media.objects.create(
+                report=report,
+                file=SimpleUploadedFile(f"pool{index}.jpg", buffer.getvalue(), content_type="image/jpeg"),
+                media_type="IMAGE",
+            )
+        assert Media.objects.filter(processing_state=Media.PROCESSING_PENDING).count() == 3
+
+        pool = process_pool(2)
+        try:
+            assert process_pending(pool=pool) == 3
+        finally:
+            pool.shutdown()
+
+        for media in Media.objects.filter(report=report):
+            assert media.processing_state == Media.PROCESSING_DONE
+            with media.file.open("rb") as fh, Image.open(fh) as img:
+                assert img.size == (1024, 768)
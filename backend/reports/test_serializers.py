@@ -118,6 +118,65 @@ class TestReportListSerializer:
         assert data["first_media_url"] is not None
         assert data["media_count"] == 1
 
+    def test_report_list_serializer_variant_urls(self):
+        media = Media.objects.create(
+            report=self.report,
+            file=SimpleUploadedFile("cover.jpg", b"fake image content", content_type="image/jpeg"),
+            media_type="IMAGE"
+        )
+        request = self.factory.get("/")
+        data = ReportListSerializer(instance=self.report, context={"request": request}).data
+        # Varyantlar henüz üretilmediyse dosyanın kendisine düşülür
+        assert data["first_media_thumb_url"] == data["first_media_url"]
+
+        media.variants = {"thumb": {"name": "reports/cover_thumb.jpg", "width": 160, "height": 120}}
+        media.save()
+        self.report.refresh_from_db()
+        data = ReportListSerializer(instance=self.report, context={"request": request}).data
+        assert data["first_media_thumb_url"] == "http://testserver/media/reports/cover_thumb.jpg"
+        assert data["first_media_card_url"] == data["first_media_url"]
+
+        variants = MediaSerializer(instance=media, context={"request": request}).data["variants"]
+        assert variants == {
+            "full": data["first_media_url"],
+            "card": data["first_media_url"],
+            "thumb": "http://testserver/media/reports/cover_thumb.jpg",
+            "fallback": data["first_media_url"],
+        }
+
+    def test_media_urls_are_composed_without_storage_calls(self, settings, monkeypatch):
+        from django.core.files.storage import FileSystemStorage
+
+        media = Media.objects.create(
+            report=self.report,
+            file=SimpleUploadedFile("kapak foto.jpg", b"fake image content", content_type="image/jpeg"),
+            media_type="IMAGE"
+        )
+        media.variants = {"thumb": {"name": "reports/blobs/ab/cd/abcd_thumb.jpg", "width": 160, "height": 120}}
+        media.save()
+        assert media.file_path == media.file.name
+
+        def no_storage_url(*args, **kwargs):
+            raise AssertionError("storage.url çağrılmamalı")
+
+        monkeypatch.setattr(FileSystemStorage, "url", no_storage_url)
+        request = self.factory.get("/")
+        data = MediaSerializer(instance=media, context={"request": request}).data
+        assert data["file"] == f"http://testserver/media/{media.file_path.replace(' ', '%20')}"
+
+        settings.USE_R2 = True
+        settings.R2_CUSTOM_DOMAIN = "cdn.example.com"
+        data = MediaSerializer(instance=media, context={"request": request}).data
+        assert data["file"].startswith("https://cdn.example.com/reports/")
+        assert data["variants"]["thumb"] == "https://cdn.example.com/reports/blobs/ab/cd/abcd_thumb.jpg"
+
+        settings.R2_CUSTOM_DOMAIN = ""
+        settings.MEDIA_URL = "https://bucket.account.r2.cloudflarestorage.com/"
+        data = ReportListSerializer(instance=self.report, context={"request": request}).data
+        assert data["first_media_thumb_url"] == (
+            "https://bucket.account.r2.cloudflarestorage.com/reports/blobs/ab/cd/abcd_thumb.jpg"
+        )
+
     def test_report_list_serializer_first_media_url_without_media(self):
         serializer = ReportListSerializer(instance=self.report)
         data = serializer.data
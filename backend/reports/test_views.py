@@ -1,8 +1,14 @@
+import os
 import pytest
+from datetime import timedelta
 from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework.test import APIClient
-from reports.models import Category, Report
+from reports.models import Category, Comment, Media, MediaBlob, Report, ReportDailyStat
 from users.models import Team
 
 User = get_user_model()
@@ -218,4 +224,1335 @@ class TestCategoryViewSetEdgeCases:
     def test_category_list_unauthenticated(self):
         res = self.client.get("/api/categories/")
         
-        assert res.status_code == 401
\ No newline at end of file
+        assert res.status_code == 401
+
+
+@pytest.mark.django_db
+class TestReportKeysetPagination:
+    def setup_method(self):
+        self.client = APIClient()
+        self.operator = User.objects.create_user(
+            email="pageop@example.com",
+            password="Pass123!",
+            username="pageop",
+            role="OPERATOR"
+        )
+        self.category = Category.objects.create(name="Paging")
+        self.other_category = Category.objects.create(name="Other Paging")
+        self.reports = [
+            Report.objects.create(
+                title=f"Report {i}",
+                description="Test",
+                reporter=self.operator,
+                category=self.category if i % 2 == 0 else self.other_category,
+                status="COZULDU" if i % 3 == 0 else "BEKLEMEDE"
+            )
+            for i in range(7)
+        ]
+        # Aynı created_at değerine sahip kayıtlar id ile ayrışmalı
+        Report.objects.filter(id__in=[r.id for r in self.reports[2:5]]).update(
+            created_at=self.reports[3].created_at
+        )
+
+        res = self.client.post(
+            reverse("auth-login"),
+            {"email": "pageop@example.com", "password": "Pass123!"},
+            format="json"
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+
+    def collect_pages(self, url):
+        ids = []
+        pages = 0
+        while url:
+            res = self.client.get(url)
+            assert res.status_code == 200
+            ids.extend(item["id"] for item in res.data["results"])
+            url = res.data["next"]
+            pages += 1
+        return ids, pages
+
+    def test_list_without_pagination_params_returns_plain_list(self):
+        res = self.client.get("/api/reports/")
+
+        assert res.status_code == 200
+        assert isinstance(res.data, list)
+        assert len(res.data) == 7
+
+    def test_cursor_pages_cover_all_reports_once_in_order(self):
+        expected = list(
+            Report.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+        ids, pages = self.collect_pages("/api/reports/?page_size=3")
+
+        assert ids == expected
+        assert pages == 3
+
+    def test_previous_cursor_returns_previous_page(self):
+        first = self.client.get("/api/reports/?page_size=3")
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+
+        assert [item["id"] for item in back.data["results"]] == [
+            item["id"] for item in first.data["results"]
+        ]
+        assert first.data["previous"] is None
+
+    def test_cursor_respects_filters_and_ordering(self):
+        expected = list(
+            Report.objects.filter(status="BEKLEMEDE")
+            .order_by("created_at", "id")
+            .values_list("id", flat=True)
+        )
+
+        ids, _ = self.collect_pages("/api/reports/?page_size=2&status=BEKLEMEDE&ordering=created_at")
+
+        assert ids == expected
+
+    def test_include_total_returns_count(self):
+        res = self.client.get(f"/api/reports/?page_size=2&include_total=true&category={self.category.id}")
+
+        assert res.status_code == 200
+        assert res.data["count"] == 4
+        assert len(res.data["results"]) == 2
+
+    def test_invalid_cursor_returns_404(self):
+        res = self.client.get("/api/reports/?cursor=bozuk")
+
+        assert res.status_code == 404
+
+
+@pytest.mark.django_db
+class TestReportListQueryCount:
+    def setup_method(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            email="qcadmin@example.com",
+            password="AdminPass123!",
+            username="qcadmin"
+        )
+        self.team = Team.objects.create(name="Query Team", created_by=self.admin)
+        self.team.members.add(self.admin)
+        self.category = Category.objects.create(name="Query Count")
+        self.reporter = User.objects.create_user(
+            email="qcreporter@example.com",
+            password="Pass123!",
+            username="qcreporter",
+            team=self.team
+        )
+
+        res = self.client.post(
+            reverse("auth-login"),
+            {"email": "qcadmin@example.com", "password": "AdminPass123!"},
+            format="json"
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+
+    def create_reports(self, count):
+        for i in range(count):
+            report = Report.objects.create(
+                title=f"Query {i}",
+                description="Test",
+                reporter=self.reporter,
+                category=self.category,
+                assigned_team=self.team
+            )
+            Media.objects.create(
+                report=report,
+                file=SimpleUploadedFile(f"q{i}.jpg", b"fake image content", content_type="image/jpeg"),
+                media_type="IMAGE"
+            )
+            Comment.objects.create(report=report, user=self.admin, content="Yorum")
+            Comment.objects.create(report=report, user=self.reporter, content="Yorum 2")
+
+    def count_list_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get("/api/reports/")
+        assert res.status_code == 200
+        return len(ctx.captured_queries), res.data
+
+    def test_list_query_count_is_constant(self):
+        self.create_reports(2)
+        small_count, _ = self.count_list_queries()
+
+        self.create_reports(8)
+        large_count, data = self.count_list_queries()
+
+        assert len(data) == 10
+        assert large_count == small_count
+        # JWT kullanıcı sorgusu + liste + takım üyeleri prefetch
+        assert large_count <= 3
+
+    def test_list_uses_annotated_values(self):
+        self.create_reports(1)
+        _, data = self.count_list_queries()
+
+        assert data[0]["media_count"] == 1
+        assert data[0]["comment_count"] == 2
+        assert data[0]["first_media_url"].startswith("http://testserver/media/reports/")
+        assert data[0]["reporter"]["team_name"] == "Query Team"
+        assert data[0]["assigned_team"]["members_count"] == 1
+
+
+@pytest.mark.django_db
+class TestReportStatsView:
+    def setup_method(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_superuser(
+            email="statsadmin@example.com",
+            password="AdminPass123!",
+            username="statsadmin"
+        )
+        self.team = Team.objects.create(name="Stats Team", created_by=self.admin)
+        self.team_user = User.objects.create_user(
+            email="statsteam@example.com",
+            password="Pass123!",
+            username="statsteam",
+            role="EKIP",
+            team=self.team
+        )
+        self.citizen = User.objects.create_user(
+            email="statscitizen@example.com",
+            password="Pass123!",
+            username="statscitizen"
+        )
+        self.road = Category.objects.create(name="Yol")
+        self.light = Category.objects.create(name="Aydınlatma")
+
+        Report.objects.create(title="A", description="d", reporter=self.citizen, category=self.road,
+                              status="BEKLEMEDE", priority="ACIL", assigned_team=self.team)
+        Report.objects.create(title="B", description="d", reporter=self.citizen, category=self.road,
+                              status="COZULDU", priority="ORTA")
+        Report.objects.create(title="C", description="d", reporter=self.admin, category=self.light,
+                              status="BEKLEMEDE", priority="ORTA")
+
+    def login(self, email, password="Pass123!"):
+        res = self.client.post(reverse("auth-login"), {"email": email, "password": password}, format="json")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+
+    def test_operator_stats_grouped_counts(self):
+        self.login("statsadmin@example.com", "AdminPass123!")
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get("/api/reports/stats/")
+
+        assert res.status_code == 200
+        assert res.data["total"] == 3
+        assert {row["status"]: row["count"] for row in res.data["by_status"]} == {
+            "BEKLEMEDE": 2, "COZULDU": 1
+        }
+        assert {row["priority"]: row["count"] for row in res.data["by_priority"]} == {
+            "ORTA": 2, "ACIL": 1
+        }
+        assert res.data["by_category"][0] == {"id": self.road.id, "name": "Yol", "count": 2}
+        assert {row["id"]: row["count"] for row in res.data["by_team"]} == {None: 2, self.team.id: 1}
+        assert sum(row["count"] for row in res.data["timeline"]) == 3
+        # JWT kullanıcı sorgusu + iki kaynak (ön-toplanmış tablo, bugün) için beşer gruplama
+        assert len(ctx.captured_queries) == 11
+
+    def test_stats_respect_role_scope(self):
+        self.login("statsteam@example.com")
+        res = self.client.get("/api/reports/stats/")
+        assert res.data["total"] == 1
+
+        self.login("statscitizen@example.com")
+        res = self.client.get("/api/reports/stats/")
+        assert res.data["total"] == 2
+
+    def test_stats_respect_filters_and_bucket(self):
+        self.login("statsadmin@example.com", "AdminPass123!")
+
+        res = self.client.get(f"/api/reports/stats/?category={self.road.id}&bucket=month")
+
+        assert res.status_code == 200
+        assert res.data["total"] == 2
+        assert res.data["bucket"] == "month"
+        assert len(res.data["timeline"]) == 1
+
+    def test_stats_invalid_bucket(self):
+        self.login("statsadmin@example.com", "AdminPass123!")
+
+        res = self.client.get("/api/reports/stats/?bucket=year")
+
+        assert res.status_code == 400
+
+    def move_reports_to_past(self, days):
+        from django.core.management import call_command
+        from io import StringIO
+
+        Report.objects.update(created_at=timezone.now() - timedelta(days=days))
+        call_command("rebuild_report_rollup", stdout=StringIO())
+
+    def test_stats_read_rollup_for_past_days(self):
+        self.move_reports_to_past(3)
+        Report.objects.create(title="Today", description="d", reporter=self.citizen, category=self.light,
+                              status="INCELENIYOR")
+        # Ön-toplanmış tablo geçmiş günler için kaynak olmalı
+        ReportDailyStat.objects.filter(status="COZULDU").update(count=5)
+        self.login("statsadmin@example.com", "AdminPass123!")
+
+        res = self.client.get("/api/reports/stats/")
+
+        assert res.status_code == 200
+        assert res.data["total"] == 8
+        assert {row["status"]: row["count"] for row in res.data["by_status"]} == {
+            "BEKLEMEDE": 2, "COZULDU": 5, "INCELENIYOR": 1
+        }
+        assert len(res.data["timeline"]) == 2
+
+    def test_stats_fall_back_to_live_table_when_not_expressible(self):
+        self.move_reports_to_past(3)
+        ReportDailyStat.objects.update(count=100)
+        self.login("statsadmin@example.com", "AdminPass123!")
+
+        res = self.client.get("/api/reports/stats/?search=statsadmin")
+        assert res.data["total"] == 1
+
+        self.login("statscitizen@example.com")
+        res = self.client.get("/api/reports/stats/")
+        assert res.data["total"] == 2
+
+    def test_stats_rollup_respects_team_scope_and_filters(self):
+        self.move_reports_to_past(3)
+        self.login("statsteam@example.com")
+        res = self.client.get("/api/reports/stats/")
+        assert res.data["total"] == 1
+
+        self.login("statsadmin@example.com", "AdminPass123!")
+        res = self.client.get("/api/reports/stats/?status__in=COZULDU,REDDEDILDI&priority=ORTA")
+        assert res.data["total"] == 1
+
+
+@pytest.mark.django_db
+class TestReportSearch:
+    def setup_method(self):
+        self.client = APIClient()
+        self.operator = User.objects.create_user(
+            email="searchop@example.com",
+            password="Pass123!",
+            username="searchop",
+            role="OPERATOR"
+        )
+        self.category = Category.objects.create(name="Yol Bakım")
+        Report.objects.create(title="Kaldırım çökmüş", description="Çukur var", reporter=self.operator,
+                              category=self.category)
+        Report.objects.create(title="Lamba yanmıyor", description="Sokak karanlık", reporter=self.operator,
+                              category=Category.objects.create(name="Aydınlatma"))
+
+        res = self.client.post(
+            reverse("auth-login"),
+            {"email": "searchop@example.com", "password": "Pass123!"},
+            format="json"
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+
+    def test_search_falls_back_to_icontains_on_sqlite(self):
+        res = self.client.get("/api/reports/?search=lamba")
+        assert [item["title"] for item in res.data] == ["Lamba yanmıyor"]
+
+        res = self.client.get("/api/reports/?search=bakım")
+        assert [item["title"] for item in res.data] == ["Kaldırım çökmüş"]
+
+    def test_search_vector_update_is_noop_on_sqlite(self):
+        from reports.search import update_search_vectors
+
+        assert update_search_vectors() == 0
+        assert Report.objects.filter(search_vector__isnull=False).count() == 0
+
+    def test_ordering_filter_ranks_search_results_by_default(self):
+        from django.db.models import FloatField, Value
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+        from reports.filters import ReportOrderingFilter
+        from reports.views import ReportListCreateView
+
+        view = ReportListCreateView()
+        ranked = Report.objects.annotate(search_rank=Value(1.0, output_field=FloatField()))
+        backend = ReportOrderingFilter()
+
+        request = Request(APIRequestFactory().get("/api/reports/"))
+        assert backend.get_ordering(request, ranked, view) == ["-search_rank", "-created_at"]
+
+        request = Request(APIRequestFactory().get("/api/reports/?ordering=priority"))
+        assert backend.get_ordering(request, ranked, view) == ["priority"]
+
+
+@pytest.mark.django_db
+class TestReportSuggest:
+    def setup_method(self):
+        from reports import suggest
+
+        suggest.reset_index()
+        self.client = APIClient()
+        self.citizen = User.objects.create_user(
+            email="suggestcitizen@example.com",
+            password="Pass123!",
+            username="suggestcitizen"
+        )
+        self.operator = User.objects.create_user(
+            email="suggestop@example.com",
+            password="Pass123!",
+            username="suggestop",
+            role="OPERATOR"
+        )
+        self.category = Category.objects.create(name="Yol Bakım")
+        Report.objects.create(title="Kaldırım çökmüş", description="Test", reporter=self.citizen,
+                              category=self.category, location="Atatürk Caddesi")
+        Report.objects.create(title="Lamba yanmıyor", description="Test", reporter=self.operator,
+                              category=self.category, location="İnönü Sokak")
+
+    def teardown_method(self):
+        from reports import suggest
+
+        suggest.reset_index()
+
+    def login(self, email):
+        res = self.client.post(reverse("auth-login"), {"email": email, "password": "Pass123!"}, format="json")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+
+    def test_typo_and_ascii_queries_match(self):
+        self.login("suggestop@example.com")
+
+        res = self.client.get("/api/reports/suggest/?q=kaldirm")
+        assert res.status_code == 200
+        assert res.data[0] == {"text": "Kaldırım çökmüş", "field": "title", "score": res.data[0]["score"]}
+
+        res = self.client.get("/api/reports/suggest/?q=ataturk")
+        assert res.data[0]["text"] == "Atatürk Caddesi"
+        assert res.data[0]["field"] == "location"
+
+    def test_short_query_returns_empty_list(self):
+        self.login("suggestop@example.com")
+        res = self.client.get("/api/reports/suggest/?q=k")
+        assert res.status_code == 200
+        assert res.data == []
+
+    def test_suggestions_respect_role_scope(self):
+        self.login("suggestcitizen@example.com")
+        res = self.client.get("/api/reports/suggest/?q=lamba")
+        assert res.data == []
+
+        res = self.client.get("/api/reports/suggest/?q=kaldırım")
+        assert [item["text"] for item in res.data] == ["Kaldırım çökmüş"]
+
+    def test_index_follows_report_changes(self):
+        self.login("suggestop@example.com")
+        assert self.client.get("/api/reports/suggest/?q=çukur").data == []
+
+        report = Report.objects.create(title="Çukur büyüyor", description="Test", reporter=self.operator,
+                                       category=self.category)
+        assert self.client.get("/api/reports/suggest/?q=cukur").data[0]["text"] == "Çukur büyüyor"
+
+        report.delete()
+        assert self.client.get("/api/reports/suggest/?q=cukur").data == []
+
+    def test_search_while_indexing_in_another_thread(self):
+        import threading
+
+        from reports.suggest import NgramIndex
+
+        index = NgramIndex()
+        index.add(1, "title", "Kaldırım çökmüş")
+        done = threading.Event()
+
+        def writer():
+            for report_id in range(2, 20000):
+                index.add(report_id, "title", f"Kaldırım {report_id}")
+            done.set()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        while not done.is_set():
+            assert index.search("kaldirim")
+        thread.join()
+
+
+@pytest.mark.django_db
+class TestReportGeoFilters:
+    def setup_method(self):
+        self.client = APIClient()
+        self.operator = User.objects.create_user(
+            email="geoop@example.com",
+            password="Pass123!",
+            username="geoop",
+            role="OPERATOR"
+        )
+        self.category = Category.objects.create(name="Geo")
+        # Taksim'e ~0 m, ~400 m ve ~5 km uzaklıkta bildirimler
+        for title, lat, lon in [
+            ("Taksim", "41.036900", "28.985000"),
+            ("Yakın", "41.040500", "28.985000"),
+            ("Kadıköy", "40.990000", "29.025000"),
+        ]:
+            Report.objects.create(title=title, description="Test", reporter=self.operator,
+                                  category=self.category, latitude=lat, longitude=lon)
+        Report.objects.create(title="Konumsuz", description="Test", reporter=self.operator,
+                              category=self.category)
+
+        res = self.client.post(
+            reverse("auth-login"),
+            {"email": "geoop@example.com", "password": "Pass123!"},
+            format="json"
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+
+    def titles(self, url):
+        res = self.client.get(url)
+        assert res.status_code == 200
+        return sorted(item["title"] for item in res.data)
+
+    def test_bbox_filter(self):
+        assert self.titles("/api/reports/?bbox=28.98,41.03,28.99,41.05") == ["Taksim", "Yakın"]
+        assert self.titles("/api/reports/?bbox=28.9,40.9,29.1,41.1") == ["Kadıköy", "Taksim", "Yakın"]
+
+    def test_radius_filter_is_exact(self):
+        assert self.titles("/api/reports/?near=41.0369,28.985&radius_m=350") == ["Taksim"]
+        assert self.titles("/api/reports/?near=41.0369,28.985&radius_m=450") == ["Taksim", "Yakın"]
+        assert self.titles("/api/reports/?near=41.0369,28.985&radius_m=10000") == ["Kadıköy", "Taksim", "Yakın"]
+
+    def test_invalid_geo_params(self):
+        assert self.client.get("/api/reports/?bbox=1,2,3").status_code == 400
+        assert self.client.get("/api/reports/?near=41,29").status_code == 400
+        assert self.client.get("/api/reports/?near=41,29&radius_m=-5").status_code == 400
+        assert self.client.get("/api/reports/?near=100,29&radius_m=5").status_code == 400
+
+
+@pytest.mark.django_db
+class TestReportClusters:
+    def setup_method(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.client = APIClient()
+        self.operator = User.objects.create_user(
+            email="clusterop@example.com",
+            password="Pass123!",
+            username="clusterop",
+            role="OPERATOR"
+        )
+        self.citizen = User.objects.create_user(
+            email="clustercitizen@example.com",
+            password="Pass123!",
+            username="clustercitizen"
+        )
+        self.category = Category.objects.create(name="Cluster")
+        for lat, lon, status in [
+            ("41.036900", "28.985000", "BEKLEMEDE"),
+            ("41.036950", "28.985050", "COZULDU"),
+            ("40.990000", "29.025000", "BEKLEMEDE"),
+        ]:
+            Report.objects.create(title="Pin", description="Test", reporter=self.operator,
+                                  category=self.category, latitude=lat, longitude=lon, status=status)
+        Report.objects.create(title="Vatandaş", description="Test", reporter=self.citizen,
+                              category=self.category, latitude="41.036900", longitude="28.985000")
+        self.url = "/api/reports/clusters/?bbox=28.9,40.9,29.1,41.1"
+
+    def login(self, email):
+        res = self.client.post(reverse("auth-login"), {"email": email, "password": "Pass123!"}, format="json")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+
+    def test_clusters_group_by_zoom(self):
+        self.login("clusterop@example.com")
+
+        res = self.client.get(f"{self.url}&zoom=4")
+        assert res.status_code == 200
+        assert res.data["precision"] == 2
+        assert [cluster["count"] for cluster in res.data["clusters"]] == [4]
+        assert res.data["clusters"][0]["status_counts"] == {"BEKLEMEDE": 3, "COZULDU": 1}
+
+        res = self.client.get(f"{self.url}&zoom=16")
+        assert sorted(cluster["count"] for cluster in res.data["clusters"]) == [1, 3]
+        taksim = max(res.data["clusters"], key=lambda cluster: cluster["count"])
+        assert abs(taksim["latitude"] - 41.036917) < 1e-5
+
+    def test_clusters_respect_role_scope(self):
+        self.login("clustercitizen@example.com")
+        res = self.client.get(f"{self.url}&zoom=4")
+        assert [cluster["count"] for cluster in res.data["clusters"]] == [1]
+
+    def test_clusters_are_cached_and_invalidated(self, django_capture_on_commit_callbacks):
+        self.login("clusterop@example.com")
+        self.client.get(f"{self.url}&zoom=10")
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(f"{self.url}&zoom=10")
+        assert not any("GROUP BY" in query["sql"] for query in ctx.captured_queries)
+        assert sum(cluster["count"] for cluster in res.data["clusters"]) == 4
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Report.objects.create(title="Yeni", description="Test", reporter=self.operator,
+                                  category=self.category, latitude="41.036900", longitude="28.985000")
+        res = self.client.get(f"{self.url}&zoom=10")
+        assert sum(cluster["count"] for cluster in res.data["clusters"]) == 5
+
+    def test_process_local_cache_bounds_staleness(self, settings, tmp_path):
+        from reports import clusters, tiles
+
+        # LocMemCache'te diğer işçilerin geçersiz kılmaları görülmez; sürümler de süresiz tutulmaz
+        settings.REPORT_MAP_LOCAL_CACHE_TIMEOUT = 30
+        assert not clusters.cache_is_shared()
+        assert (clusters.cache_timeout(), tiles.cache_timeout(), clusters.local_timeout(None)) == (30, 30, 30)
+
+        settings.CACHES = {
+            "default": {
+                "BACKEND": "cozum_var_backend.sqlite_cache.SQLiteCache",
+                "LOCATION": str(tmp_path / "cache.sqlite3"),
+            }
+        }
+        assert clusters.cache_is_shared()
+        assert (clusters.cache_timeout(), tiles.cache_timeout(), clusters.local_timeout(None)) == (600, 3600, None)
+
+    def test_invalid_cluster_params(self):
+        self.login("clusterop@example.com")
+        assert self.client.get("/api/reports/clusters/?zoom=3").status_code == 400
+        assert self.client.get(f"{self.url}&zoom=99").status_code == 400
+        assert self.client.get(f"{self.url}&zoom=x").status_code == 400
+
+
+def decode_mvt_points(body):
+    """Testler için küçük MVT çözücü: [(x, y, {öznitelikler}), ...]"""
+
+    def fields(buf):
+        pos = 0
+        while pos < len(buf):
+            key, pos = varint(buf, pos)
+            field, wire = key >> 3, key & 7
+            if wire == 0:
+                value, pos = varint(buf, pos)
+            elif wire == 1:
+                value, pos = buf[pos:pos + 8], pos + 8
+            else:
+                length, pos = varint(buf, pos)
+                value, pos = buf[pos:pos + length], pos + length
+            yield field, value
+
+    def varint(buf, pos):
+        result = shift = 0
+        while True:
+            byte = buf[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                return result, pos
+
+    def packed(buf):
+        values, pos = [], 0
+        while pos < len(buf):
+            value, pos = varint(buf, pos)
+            values.append(value)
+        return values
+
+    def unzigzag(value):
+        return (value >> 1) ^ -(value & 1)
+
+    points = []
+    for _, layer in fields(body):
+        keys, values, features = [], [], []
+        for field, value in fields(layer):
+            if field == 2:
+                features.append(dict(fields(value)))
+            elif field == 3:
+                keys.append(value.decode())
+            elif field == 4:
+                (kind, raw), = fields(value)
+                values.append(raw.decode() if kind == 1 else raw)
+        for feature in features:
+            tags = packed(feature.get(2, b""))
+            _, x, y = packed(feature[4])
+            props = {keys[tags[i]]: values[tags[i + 1]] for i in range(0, len(tags), 2)}
+            points.append((unzigzag(x), unzigzag(y), props))
+    return points
+
+
+@pytest.mark.django_db
+class TestReportTiles:
+    # Taksim'i içeren z=12 karosu
+    tile_url = "/api/reports/tiles/12/2377/1535.mvt"
+
+    def setup_method(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.client = APIClient()
+        self.operator = User.objects.create_user(
+            email="tileop@example.com",
+            password="Pass123!",
+            username="tileop",
+            role="OPERATOR"
+        )
+        self.category = Category.objects.create(name="Tile")
+        for lat, lon in [("41.036900", "28.985000"), ("41.036950", "28.985050")]:
+            self.create_report(lat, lon)
+        res = self.client.post(
+            reverse("auth-login"),
+            {"email": "tileop@example.com", "password": "Pass123!"},
+            format="json"
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+
+    def create_report(self, lat, lon):
+        return Report.objects.create(title="Pin", description="Test", reporter=self.operator,
+                                     category=self.category, latitude=lat, longitude=lon)
+
+    def test_tile_contains_density_points(self):
+        res = self.client.get(self.tile_url)
+        assert res.status_code == 200
+        assert res["Content-Type"] == "application/vnd.mapbox-vector-tile"
+        points = decode_mvt_points(res.content)
+        assert sum(props["count"] for _, _, props in points) == 2
+        assert all(0 <= x < 4096 and 0 <= y < 4096 for x, y, _ in points)
+
+    def test_empty_tile(self):
+        res = self.client.get("/api/reports/tiles/12/0/0.mvt")
+        assert res.status_code == 200
+        assert res.content == b""
+
+    def test_etag_revalidation_and_incremental_invalidation(self, django_capture_on_commit_callbacks):
+        etag = self.client.get(self.tile_url)["ETag"]
+
+        res = self.client.get(self.tile_url, HTTP_IF_NONE_MATCH=etag)
+        assert res.status_code == 304
+
+        # Başka bir şehirdeki bildirim bu karoyu geçersiz kılmaz
+        with django_capture_on_commit_callbacks(execute=True):
+            self.create_report("39.920000", "32.850000")
+        assert self.client.get(self.tile_url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.create_report("41.037000", "28.985100")
+        res = self.client.get(self.tile_url, HTTP_IF_NONE_MATCH=etag)
+        assert res.status_code == 200
+        assert res["ETag"] != etag
+        assert sum(props["count"] for _, _, props in decode_mvt_points(res.content)) == 3
+
+    def test_invalid_tile_coordinates(self):
+        assert self.client.get("/api/reports/tiles/2/4/0.mvt").status_code == 404
+        assert self.client.get("/api/reports/tiles/30/0/0.mvt").status_code == 404
+
+
+@pytest.mark.django_db
+class TestReportCreateMediaUpload:
+    def setup_method(self):
+        from django.core.cache import cache
+
+        # Bildirim oluşturma hız sınırı sayaçları önbellekte; testler arasında sıfırla
+        cache.clear()
+        self.client = APIClient()
+        self.citizen = User.objects.create_user(
+            email="uploadcitizen@example.com",
+            password="Pass123!",
+            username="uploadcitizen"
+        )
+        self.category = Category.objects.create(name="Upload")
+        res = self.client.post(
+            reverse("auth-login"),
+            {"email": "uploadcitizen@example.com", "password": "Pass123!"},
+            format="json"
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+
+    def image(self, name):
+        from io import BytesIO
+        from PIL import Image
+
+        buffer = BytesIO()
+        Image.new("RGB", (64, 64), (10, 120, 10)).save(buffer, format="PNG")
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+    def post(self, names):
+        return self.client.post(
+            "/api/reports/",
+            {
+                "title": "Çoklu",
+                "description": "Çok fotoğraflı bildirim",
+                "category": self.category.id,
+                "media_files": [self.image(name) for name in names],
+            },
+            format="multipart",
+        )
+
+    def test_multiple_files_are_stored_and_queued(self):
+        res = self.post(["a.png", "b.png", "c.png"])
+        assert res.status_code == 201, res.data
+
+        medias = list(Media.objects.filter(report_id=res.data["id"]).order_by("id"))
+        assert len(medias) == 3
+        for media in medias:
+            assert media.processing_state == Media.PROCESSING_PENDING
+            assert media.file_size > 0
+            assert media.file.storage.exists(media.file.name)
+        assert Report.objects.get(pk=res.data["id"]).media_count == 3
+
+    def test_large_upload_is_spooled_to_disk(self, settings, monkeypatch):
+        from io import BytesIO
+        from PIL import Image
+        from django.core.files.uploadedfile import TemporaryUploadedFile
+        from reports import serializers
+
+        settings.FILE_UPLOAD_MAX_MEMORY_SIZE = 1024
+        buffer = BytesIO()
+        Image.effect_noise((128, 128), 60).convert("RGB").save(buffer, format="PNG")
+        assert len(buffer.getvalue()) > 1024
+        received = []
+        original_store = serializers.store_uploads
+
+        def recording_store(medias):
+            received.extend(type(media.file.file) for media in medias)
+            return original_store(medias)
+
+        monkeypatch.setattr(serializers, "store_uploads", recording_store)
+        res = self.client.post(
+            "/api/reports/",
+            {
+                "title": "Büyük",
+                "description": "Eşiği aşan fotoğraf",
+                "category": self.category.id,
+                "media_files": [SimpleUploadedFile("big.png", buffer.getvalue(), content_type="image/png")],
+            },
+            format="multipart",
+        )
+        assert res.status_code == 201, res.data
+        assert received == [TemporaryUploadedFile]
+
+    def test_duplicate_upload_skips_storage_put(self, settings, monkeypatch, django_capture_on_commit_callbacks):
+        from django.core.files.storage import FileSystemStorage
+
+        settings.MEDIA_PROCESSING_MODE = "sync"
+        with django_capture_on_commit_callbacks(execute=True):
+            first = self.post(["same.png"])
+        first_media = Media.objects.get(report_id=first.data["id"])
+        assert first_media.processing_state == Media.PROCESSING_DONE
+        assert first_media.content_hash and first_media.source_hash
+
+        saved = []
+        original_save = FileSystemStorage.save
+
+        def recording_save(storage, name, content, max_length=None):
+            saved.append(name)
+            return original_save(storage, name, content, max_length=max_length)
+
+        monkeypatch.setattr(FileSystemStorage, "save", recording_save)
+        with django_capture_on_commit_callbacks(execute=True):
+            second = self.post(["same-again.png"])
+
+        assert second.status_code == 201, second.data
+        # Aynı orijinal: ne depo yazması ne de kodlama; kayıt doğrudan paylaşılan içeriğe bağlanır
+        assert saved == []
+        media = Media.objects.get(report_id=second.data["id"])
+        assert media.processing_state == Media.PROCESSING_DONE
+        assert media.file.name == first_media.file.name
+        assert media.variants == first_media.variants
+        assert MediaBlob.objects.get(sha256=media.content_hash).ref_count == 2
+
+    def test_pixel_budget_rejects_oversized_images(self, settings):
+        settings.MEDIA_MAX_IMAGE_PIXELS = 1000
+        res = self.post(["huge.png"])
+
+        assert res.status_code == 400
+        assert "media_files" in res.data
+        assert Report.objects.count() == 0
+
+    def test_failed_upload_rolls_back_and_cleans_storage(self, monkeypatch):
+        from django.core.files.storage import FileSystemStorage
+
+        saved = []
+        original_save = FileSystemStorage.save
+
+        def flaky_save(storage, name, content, max_length=None):
+            if "broken" in name:
+                raise OSError("depo erişilemedi")
+            stored = original_save(storage, name, content, max_length=max_length)
+            saved.append((storage, stored))
+            return stored
+
+        monkeypatch.setattr(FileSystemStorage, "save", flaky_save)
+        res = self.post(["ok1.png", "broken.png", "ok2.png"])
+
+        assert res.status_code == 400
+        assert Report.objects.count() == 0
+        assert Media.objects.count() == 0
+        assert saved
+        assert not any(storage.exists(name) for storage, name in saved)
+
+    def test_failed_media_row_cleans_uploaded_objects(self, monkeypatch):
+        saved = []
+        original_save = Media.save
+
+        def failing_save(media, *args, **kwargs):
+            saved.append(media.file.name)
+            if len(saved) == 2:
+                from django.db import IntegrityError
+
+                raise IntegrityError("simülasyon")
+            return original_save(media, *args, **kwargs)
+
+        monkeypatch.setattr(Media, "save", failing_save)
+        res = self.post(["x.png", "y.png"])
+
+        assert res.status_code == 400
+        assert Report.objects.count() == 0
+        storage = Media._meta.get_field("file").storage
+        assert not any(storage.exists(name) for name in saved)
+
+
+@pytest.mark.django_db
+class TestPossibleDuplicates:
+    def setup_method(self):
+        from django.core.cache import cache
+
+        # Bildirim oluşturma hız sınırı sayaçları önbellekte; testler arasında sıfırla
+        cache.clear()
+        self.client = APIClient()
+        self.citizen = User.objects.create_user(
+            email="dupcitizen@example.com",
+            password="Pass123!",
+            username="dupcitizen"
+        )
+        self.category = Category.objects.create(name="Yol")
+        res = self.client.post(
+            reverse("auth-login"),
+            {"email": "dupcitizen@example.com", "password": "Pass123!"},
+            format="json"
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+
+    def photo(self, name, size=(1200, 900), quality=90, flip=False):
+        from io import BytesIO
+        from PIL import Image
+
+        img = Image.merge(
+            "RGB",
+            (
+                Image.radial_gradient("L").resize(size),
+                Image.linear_gradient("L").resize(size),
+                Image.linear_gradient("L").rotate(90).resize(size),
+            ),
+        )
+        if flip:
+            img = img.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+        buffer = BytesIO()
+        img.save(buffer, format="JPEG", quality=quality)
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/jpeg")
+
+    def post(self, media_file, latitude="41.036900", longitude="28.985000"):
+        return self.client.post(
+            "/api/reports/",
+            {
+                "title": "Çukur",
+                "description": "Yolda çukur var",
+                "category": self.category.id,
+                "latitude": latitude,
+                "longitude": longitude,
+                "media_files": [media_file],
+            },
+            format="multipart",
+        )
+
+    def test_create_response_lists_similar_nearby_reports(self):
+        first = self.post(self.photo("first.jpg"))
+        assert first.status_code == 201, first.data
+        assert first.data["possible_duplicates"] == []
+
+        # Aynı çukur: farklı çözünürlük ve sıkıştırma, ~30 m ötede
+        second = self.post(self.photo("second.jpg", size=(800, 600), quality=60), latitude="41.037150")
+        assert second.status_code == 201, second.data
+        duplicates = second.data["possible_duplicates"]
+        assert [item["id"] for item in duplicates] == [first.data["id"]]
+        assert duplicates[0]["distance"] <= 6
+        assert 20 <= duplicates[0]["distance_m"] <= 40
+
+        detail = self.client.get(f"/api/reports/{first.data['id']}/")
+        assert [item["id"] for item in detail.data["possible_duplicates"]] == [second.data["id"]]
+
+    def test_far_away_or_different_images_are_not_duplicates(self):
+        first = self.post(self.photo("first.jpg"))
+        far = self.post(self.photo("far.jpg"), latitude="41.100000")
+        different = self.post(self.photo("different.jpg", flip=True))
+
+        assert far.data["possible_duplicates"] == []
+        assert first.data["id"] not in [item["id"] for item in different.data["possible_duplicates"]]
+
+    def test_candidates_are_bounded_by_location_in_the_query(self, monkeypatch):
+        from reports import duplicates
+
+        near = self.post(self.photo("near.jpg"))
+        for index in range(3):
+            self.post(self.photo(f"far{index}.jpg"), latitude="41.100000")
+        # Uzaktaki daha yeni adaylar sınırı doldurmaz; alan filtresi sorguda uygulanır
+        monkeypatch.setattr(duplicates, "MAX_CANDIDATES", 2)
+
+        second = self.post(self.photo("second.jpg"), latitude="41.037150")
+        assert [item["id"] for item in second.data["possible_duplicates"]] == [near.data["id"]]
+
+    def test_only_draft_formats_are_hashed_on_request(self, settings, django_capture_on_commit_callbacks):
+        from io import BytesIO, StringIO
+        from django.core.management import call_command
+        from PIL import Image
+
+        settings.MEDIA_PROCESSING_MODE = "queue"
+        buffer = BytesIO()
+        with Image.open(self.photo("source.jpg")) as img:
+            img.save(buffer, format="PNG")
+        png = SimpleUploadedFile("photo.png", buffer.getvalue(), content_type="image/png")
+
+        with django_capture_on_commit_callbacks(execute=True):
+            jpeg_report = self.post(self.photo("photo.jpg"))
+            png_report = self.post(png)
+        jpeg_media = Media.objects.get(report_id=jpeg_report.data["id"])
+        png_media = Media.objects.get(report_id=png_report.data["id"])
+        # PNG istekte tam çözülmez; özeti çalışan en küçük varyanttan hesaplar
+        assert jpeg_media.perceptual_hash is not None
+        assert png_media.perceptual_hash is None
+
+        call_command("process_media", once=True, stdout=StringIO())
+        png_media.refresh_from_db()
+        assert png_media.perceptual_hash is not None
+
+
+@pytest.mark.django_db
+class TestDirectUploads:
+    def setup_method(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.client = APIClient()
+        self.citizen = User.objects.create_user(
+            email="directcitizen@example.com",
+            password="Pass123!",
+            username="directcitizen"
+        )
+        self.other = User.objects.create_user(
+            email="directother@example.com",
+            password="Pass123!",
+            username="directother"
+        )
+        self.category = Category.objects.create(name="Doğrudan")
+        res = self.client.post(
+            reverse("auth-login"),
+            {"email": "directcitizen@example.com", "password": "Pass123!"},
+            format="json"
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+
+    def png(self):
+        from io import BytesIO
+        from PIL import Image
+
+        buffer = BytesIO()
+        Image.new("RGB", (64, 48), (200, 40, 40)).save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    def presign(self, data):
+        res = self.client.post(
+            reverse("report-uploads"),
+            {"files": [{"name": "foto.png", "content_type": "image/png", "size": len(data)}]},
+            format="json",
+        )
+        assert res.status_code == 201, res.data
+        return res.data["uploads"][0]
+
+    def put(self, upload, data, content_type="image/png"):
+        # Yerel PUT adresi kimlik bilgisi istemez; yetki imzalı belirteçtedir
+        return APIClient().generic("PUT", upload["url"], data, content_type=content_type)
+
+    def test_presign_put_and_finalize_queues_processing(self, settings, django_capture_on_commit_callbacks):
+        settings.MEDIA_PROCESSING_MODE = "sync"
+        data = self.png()
+        upload = self.presign(data)
+        assert upload["method"] == "PUT"
+        assert upload["key"].startswith(f"reports/uploads/{self.citizen.pk}/")
+        assert upload["key"].endswith(".png")
+        assert self.put(upload, data).status_code == 200
+
+        report = Report.objects.create(
+            title="Sonradan", description="Fotoğraf sonra eklenir", category=self.category, reporter=self.citizen
+        )
+        with django_capture_on_commit_callbacks(execute=True):
+            res = self.client.post(
+                reverse("report-uploads-finalize"), {"report": report.id, "keys": [upload["key"]]}, format="json"
+            )
+        assert res.status_code == 201, res.data
+
+        media = Media.objects.get(report=report)
+        assert media.processing_state == Media.PROCESSING_DONE
+        assert media.source_hash and media.content_hash
+        assert media.perceptual_hash is not None
+
+    def test_create_report_with_media_keys(self):
+        data = self.png()
+        upload = self.presign(data)
+        self.put(upload, data)
+
+        res = self.client.post(
+            "/api/reports/",
+            {
+                "title": "Anahtarla",
+                "description": "Doğrudan yüklenmiş fotoğraf",
+                "category": self.category.id,
+                "media_keys": [upload["key"]],
+            },
+            format="json",
+        )
+        assert res.status_code == 201, res.data
+        media = Media.objects.get(report_id=res.data["id"])
+        assert media.file.name == upload["key"]
+        assert media.file_size == len(data)
+
+    def test_finalize_rejects_foreign_missing_and_reused_keys(self):
+        data = self.png()
+        upload = self.presign(data)
+        self.put(upload, data)
+        report = Report.objects.create(
+            title="Kendi", description="Kendi bildirimi", category=self.category, reporter=self.citizen
+        )
+        url = reverse("report-uploads-finalize")
+
+        foreign = f"reports/uploads/{self.other.pk}/{'a' * 32}.png"
+        missing = f"reports/uploads/{self.citizen.pk}/{'b' * 32}.png"
+        for keys in ([foreign], [missing], ["reports/2026/01/01/1/x.png"], [upload["key"], upload["key"]]):
+            res = self.client.post(url, {"report": report.id, "keys": keys}, format="json")
+            assert res.status_code == 400, keys
+
+        other_report = Report.objects.create(
+            title="Başkası", description="Başkasının bildirimi", category=self.category, reporter=self.other
+        )
+        res = self.client.post(url, {"report": other_report.id, "keys": [upload["key"]]}, format="json")
+        assert res.status_code == 400
+
+        assert self.client.post(url, {"report": report.id, "keys": [upload["key"]]}, format="json").status_code == 201
+        res = self.client.post(url, {"report": report.id, "keys": [upload["key"]]}, format="json")
+        assert res.status_code == 400
+        assert Media.objects.filter(report=report).count() == 1
+
+    def test_concurrent_attach_of_same_key_is_rejected(self, monkeypatch):
+        from reports import direct_uploads
+
+        data = self.png()
+        upload = self.presign(data)
+        self.put(upload, data)
+        # İki istek de "bağlanmamış" kontrolünü diğeri bağlamadan önce geçmiş gibi
+        uploads = direct_uploads.verify_uploads(self.citizen, [upload["key"]])
+        monkeypatch.setattr(direct_uploads, "verify_uploads", lambda user, keys: uploads)
+        first, second = (
+            Report.objects.create(title=title, description="Yarış", category=self.category, reporter=self.citizen)
+            for title in ("Birinci", "İkinci")
+        )
+        url = reverse("report-uploads-finalize")
+
+        assert self.client.post(url, {"report": first.id, "keys": [upload["key"]]}, format="json").status_code == 201
+        res = self.client.post(url, {"report": second.id, "keys": [upload["key"]]}, format="json")
+        assert res.status_code == 400
+        assert "keys" in res.data
+
+        res = self.client.post(
+            "/api/reports/",
+            {"title": "Üçüncü", "description": "Yarış", "category": self.category.id, "media_keys": [upload["key"]]},
+            format="json",
+        )
+        assert res.status_code == 400
+        assert "media_keys" in res.data
+        assert Media.objects.filter(file=upload["key"]).count() == 1
+        assert not Report.objects.filter(title="Üçüncü").exists()
+
+    def test_presign_and_local_put_enforce_limits(self, settings):
+        settings.MEDIA_DIRECT_UPLOAD_MAX_BYTES = 1024
+        res = self.client.post(
+            reverse("report-uploads"),
+            {"files": [{"content_type": "image/png", "size": 4096}]},
+            format="json",
+        )
+        assert res.status_code == 400
+        res = self.client.post(
+            reverse("report-uploads"),
+            {"files": [{"content_type": "application/pdf", "size": 10}]},
+            format="json",
+        )
+        assert res.status_code == 400
+
+        upload = self.presign(b"x" * 100)
+        assert self.put(upload, b"x" * 101).status_code == 403
+        assert self.put(upload, b"x" * 100, content_type="image/jpeg").status_code == 403
+        tampered = {**upload, "url": upload["url"].replace("/local/", "/local/x")}
+        assert self.put(tampered, b"x" * 100).status_code == 403
+
+    def test_presign_uses_s3_signed_put(self, monkeypatch):
+        from reports import direct_uploads
+        from storages.backends.s3 import S3Storage
+
+        storage = S3Storage(
+            bucket_name="cozum-test",
+            endpoint_url="http://127.0.0.1:9000",
+            access_key="test",
+            secret_key="test",
+            region_name="auto",
+            signature_version="s3v4",
+            addressing_style="path",
+        )
+        monkeypatch.setattr(direct_uploads, "media_storage", lambda: storage)
+
+        upload = self.presign(b"x" * 2048)
+        assert upload["url"].startswith(f"http://127.0.0.1:9000/cozum-test/{upload['key']}?")
+        assert "X-Amz-Signature=" in upload["url"]
+        # Tür ve boyut imzaya dahil; depo farklı gövdeyi reddeder
+        assert "X-Amz-SignedHeaders=content-length%3Bcontent-type%3Bhost" in upload["url"]
+        assert "X-Amz-Expires=600" in upload["url"]
+
+
+@pytest.mark.django_db
+class TestResumableUploads:
+    def setup_method(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.client = APIClient()
+        self.citizen = User.objects.create_user(
+            email="resumecitizen@example.com",
+            password="Pass123!",
+            username="resumecitizen"
+        )
+        self.category = Category.objects.create(name="Parçalı")
+        res = self.client.post(
+            reverse("auth-login"),
+            {"email": "resumecitizen@example.com", "password": "Pass123!"},
+            format="json"
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+
+    def jpeg(self):
+        from io import BytesIO
+        from PIL import Image
+
+        buffer = BytesIO()
+        Image.effect_noise((320, 240), 40).convert("RGB").save(buffer, format="JPEG", quality=95)
+        return buffer.getvalue()
+
+    def create(self, data):
+        res = self.client.post(
+            reverse("report-upload-resumable"),
+            {"name": "saha.jpg", "content_type": "image/jpeg", "size": len(data)},
+            format="json",
+        )
+        assert res.status_code == 201, res.data
+        return res
+
+    def patch(self, url, chunk, offset):
+        return self.client.generic(
+            "PATCH", url, chunk, content_type="application/offset+octet-stream", HTTP_UPLOAD_OFFSET=str(offset)
+        )
+
+    def test_create_is_throttled(self, settings, tmp_path, monkeypatch):
+        from cozum_var_backend.throttling import ScopedSlidingWindowThrottle
+
+        settings.MEDIA_RESUMABLE_UPLOAD_DIR = str(tmp_path)
+        rates = {**ScopedSlidingWindowThrottle.THROTTLE_RATES, "resumable_create": "2/hour"}
+        monkeypatch.setattr(ScopedSlidingWindowThrottle, "THROTTLE_RATES", rates)
+        data = self.jpeg()
+        self.create(data)
+        self.create(data)
+        res = self.client.post(
+            reverse("report-upload-resumable"),
+            {"name": "saha.jpg", "content_type": "image/jpeg", "size": len(data)},
+            format="json",
+        )
+        assert res.status_code == 429
+
+    def test_chunks_resume_from_server_offset_and_attach(self, settings, tmp_path):
+        from reports import resumable
+        from reports.models import ResumableUpload
+
+        settings.MEDIA_RESUMABLE_UPLOAD_DIR = str(tmp_path)
+        data = self.jpeg()
+        created = self.create(data)
+        url = created["Location"]
+        upload = ResumableUpload.objects.get(pk=created.data["id"])
+        half = len(data) // 2
+
+        assert self.patch(url, data[:half], 0).status_code == 200
+        head = self.client.head(url)
+        assert head.status_code == 200
+        assert head["Upload-Offset"] == str(half)
+        assert head["Upload-Length"] == str(len(data))
+
+        # Eski konumdan tekrar gönderim reddedilir; güncel konum döner
+        conflict = self.patch(url, data[:half], 0)
+        assert conflict.status_code == 409
+        assert conflict["Upload-Offset"] == str(half)
+
+        res = self.patch(url, data[half:], half)
+        assert res.status_code == 200, res.data
+        key = res.data["key"]
+        assert key.startswith(f"reports/uploads/{self.citizen.pk}/")
+        assert not os.path.exists(resumable.temp_path(upload))
+        with Media._meta.get_field("file").storage.open(key, "rb") as fh:
+            assert fh.read() == data
+
+        report = self.client.post(
+            "/api/reports/",
+            {"title": "Parçalı", "description": "Parça parça yüklendi", "category": self.category.id,
+             "media_keys": [key]},
+            format="json",
+        )
+        assert report.status_code == 201, report.data
+        assert Media.objects.get(report_id=report.data["id"]).file.name == key
+
+    def test_interrupted_chunk_keeps_received_bytes(self, settings, tmp_path):
+        from io import BytesIO
+        from reports import resumable
+        from reports.models import ResumableUpload
+
+        settings.MEDIA_RESUMABLE_UPLOAD_DIR = str(tmp_path)
+        data = self.jpeg()
+        upload = ResumableUpload.objects.get(pk=self.create(data).data["id"])
+
+        # Bağlantı 1000 bayttan sonra koptu
+        resumable.append_chunk(upload, BytesIO(data[:1000]), 0, len(data))
+        upload.refresh_from_db()
+        assert upload.offset == 1000 and not upload.key
+        resumable.append_chunk(upload, BytesIO(data[1000:]), 1000, len(data) - 1000)
+        upload.refresh_from_db()
+        assert upload.key
+
+    def test_rejects_wrong_type_foreign_uploads_and_oversized_chunks(self, settings, tmp_path):
+        settings.MEDIA_RESUMABLE_UPLOAD_DIR = str(tmp_path)
+        data = self.jpeg()
+        url = self.create(data)["Location"]
+
+        res = self.client.generic("PATCH", url, data, content_type="image/jpeg", HTTP_UPLOAD_OFFSET="0")
+        assert res.status_code == 415
+        assert self.patch(url, data + b"x", 0).status_code == 400
+
+        other = APIClient()
+        User.objects.create_user(email="resumeother@example.com", password="Pass123!", username="resumeother")
+        token = other.post(
+            reverse("auth-login"), {"email": "resumeother@example.com", "password": "Pass123!"}, format="json"
+        ).data["access"]
+        other.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        assert other.head(url).status_code == 404
+
+    def test_expired_uploads_are_gone_and_cleaned_up(self, settings, tmp_path):
+        from django.core.management import call_command
+        from reports import resumable
+        from reports.models import ResumableUpload
+
+        settings.MEDIA_RESUMABLE_UPLOAD_DIR = str(tmp_path)
+        data = self.jpeg()
+        partial_url = self.create(data)["Location"]
+        self.patch(partial_url, data[:100], 0)
+        complete = ResumableUpload.objects.get(pk=self.create(data).data["id"])
+        assert self.patch(
+            reverse("report-upload-resumable-detail", args=[complete.pk]), data, 0
+        ).status_code == 200
+        complete.refresh_from_db()
+        storage = Media._meta.get_field("file").storage
+        assert storage.exists(complete.key)
+
+        ResumableUpload.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        partial = ResumableUpload.objects.filter(key="").get()
+        assert self.client.head(partial_url).status_code == 410
+        assert not os.path.exists(resumable.temp_path(partial))
+
+        call_command("cleanup_uploads")
+        assert not ResumableUpload.objects.exists()
+        assert not storage.exists(complete.key)
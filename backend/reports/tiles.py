@@ -0,0 +1,106 @@
+"""Operatör ısı haritası için z/x/y vektör karoları (MVT).
+
+Her karo, karo alanındaki bildirimlerin geohash hücrelerine göre yoğunluğunu (`count`)
+içerir; hücre boyutu karonun yaklaşık 1/16'sı olacak şekilde zoom'a göre seçilir.
+Önbellek anahtarı ve ETag, karoyu örten geohash hücrelerinin sürümlerinden türetilir
+(reports.clusters); bir bildirim değiştiğinde yalnızca onu içeren hücrelerin sürümü
+arttığı için sadece o bildirime dokunan karolar yeniden üretilir ve değişmeyen karolar
+istemciye 304 ile döner.
+"""
+
+import hashlib
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import clusters, geo, mvt
+
+LAYER_NAME = "reports"
+# Kenardaki noktaların ısı haritasında kesilmemesi için karo genişliğinin bu oranı kadar tampon
+BUFFER_RATIO = 64 / mvt.DEFAULT_EXTENT
+MAX_VERSION_CELLS = 16
+TILE_KEY = "report-tiles:{etag}"
+MAX_MERCATOR_LAT = 85.05112878
+
+
+def cache_timeout():
+    return clusters.local_timeout(getattr(settings, "REPORT_TILE_CACHE_TIMEOUT", 3600))
+
+
+def tile_bbox(z, x, y):
+    """Slippy karonun (min_lat, min_lon, max_lat, max_lon) sınırları."""
+    n = 2 ** z
+
+    def lat(row):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return lat(y + 1), x / n * 360.0 - 180.0, lat(y), (x + 1) / n * 360.0 - 180.0
+
+
+def project(latitude, longitude, z, x, y, extent=mvt.DEFAULT_EXTENT):
+    """Koordinatı karo içi piksel koordinatına (Web Mercator) çevirir."""
+    n = 2 ** z
+    latitude = max(-MAX_MERCATOR_LAT, min(MAX_MERCATOR_LAT, latitude))
+    lat_rad = math.radians(latitude)
+    px = ((longitude + 180.0) / 360.0 * n - x) * extent
+    py = ((1 - math.log(math.tan(lat_rad) + 1 / math.cos(lat_rad)) / math.pi) / 2 * n - y) * extent
+    return round(px), round(py)
+
+
+def buffered_bbox(z, x, y):
+    min_lat, min_lon, max_lat, max_lon = tile_bbox(z, x, y)
+    lat_pad = (max_lat - min_lat) * BUFFER_RATIO
+    lon_pad = (max_lon - min_lon) * BUFFER_RATIO
+    return (
+        max(min_lat - lat_pad, -90.0),
+        max(min_lon - lon_pad, -180.0),
+        min(max_lat + lat_pad, 90.0),
+        min(max_lon + lon_pad, 180.0),
+    )
+
+
+def density_precision(z):
+    """Hücre genişliği karo genişliğinin ~1/16'sını aşmayan en kısa geohash uzunluğu."""
+    target = 360.0 / (2 ** z) / 16
+    for precision in range(1, geo.GEOHASH_PRECISION + 1):
+        if geo.cell_size(precision)[1] <= target:
+            return precision
+    return geo.GEOHASH_PRECISION
+
+
+def version_cells(bbox):
+    """Karonun önbellek sürümünü belirleyen geohash hücreleri (kümeleme sürümleriyle ortak)."""
+    for precision in range(clusters.MAX_TILE_LENGTH, 0, -1):
+        if geo.count_cells(*bbox, precision) <= MAX_VERSION_CELLS:
+            return geo.cells_in_bbox(*bbox, precision)
+    return [""]
+
+
+def tile_etag(z, x, y, scope):
+    bbox = buffered_bbox(z, x, y)
+    versions = clusters.tile_versions(version_cells(bbox))
+    digest = hashlib.sha1(f"{z}/{x}/{y}:{scope}:{sorted(versions.items())}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def render_tile(queryset, z, x, y):
+    """Karo alanındaki yoğunluk hücrelerini tek gruplanmış sorguyla MVT'ye kodlar."""
+    bbox = buffered_bbox(z, x, y)
+    rows = clusters.cell_aggregates(geo.filter_bbox(queryset, *bbox), density_precision(z))
+    layer = mvt.Layer(LAYER_NAME)
+    for row in rows:
+        px, py = project(row["latitude"], row["longitude"], z, x, y)
+        layer.add_point(px, py, {"count": row["count"], "geohash": row["cell"]})
+    return mvt.encode_tile([layer])
+
+
+def get_tile(queryset, z, x, y, scope, etag=None):
+    """(etag, gövde) döndürür; gövde önbellekte yoksa üretilip yazılır."""
+    etag = etag or tile_etag(z, x, y, scope)
+    key = TILE_KEY.format(etag=etag)
+    body = cache.get(key)
+    if body is None:
+        body = render_tile(queryset, z, x, y)
+        cache.set(key, body, cache_timeout())
+    return etag, body
@@ -3,9 +3,18 @@ from django.urls import path
 from .views import (
     CategoryListCreateView,
     CategoryRetrieveUpdateDestroyView,
+    ReportClusterView,
     ReportCommentsListCreateView,
     ReportListCreateView,
     ReportRetrieveUpdateDestroyView,
+    ReportStatsView,
+    ReportSuggestView,
+    ReportTileView,
+    ReportLocalUploadView,
+    ReportUploadFinalizeView,
+    ReportUploadView,
+    ResumableUploadCreateView,
+    ResumableUploadDetailView,
     CommentRetrieveUpdateDestroyView,
 )
 
@@ -13,6 +22,19 @@ urlpatterns = [
     path("categories/", CategoryListCreateView.as_view(), name="category-list-create"),
     path("categories/<int:pk>/", CategoryRetrieveUpdateDestroyView.as_view(), name="category-detail"),
     path("reports/", ReportListCreateView.as_view(), name="report-list-create"),
+    path("reports/stats/", ReportStatsView.as_view(), name="report-stats"),
+    path("reports/clusters/", ReportClusterView.as_view(), name="report-clusters"),
+    path("reports/tiles/<int:z>/<int:x>/<int:y>.mvt", ReportTileView.as_view(), name="report-tile"),
+    path("reports/suggest/", ReportSuggestView.as_view(), name="report-suggest"),
+    path("reports/uploads/", ReportUploadView.as_view(), name="report-uploads"),
+    path("reports/uploads/finalize/", ReportUploadFinalizeView.as_view(), name="report-uploads-finalize"),
+    path("reports/uploads/local/<str:token>/", ReportLocalUploadView.as_view(), name="report-upload-local"),
+    path("reports/uploads/resumable/", ResumableUploadCreateView.as_view(), name="report-upload-resumable"),
+    path(
+        "reports/uploads/resumable/<uuid:upload_id>/",
+        ResumableUploadDetailView.as_view(),
+        name="report-upload-resumable-detail",
+    ),
     path(
         "reports/<int:report_id>/",
         ReportRetrieveUpdateDestroyView.as_view(),
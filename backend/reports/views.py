@@ -1,22 +1,41 @@
 from rest_framework import generics, permissions
-from rest_framework.exceptions import PermissionDenied
-from rest_framework.parsers import MultiPartParser
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework import status
-from rest_framework import filters
-from django_ratelimit.decorators import ratelimit
-from django.utils.decorators import method_decorator
+from django_filters.rest_framework import DjangoFilterBackend
+from django.http import HttpResponse
+from django.utils.http import http_date
+from django.db import transaction
+from django.db.models import Prefetch
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils.dateparse import parse_date
 
-from .models import Category, Comment, Report
+from .models import Category, Comment, Report, ReportDailyStat, ResumableUpload
+from .filters import ReportGeoFilter, ReportOrderingFilter, ReportSearchFilter
+from .pagination import KeysetPagination
+from .clusters import MAX_ZOOM, clusters_for_bbox, scope_key
+from .stats import TIME_BUCKETS, report_statistics
+from . import direct_uploads, mvt, resumable, tiles
+from .suggest import suggest
 from .serializers import (
     CategorySerializer,
     CommentSerializer,
+    MediaSerializer,
     ReportCreateSerializer,
     ReportDetailSerializer,
     ReportListSerializer,
     ReportUpdateSerializer,
+    ResumableUploadSerializer,
+    UploadFinalizeSerializer,
+    UploadPresignSerializer,
+    UploadRequestSerializer,
 )
 
+User = get_user_model()
+
 
 class CategoryListCreateView(generics.ListCreateAPIView):
     serializer_class = CategorySerializer
@@ -53,10 +72,12 @@ class CategoryRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
         instance.save()
 
 
-@method_decorator(ratelimit(key='user', rate='10/h', method='POST', block=True), name='post')
-class ReportListCreateView(generics.ListCreateAPIView):
-    parser_classes = [MultiPartParser]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+class ReportScopeMixin:
+    """Bildirim listesinden türeyen uç noktalar için ortak rol kapsamı ve filtreler"""
+
+    # PostgreSQL'de sıralı tam metin arama, diğer veritabanlarında search_fields ile icontains
+    # ReportGeoFilter: ?bbox= ve ?near=&radius_m= harita filtreleri (geohash indeksli)
+    filter_backends = [DjangoFilterBackend, ReportGeoFilter, ReportSearchFilter, ReportOrderingFilter]
     search_fields = [
         "title",
         "description",
@@ -79,27 +100,52 @@ class ReportListCreateView(generics.ListCreateAPIView):
     }
 
     def get_queryset(self):
+        return self.scope_queryset(Report.objects.all())
+
+    def scope_queryset(self, qs):
+        return qs.filter(**self.get_scope_lookups())
+
+    def get_scope_lookups(self):
+        """Kullanıcının rolüne ve scope parametresine göre uygulanacak alan filtreleri"""
         user = self.request.user
-        qs = Report.objects.select_related("reporter", "category", "assigned_team")
         scope = self.request.query_params.get("scope")
         tasks_only = self.request.query_params.get("tasks_only", "false").lower() == "true"
+        lookups = {}
         
         # Görevler için özel filtreleme - sadece atanmış bildirimleri göster
         if tasks_only:
-            qs = qs.filter(assigned_team__isnull=False)
+            lookups["assigned_team__isnull"] = False
         
         if scope == "all":
-            return qs
+            return lookups
         if scope == "mine":
-            return qs.filter(reporter=user)
+            return {**lookups, "reporter": user}
         if scope == "assigned":
-            return qs.filter(assigned_team=getattr(user, "team", None))
+            return {**lookups, "assigned_team": getattr(user, "team", None)}
         if user.role == "OPERATOR" or user.is_staff:
-            return qs
+            return lookups
         if user.role == "EKIP":
-            return qs.filter(assigned_team=user.team)
+            return {**lookups, "assigned_team": user.team}
         # VATANDAS
-        return qs.filter(reporter=user)
+        return {**lookups, "reporter": user}
+
+
+class ReportListCreateView(ReportScopeMixin, generics.ListCreateAPIView):
+    throttle_scope = "report_create"
+    throttle_methods = ["POST"]
+    # JSON: dosyalar önceden doğrudan depoya yüklendiyse yalnızca media_keys gönderilir
+    parser_classes = [MultiPartParser, JSONParser]
+    # ?cursor= veya ?page_size= gönderildiğinde keyset sayfalama devreye girer
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        # Sayaçlar ve kapak medyası Report üzerinde denormalize tutulur (reports.signals)
+        qs = Report.objects.select_related(
+            "reporter__team", "category", "assigned_team__created_by", "cover_media"
+        ).prefetch_related(
+            Prefetch("assigned_team__members", queryset=User.objects.only("id"))
+        )
+        return self.scope_queryset(qs)
 
     def get_serializer_class(self):
         if self.request.method == "POST":
@@ -120,6 +166,302 @@ class ReportListCreateView(generics.ListCreateAPIView):
         serializer.save(reporter=self.request.user)
 
 
+class ReportUploadView(generics.GenericAPIView):
+    """Medyanın doğrudan depoya yüklenmesi için kısa ömürlü PUT adresleri üretir
+
+    Yüklenen anahtarlar bildirim oluşturulurken `media_keys` ile veya sonradan
+    ReportUploadFinalizeView ile bildirime bağlanır.
+    """
+
+    throttle_scope = "report_upload"
+
+    serializer_class = UploadPresignSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        uploads = [
+            direct_uploads.issue_upload(request.user, item["content_type"], item["size"], request=request)
+            for item in serializer.validated_data["files"]
+        ]
+        return Response({"uploads": uploads}, status=status.HTTP_201_CREATED)
+
+
+class ReportUploadFinalizeView(generics.GenericAPIView):
+    """Doğrudan yüklenmiş dosyaları kullanıcının mevcut bildirimine bağlar ve işlemeye alır"""
+
+    serializer_class = UploadFinalizeSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            with transaction.atomic():
+                medias = direct_uploads.attach_uploads(
+                    serializer.validated_data["report"], serializer.validated_data["uploads"]
+                )
+        except direct_uploads.UploadError as exc:
+            raise ValidationError({"keys": str(exc)})
+        data = MediaSerializer(medias, many=True, context=self.get_serializer_context()).data
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
+class ReportLocalUploadView(APIView):
+    """S3 dışı depolar için imzalı PUT adresinin yerel karşılığı (geliştirme/test)
+
+    Yetki URL'deki imzalı belirteçten gelir; gövde bellekte toplanmadan diske akıtılır.
+    """
+
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def put(self, request, token):
+        if direct_uploads.presigns_with_s3(direct_uploads.media_storage()):
+            raise NotFound()
+        try:
+            content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            raise ValidationError({"detail": "Geçersiz Content-Length."})
+        try:
+            direct_uploads.receive_local_upload(
+                token, request.stream, request.content_type, content_length
+            )
+        except direct_uploads.UploadError as exc:
+            raise PermissionDenied(str(exc))
+        return Response(status=status.HTTP_200_OK)
+
+
+def with_upload_headers(response, upload):
+    response["Upload-Offset"] = str(upload.offset)
+    response["Upload-Length"] = str(upload.size)
+    response["Upload-Expires"] = http_date(upload.expires_at.timestamp())
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+class ResumableUploadCreateView(generics.GenericAPIView):
+    """Parça parça gönderilecek bir yükleme başlatır (bkz. reports.resumable)"""
+
+    serializer_class = UploadRequestSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    # Her yükleme sunucuda geçici disk alanı ayırır
+    throttle_scope = "resumable_create"
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        try:
+            upload = resumable.create_upload(
+                request.user, data["content_type"], data["size"], data.get("name", "")
+            )
+        except direct_uploads.UploadError as exc:
+            raise ValidationError({"detail": str(exc)})
+        response = Response(ResumableUploadSerializer(upload).data, status=status.HTTP_201_CREATED)
+        response["Location"] = request.build_absolute_uri(
+            reverse("report-upload-resumable-detail", args=[upload.pk])
+        )
+        return with_upload_headers(response, upload)
+
+
+class ResumableUploadDetailView(generics.GenericAPIView):
+    """Yükleme durumu (HEAD/GET), parça ekleme (PATCH) ve iptal (DELETE)
+
+    PATCH gövdesi `application/offset+octet-stream` türünde ham bayttır ve
+    `Upload-Offset` başlığı sunucudaki konuma eşit olmalıdır; değilse 409 ve güncel konum döner.
+    """
+
+    serializer_class = ResumableUploadSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    lookup_url_kwarg = "upload_id"
+
+    def get_queryset(self):
+        return ResumableUpload.objects.filter(user=self.request.user)
+
+    def get_live_object(self):
+        upload = self.get_object()
+        if resumable.is_expired(upload):
+            resumable.discard(upload)
+            return None
+        return upload
+
+    def head(self, request, *args, **kwargs):
+        upload = self.get_live_object()
+        if upload is None:
+            return Response(status=status.HTTP_410_GONE)
+        return with_upload_headers(Response(status=status.HTTP_200_OK), upload)
+
+    def get(self, request, *args, **kwargs):
+        upload = self.get_live_object()
+        if upload is None:
+            return Response({"detail": "Yüklemenin süresi dolmuş."}, status=status.HTTP_410_GONE)
+        return with_upload_headers(Response(self.get_serializer(upload).data), upload)
+
+    def patch(self, request, *args, **kwargs):
+        if request.content_type.split(";")[0].strip() != "application/offset+octet-stream":
+            return Response(
+                {"detail": "Content-Type application/offset+octet-stream olmalıdır."},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+        try:
+            offset = int(request.headers["Upload-Offset"])
+            content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+        except (KeyError, ValueError):
+            raise ValidationError({"detail": "Geçerli Upload-Offset ve Content-Length başlıkları gereklidir."})
+        if offset < 0 or content_length < 0:
+            raise ValidationError({"detail": "Geçerli Upload-Offset ve Content-Length başlıkları gereklidir."})
+
+        upload = self.get_object()
+        try:
+            upload = resumable.append_chunk(upload, request.stream, offset, content_length)
+        except resumable.OffsetMismatch as exc:
+            response = Response({"detail": str(exc)}, status=status.HTTP_409_CONFLICT)
+            response["Upload-Offset"] = str(exc.offset)
+            return response
+        except resumable.UploadBusy as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_423_LOCKED)
+        except resumable.UploadExpired as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_410_GONE)
+        except direct_uploads.UploadError as exc:
+            raise ValidationError({"detail": str(exc)})
+        return with_upload_headers(Response(self.get_serializer(upload).data), upload)
+
+    def delete(self, request, *args, **kwargs):
+        resumable.discard(self.get_object())
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ReportStatsView(ReportScopeMixin, generics.GenericAPIView):
+    """Dashboard için gruplanmış bildirim sayıları (rol kapsamı ve filtreler listeyle aynı)"""
+
+    permission_classes = [permissions.IsAuthenticated]
+    # Ön-toplanmış tabloya birebir aktarılabilen filtreler
+    rollup_exact_params = ("status", "priority", "category", "assigned_team")
+    rollup_list_params = ("status__in", "priority__in")
+    rollup_ignored_params = ("bucket", "scope", "tasks_only", "ordering")
+
+    def get(self, request, *args, **kwargs):
+        bucket = request.query_params.get("bucket", "day")
+        if bucket not in TIME_BUCKETS:
+            raise ValidationError({"bucket": f"Geçersiz değer. Seçenekler: {', '.join(TIME_BUCKETS)}"})
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(report_statistics(queryset, bucket, rollup=self.get_rollup_queryset()))
+
+    def get_rollup_queryset(self):
+        """İstek günlük istatistik tablosunun boyutlarıyla ifade edilebiliyorsa eşdeğer sorgu.
+
+        Bildiren kullanıcıya göre kapsam, metin araması veya saat hassasiyetli tarih
+        filtreleri tabloda karşılığı olmadığından None döner ve canlı tablo kullanılır.
+        """
+        lookups = self.get_scope_lookups()
+        if "reporter" in lookups:
+            return None
+        for param, value in self.request.query_params.items():
+            if param in self.rollup_ignored_params or value == "":
+                continue
+            if param in self.rollup_exact_params:
+                lookups[param] = value
+            elif param in self.rollup_list_params:
+                lookups[param] = value.split(",")
+            elif param == "assigned_team__isnull":
+                lookups[param] = value.lower() in ("true", "1")
+            elif param in ("created_at__gte", "created_at__lte"):
+                try:
+                    day = parse_date(value)
+                except ValueError:
+                    day = None
+                if day is None:
+                    return None
+                # Gün başı ile karşılaştırma canlı sorgudaki datetime filtresiyle eşdeğerdir
+                lookups["day__gte" if param.endswith("gte") else "day__lt"] = day
+            else:
+                return None
+        return ReportDailyStat.objects.filter(**lookups)
+
+
+class ReportClusterView(ReportScopeMixin, generics.GenericAPIView):
+    """Harita için zoom seviyesine göre gruplanmış bildirim kümeleri (?bbox=&zoom=)"""
+
+    permission_classes = [permissions.IsAuthenticated]
+    # bbox karo seçimi için kullanılır; kümeler karo bütünüyle hesaplanıp önbelleğe alınır
+    filter_backends = [DjangoFilterBackend, ReportSearchFilter]
+    cluster_params = ("bbox", "zoom")
+
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        if not params.get("bbox"):
+            raise ValidationError({"bbox": "Bu parametre zorunludur."})
+        min_lon, min_lat, max_lon, max_lat = ReportGeoFilter.parse_floats(params["bbox"], 4, "bbox")
+        if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lon <= 180 and -180 <= max_lon <= 180):
+            raise ValidationError({"bbox": "Geçersiz sınırlar."})
+        try:
+            zoom = int(params.get("zoom", ""))
+        except ValueError:
+            raise ValidationError({"zoom": f"0 ile {MAX_ZOOM} arasında tam sayı olmalı."})
+        if not 0 <= zoom <= MAX_ZOOM:
+            raise ValidationError({"zoom": f"0 ile {MAX_ZOOM} arasında tam sayı olmalı."})
+
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(
+            clusters_for_bbox(queryset, (min_lat, min_lon, max_lat, max_lon), zoom, self.get_cache_scope())
+        )
+
+    def get_cache_scope(self):
+        """Rol kapsamı ve karo dışı filtrelerden türetilen önbellek anahtarı bileşeni"""
+        parts = [(key, str(getattr(value, "pk", value))) for key, value in self.get_scope_lookups().items()]
+        parts += [
+            (f"param:{key}", value)
+            for key, value in self.request.query_params.items()
+            if key not in self.cluster_params
+        ]
+        return scope_key(parts)
+
+
+class ReportTileView(ReportClusterView):
+    """Operatör ısı haritası için z/x/y vektör karosu (MVT), ETag ile koşullu yanıt"""
+
+    def get(self, request, z, x, y, *args, **kwargs):
+        if not 0 <= z <= MAX_ZOOM or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+            raise NotFound("Geçersiz karo.")
+        scope = self.get_cache_scope()
+        etag = tiles.tile_etag(z, x, y, scope)
+        quoted = f'"{etag}"'
+        if_none_match = request.headers.get("If-None-Match", "")
+        if quoted in [tag.strip() for tag in if_none_match.split(",")]:
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            queryset = self.filter_queryset(self.get_queryset())
+            _, body = tiles.get_tile(queryset, z, x, y, scope, etag=etag)
+            response = HttpResponse(body, content_type=mvt.CONTENT_TYPE)
+        response["ETag"] = quoted
+        # Yanıt kullanıcının kapsamına bağlı; paylaşılan önbelleklerde tutulmamalı
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+
+class ReportSuggestView(ReportScopeMixin, generics.GenericAPIView):
+    """Arama kutusu için yazım hatasına dayanıklı başlık/konum önerileri (?q=)"""
+
+    permission_classes = [permissions.IsAuthenticated]
+    min_query_length = 2
+    default_limit = 8
+    max_limit = 20
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get("q", "").strip()
+        if len(query) < self.min_query_length:
+            return Response([])
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        limit = max(1, min(limit, self.max_limit))
+        scoped = bool(self.get_scope_lookups())
+        return Response(suggest(self.get_queryset(), query, limit=limit, scoped=scoped))
+
+
 class ReportRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Report.objects.select_related("reporter", "category", "assigned_team")
     lookup_url_kwarg = "report_id"
@@ -160,8 +502,9 @@ class ReportRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
         instance.delete()
 
 
-@method_decorator(ratelimit(key='user', rate='5/m', method='POST', block=True), name='post')
 class ReportCommentsListCreateView(generics.ListCreateAPIView):
+    throttle_scope = "comment_create"
+    throttle_methods = ["POST"]
     serializer_class = CommentSerializer
     lookup_url_kwarg = "report_id"
     permission_classes = [permissions.IsAuthenticated]
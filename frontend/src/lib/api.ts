@@ -192,6 +192,8 @@ export interface Report {
   media_count: number
   comment_count: number
   first_media_url?: string
+  first_media_card_url?: string
+  first_media_thumb_url?: string
 }
 
 export async function getReports(scope?: 'all' | 'mine' | 'assigned', tasksOnly?: boolean): Promise<Report[]> {
@@ -212,9 +214,40 @@ export interface CreateReportPayload {
   latitude?: number
   longitude?: number
   media_files?: File[]
+  // uploadReportMedia ile doğrudan depoya yüklenmiş dosyaların anahtarları
+  media_keys?: string[]
+}
+
+export interface DirectUpload {
+  key: string
+  url: string
+  method: 'PUT'
+  headers: Record<string, string>
+  expires_in: number
+}
+
+// Dosyaları API sunucusuna uğramadan imzalı PUT adresleriyle depoya yükler; anahtarları döner
+export async function uploadReportMedia(files: File[]): Promise<string[]> {
+  const res = await api.post('/reports/uploads/', {
+    files: files.map((file) => ({ name: file.name, content_type: file.type, size: file.size })),
+  })
+  const uploads: DirectUpload[] = res.data.uploads
+  // axios yerine fetch: global Authorization başlığı imzalı S3 isteğini bozar
+  await Promise.all(
+    uploads.map(async (upload, i) => {
+      const put = await fetch(upload.url, { method: upload.method, headers: upload.headers, body: files[i] })
+      if (!put.ok) throw new Error(`Yükleme başarısız (${put.status})`)
+    }),
+  )
+  return uploads.map((upload) => upload.key)
 }
 
 export async function createReport(payload: CreateReportPayload): Promise<Report> {
+  if (payload.media_keys && payload.media_keys.length > 0) {
+    const res = await api.post('/reports/', { ...payload, media_files: undefined })
+    return res.data
+  }
+
   const formData = new FormData()
   formData.append('title', payload.title)
   formData.append('description', payload.description)
@@ -273,14 +306,16 @@ export async function setUserTeam(id: number, team: number | null): Promise<User
   return res.data
 }
 
-export interface MediaItem { id: number; file: string; file_path?: string; media_type?: string; uploaded_at?: string }
+export interface MediaItem { id: number; file: string; file_path?: string; media_type?: string; uploaded_at?: string; processing_state?: 'PENDING' | 'PROCESSING' | 'DONE' | 'FAILED'; variants?: { full?: string; card?: string; thumb?: string; fallback?: string } }
 export interface CommentItem { id: number; user: User; content: string; created_at: string }
+export interface PossibleDuplicate { id: number; title: string; status: Report['status']; distance: number; distance_m: number | null }
 export interface ReportDetail extends Report {
   description: string
   latitude?: number
   longitude?: number
   media_files: MediaItem[]
   comments: CommentItem[]
+  possible_duplicates?: PossibleDuplicate[]
 }
 
 export async function getReport(id: number): Promise<ReportDetail> {
@@ -481,7 +481,7 @@ export default function Dashboard() {
                   <div className="flex items-center gap-3 min-w-0">
                     <div className="w-10 h-10 bg-slate-100 rounded overflow-hidden flex-shrink-0">
                       {r.first_media_url ? (
-                        <img src={r.first_media_url} alt={r.title} className="w-full h-full object-cover" loading="lazy" />
+                        <img src={r.first_media_thumb_url || r.first_media_url} alt={r.title} className="w-full h-full object-cover" loading="lazy" />
                       ) : (
                         <div className="w-full h-full grid place-items-center text-slate-400 text-xs">—</div>
                       )}
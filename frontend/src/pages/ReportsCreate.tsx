@@ -1,7 +1,7 @@
 import { useEffect, useState } from 'react'
 import { useNavigate } from 'react-router-dom'
 import toast from 'react-hot-toast'
-import { getCategories, createReport, type Category } from '../lib/api'
+import { getCategories, createReport, uploadReportMedia, type Category } from '../lib/api'
 import { isAxiosError } from 'axios'
 // Harita için ek importlar
 import { MapContainer, TileLayer, Marker, useMap, useMapEvents } from 'react-leaflet'
@@ -166,6 +166,14 @@ export default function ReportsCreate() {
 
     setLoading(true)
     try {
+      // Fotoğraf API sunucusuna uğramadan depoya yüklenir; imzalı yükleme kullanılamazsa
+      // (ör. depoda CORS ayarı yok veya tarayıcı dosya türünü bildirmiyor) multipart gönderilir
+      let mediaKeys: string[] | undefined
+      try {
+        mediaKeys = await uploadReportMedia([image])
+      } catch (uploadErr) {
+        console.warn('Direct upload failed, falling back to multipart:', uploadErr)
+      }
       await createReport({
         title: title.trim(),
         description: description.trim(),
@@ -173,7 +181,7 @@ export default function ReportsCreate() {
         location: location.trim() || undefined,
         latitude,
         longitude,
-        media_files: [image],
+        ...(mediaKeys ? { media_keys: mediaKeys } : { media_files: [image] }),
       })
       toast.success('Bildirim oluşturuldu')
       navigate('/dashboard')
@@ -369,7 +369,7 @@ export default function ReportsList() {
                   <div className="relative aspect-[4/3] bg-slate-100">
                     {r.first_media_url ? (
                       <img
-                        src={r.first_media_url}
+                        src={r.first_media_card_url || r.first_media_url}
                         alt={r.title}
                         className="w-full h-full object-cover"
                         loading="lazy"